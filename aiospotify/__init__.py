@@ -1,14 +1,168 @@
-from .album import *
-from .artist import *
-from .client import *
-from .enums import *
-from .errors import *
-from .image import *
-from .objects import *
-from .partials import *
-from .playlist import *
-from .search import *
-from .track import *
-from .user import *
-from .paginator import *
-from .playback import *
\ No newline at end of file
+from typing import TYPE_CHECKING, Any, Dict, List
+import importlib
+
+if TYPE_CHECKING:
+    from .album import *
+    from .artist import *
+    from .client import *
+    from .enums import *
+    from .errors import *
+    from .image import *
+    from .objects import *
+    from .partials import *
+    from .playlist import *
+    from .search import *
+    from .track import *
+    from .user import *
+    from .paginator import *
+    from .playback import *
+    from .watcher import *
+    from .commands import *
+    from .pool import *
+    from .tokens import *
+    from .ratelimit import *
+    from .concurrency import *
+    from .deadline import *
+    from .retry import *
+    from .hedging import *
+    from .middleware import *
+    from .metrics import *
+    from .tracing import *
+    from .recording import *
+    from .transport import *
+    from .ids import *
+    from .markets import *
+    from .interning import *
+
+# Public names and the submodule defining them. A submodule, and whatever it depends on,
+# is only imported the first time one of its names is looked up on the package.
+_LAZY: Dict[str, str] = {
+    'Album': 'album',
+    'Artist': 'artist',
+    'SpotifyClient': 'client',
+    'ObjectType': 'enums',
+    'AlbumType': 'enums',
+    'MediaType': 'enums',
+    'PlaybackEventType': 'enums',
+    'Priority': 'enums',
+    'SpotifyException': 'errors',
+    'HTTPException': 'errors',
+    'Forbidden': 'errors',
+    'BadRequest': 'errors',
+    'NotFound': 'errors',
+    'Unauthorized': 'errors',
+    'ServerError': 'errors',
+    'DeadlineExceeded': 'errors',
+    'MissingRecording': 'errors',
+    'Image': 'image',
+    'Followers': 'objects',
+    'Copyright': 'objects',
+    'ExternalURLs': 'objects',
+    'ExternalIDs': 'objects',
+    'Object': 'objects',
+    'PartialTrack': 'partials',
+    'PartialUser': 'partials',
+    'PartialEpisode': 'partials',
+    'PartialShow': 'partials',
+    'PartialAlbum': 'partials',
+    'PartialArtist': 'partials',
+    'ReleaseDate': 'partials',
+    'PlaylistTrack': 'playlist',
+    'Playlist': 'playlist',
+    'SearchResult': 'search',
+    'TrackAudioFeatures': 'track',
+    'TrackAudioAnalysis': 'track',
+    'TrackAudioAnalysisMeta': 'track',
+    'TrackAudioAnalysisSegment': 'track',
+    'TrackAudioAnalysisTrack': 'track',
+    'TrackAudioAnalysisSection': 'track',
+    'TrackAudioAnalysisBeat': 'track',
+    'TrackAudioAnalysisTatum': 'track',
+    'TrackAudioAnalysisBar': 'track',
+    'Track': 'track',
+    'UserTrack': 'track',
+    'User': 'user',
+    'CurrentUser': 'user',
+    'Paginator': 'paginator',
+    'CursorPaginator': 'paginator',
+    'CursorTail': 'paginator',
+    'Device': 'playback',
+    'PlaybackContext': 'playback',
+    'PlaybackActions': 'playback',
+    'PlayHistory': 'playback',
+    'PlaybackMismatch': 'playback',
+    'UserPlayback': 'playback',
+    'PlaybackEvent': 'watcher',
+    'PlaybackSubscription': 'watcher',
+    'PlaybackWatcher': 'watcher',
+    'PlaybackCommand': 'commands',
+    'PlaybackCommandQueue': 'commands',
+    'PooledClient': 'pool',
+    'ClientPool': 'pool',
+    'StoredToken': 'tokens',
+    'TokenStore': 'tokens',
+    'FileTokenStore': 'tokens',
+    'SQLiteTokenStore': 'tokens',
+    'RateLimitStore': 'ratelimit',
+    'MemoryRateLimitStore': 'ratelimit',
+    'MmapRateLimitStore': 'ratelimit',
+    'SQLiteRateLimitStore': 'ratelimit',
+    'RateLimiter': 'ratelimit',
+    'current_priority': 'concurrency',
+    'priority': 'concurrency',
+    'LatencyWindow': 'concurrency',
+    'ConcurrencyLimiter': 'concurrency',
+    'AdaptiveConcurrencyLimiter': 'concurrency',
+    'current_deadline': 'deadline',
+    'timeout': 'deadline',
+    'remaining': 'deadline',
+    'RetryBudget': 'retry',
+    'RetryPolicy': 'retry',
+    'HedgingPolicy': 'hedging',
+    'Request': 'middleware',
+    'Response': 'middleware',
+    'Handler': 'middleware',
+    'Middleware': 'middleware',
+    'build_handler': 'middleware',
+    'Histogram': 'metrics',
+    'EndpointMetrics': 'metrics',
+    'Metrics': 'metrics',
+    'RequestTrace': 'tracing',
+    'Tracer': 'tracing',
+    'traced': 'tracing',
+    'request_key': 'recording',
+    'Recording': 'recording',
+    'Cassette': 'recording',
+    'Recorder': 'recording',
+    'Replayer': 'recording',
+    'ConnectionSettings': 'transport',
+    'TransportRequest': 'transport',
+    'TransportResponse': 'transport',
+    'Transport': 'transport',
+    'AiohttpTransport': 'transport',
+    'MemoryTransport': 'transport',
+    'SpotifyID': 'ids',
+    'parse_id': 'ids',
+    'parse_ids': 'ids',
+    'SpotifyIDSet': 'ids',
+    'Markets': 'markets',
+    'register_markets': 'markets',
+    'available_in': 'markets',
+    'DEFAULT_INTERNED_FIELDS': 'interning',
+    'Interner': 'interning',
+}
+
+__all__ = tuple(_LAZY)
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+
+    return value
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY))
\ No newline at end of file
@@ -1,9 +1,13 @@
-from typing import Any, Dict, List
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Dict, List
 
-from .http import HTTPClient
 from .objects import Copyright, ExternalIDs
 from .partials import PartialAlbum, PartialTrack
 
+if TYPE_CHECKING:
+    from .http import HTTPClient
+
 __all__ = (
     'Album',
 )
@@ -1,13 +1,15 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
-from .http import HTTPClient
 from .image import Image
 from .objects import Followers
 from .partials import PartialArtist
 from .track import Track
 
+if TYPE_CHECKING:
+    from .http import HTTPClient
+
 __all__ = (
     'Artist',
 )
@@ -13,6 +13,15 @@ from .playlist import Playlist
 from .show import Show
 from .album import Album
 from .artist import Artist
+from .tokens import TokenStore
+from .ratelimit import RateLimiter
+from .concurrency import ConcurrencyLimiter
+from .retry import RetryPolicy
+from .hedging import HedgingPolicy
+from .metrics import Metrics
+from .tracing import Tracer, traced
+from .interning import Interner
+from .transport import ConnectionSettings, Transport
 from .utils import PY310, parse_argument
 
 __all__ = (
@@ -42,17 +51,45 @@ class SpotifyClient:
         *,
         loop: Optional[asyncio.AbstractEventLoop] = None,
         session: Optional[aiohttp.ClientSession] = None,
+        transport: Optional[Transport] = None,
+        connection: Optional[ConnectionSettings] = None,
+        warm_connections: int = 0,
+        token_store: Optional[TokenStore] = None,
+        token_store_key: Optional[str] = None,
+        ratelimit: Optional[RateLimiter] = None,
+        limiter: Optional[ConcurrencyLimiter] = None,
+        retry: Optional[RetryPolicy] = None,
+        hedging: Optional[HedgingPolicy] = None,
+        metrics: Optional[Metrics] = None,
+        tracer: Optional[Tracer] = None,
+        interner: Optional[Interner] = None,
     ) -> None:
         self.http = HTTPClient(
             client_id=client_id, 
             client_secret=client_secret, 
             loop=get_event_loop(loop),
             session=session,
+            transport=transport,
+            connection=connection,
+            warm_connections=warm_connections,
+            token_store=token_store,
+            token_store_key=token_store_key,
+            ratelimit=ratelimit,
+            limiter=limiter,
+            retry=retry,
+            hedging=hedging,
+            metrics=metrics,
+            tracer=tracer,
+            interner=interner,
         )
 
     async def __aenter__(self):
+        await self.start()
         return self
 
+    async def start(self, connections: Optional[int] = None) -> int:
+        return await self.http.start(connections)
+
     async def __aexit__(self, *args: Any):
         await self.close()
 
@@ -71,6 +108,7 @@ class SpotifyClient:
     def auth(self) -> Authentication:
         return self.http.auth
 
+    @traced
     async def search(
         self, 
         query: str, 
@@ -86,52 +124,61 @@ class SpotifyClient:
         data = await self.http.search(query, values, limit=limit, offset=offset, market=market)
         return SearchResult(data, self.http)
 
+    @traced
     async def fetch_current_user(self) -> CurrentUser:
         data = await self.http.me()
         return CurrentUser(data, self.http)
 
+    @traced
     async def fetch_tracks(self, uris: List[str], *, market: Optional[str] = None) -> List[Track]:
         ids = [parse_argument(uri, type='track') for uri in uris]
         data = await self.http.get_tracks(ids=ids, market=market)
 
         return [Track(item, self.http) for item in data['tracks']]
 
+    @traced
     async def fetch_track(self, uri: str, *, market: Optional[str] = None) -> Track:
         id = parse_argument(uri, type='track')
         data = await self.http.get_track(id, market=market)
 
         return Track(data, self.http)
 
+    @traced
     async def fetch_user(self, uri: str):
         id = parse_argument(uri, type='user')
         data = await self.http.get_user(id)
 
         return User(data, self.http)
 
+    @traced
     async def fetch_playlist(self, uri: str):
         id = parse_argument(uri, type='playlist')
         data = await self.http.get_playlist(id)
 
         return Playlist(data, self.http)
 
+    @traced
     async def fetch_shows(self, *uris: str, market: Optional[str] = None) -> List[Show]:
         ids = [parse_argument(uri, type='show') for uri in uris]
 
         data = await self.http.get_shows(ids, market=market)
         return [Show(item, self.http) for item in data['items']]
 
+    @traced
     async def fetch_show(self, uri: str, *, market: Optional[str] = None) -> Show:
         id = parse_argument(uri, type='show')
         data = await self.http.get_show(id, market)
 
         return Show(data, self.http)
 
+    @traced
     async def fetch_album(self, uri: str, *, market: Optional[str] = None) -> Album:
         id = parse_argument(uri, type='album')
         data = await self.http.get_album(id, market)
 
         return Album(data, self.http)
 
+    @traced
     async def fetch_artist(self, uri: str) -> Artist:
         id = parse_argument(uri, type='artist')
         data = await self.http.get_artist(id)
@@ -139,4 +186,4 @@ class SpotifyClient:
         return Artist(data, self.http)
 
     async def close(self):
-        await self.http.session.close()
\ No newline at end of file
+        await self.http.close()
\ No newline at end of file
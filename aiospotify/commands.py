@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Callable, Coroutine, Deque, Dict, FrozenSet, Iterable, Optional
+from collections import deque
+import asyncio
+
+from .deadline import current_deadline
+
+if TYPE_CHECKING:
+    from .http import HTTPClient
+
+__all__ = (
+    'PlaybackCommand',
+    'PlaybackCommandQueue',
+)
+
+CommandCallback = Callable[..., Coroutine[Any, Any, Any]]
+
+class PlaybackCommand:
+    __slots__ = ('kind', 'device_id', 'func', 'args', 'kwargs', 'future', 'created_at', 'merged')
+
+    def __init__(
+        self,
+        kind: str,
+        device_id: Optional[str],
+        func: CommandCallback,
+        args: Any,
+        kwargs: Dict[str, Any],
+        future: asyncio.Future[Any],
+        created_at: float,
+    ) -> None:
+        self.kind = kind
+        self.device_id = device_id
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.future = future
+        self.created_at = created_at
+        self.merged = 0
+
+    def __repr__(self) -> str:
+        return f'<PlaybackCommand kind={self.kind!r} device_id={self.device_id!r} merged={self.merged}>'
+
+class PlaybackCommandQueue:
+    # A single ordered queue per user: playback state is shared by every device, so commands
+    # reach Spotify in the order they were issued whatever their kind or device. Only a run of
+    # consecutive commands of the same mergeable kind, for the same device, collapses into one.
+    MERGEABLE: FrozenSet[str] = frozenset({'seek', 'volume', 'repeat', 'shuffle'})
+
+    def __init__(
+        self,
+        http: HTTPClient,
+        *,
+        window: float = 0.25,
+        mergeable: Optional[Iterable[str]] = None,
+    ) -> None:
+        self._http = http
+        self.window = window
+        self.mergeable = frozenset(mergeable) if mergeable is not None else self.MERGEABLE
+
+        self.pending: Deque[PlaybackCommand] = deque()
+        self.sent = 0
+        self.merged = 0
+
+        self._worker: Optional[asyncio.Task[None]] = None
+
+    def __repr__(self) -> str:
+        return f'<PlaybackCommandQueue window={self.window} pending={len(self.pending)} sent={self.sent} merged={self.merged}>'
+
+    def submit(
+        self, kind: str, device_id: Optional[str], func: CommandCallback, /, *args: Any, **kwargs: Any
+    ) -> asyncio.Future[Any]:
+        loop = self._http.loop
+        commands = self.pending
+
+        # Only the newest queued command can absorb the new one, merging past a command
+        # of another kind would reorder them.
+        if commands and kind in self.mergeable:
+            tail = commands[-1]
+            if tail.kind == kind and tail.device_id == device_id:
+                tail.args = args
+                tail.kwargs = kwargs
+                tail.merged += 1
+
+                self.merged += 1
+                return tail.future
+
+        command = PlaybackCommand(kind, device_id, func, args, kwargs, loop.create_future(), loop.time())
+        commands.append(command)
+
+        if self._worker is None or self._worker.done():
+            self._worker = loop.create_task(self._run())
+
+        return command.future
+
+    async def flush(self) -> None:
+        worker = self._worker
+        if worker is not None and not worker.done():
+            await asyncio.gather(worker, return_exceptions=True)
+
+    def close(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+
+        for command in self.pending:
+            if not command.future.done():
+                command.future.cancel()
+
+        self.pending.clear()
+
+    async def _run(self) -> None:
+        # Commands outlive the call that queued them, don't inherit its deadline.
+        current_deadline.set(None)
+        loop = self._http.loop
+        commands = self.pending
+
+        while commands:
+            command = commands[0]
+            if command.kind in self.mergeable:
+                delay = command.created_at + self.window - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            commands.popleft()
+
+            try:
+                result = await command.func(*command.args, **command.kwargs)
+            except Exception as exc:
+                if not command.future.done():
+                    command.future.set_exception(exc)
+            else:
+                if not command.future.done():
+                    command.future.set_result(result)
+
+            self.sent += 1
+
+        self._worker = None
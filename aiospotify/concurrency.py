@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Deque, Dict, Iterator, List, Optional, Tuple
+from collections import deque
+import contextlib
+import contextvars
+import asyncio
+import math
+import time
+
+from .enums import Priority
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+__all__ = (
+    'current_priority',
+    'priority',
+    'LatencyWindow',
+    'ConcurrencyLimiter',
+    'AdaptiveConcurrencyLimiter',
+)
+
+current_priority: contextvars.ContextVar[Priority] = contextvars.ContextVar(
+    'aiospotify_priority', default=Priority.Interactive
+)
+
+@contextlib.contextmanager
+def priority(value: Priority) -> Iterator[None]:
+    token = current_priority.set(value)
+    try:
+        yield
+    finally:
+        current_priority.reset(token)
+
+class LatencyWindow:
+    __slots__ = ('samples',)
+
+    def __init__(self, size: int = 256) -> None:
+        self.samples: Deque[float] = deque(maxlen=size)
+
+    def __repr__(self) -> str:
+        return f'<LatencyWindow samples={len(self.samples)}>'
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    def add(self, latency: float) -> None:
+        self.samples.append(latency)
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        if not self.samples:
+            return None
+
+        samples = sorted(self.samples)
+        index = min(len(samples) - 1, int(len(samples) * percentile / 100))
+
+        return samples[index]
+
+class ConcurrencyLimiter:
+    # Waiters are queued per priority lane. Interactive requests are always admitted first,
+    # except that bulk requests get at least `bulk_share` of the slots handed to waiters.
+
+    def __init__(self, limit: int = 1, *, bulk_share: float = 0.1) -> None:
+        if limit < 1:
+            raise ValueError('limit must be at least 1')
+
+        if not 0 < bulk_share <= 1:
+            raise ValueError('bulk_share must be between 0 and 1')
+
+        self.limit = limit
+        self.in_flight = 0
+        self.bulk_share = bulk_share
+        self.granted: Dict[Priority, int] = {lane: 0 for lane in Priority}
+
+        self._waiters: Dict[Priority, Deque[asyncio.Future[None]]] = {lane: deque() for lane in Priority}
+        self._since_bulk = 0
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__} limit={self.limit} in_flight={self.in_flight} waiting={self.waiting}>'
+
+    async def __aenter__(self) -> Self:
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        self.release()
+
+    def depth(self) -> Dict[str, int]:
+        return {lane.value: len(waiters) for lane, waiters in self._waiters.items()}
+
+    @property
+    def waiting(self) -> int:
+        return sum(len(waiters) for waiters in self._waiters.values())
+
+    def locked(self) -> bool:
+        return self.in_flight >= self.limit
+
+    async def acquire(self, priority: Optional[Priority] = None) -> None:
+        lane = priority or current_priority.get()
+
+        if not self.locked() and not self.waiting:
+            self.in_flight += 1
+            self.granted[lane] += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        waiters = self._waiters[lane]
+        waiters.append(waiter)
+
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            # The slot may have been handed over right before the cancellation.
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            elif waiter in waiters:
+                # `_wake` drops cancelled waiters on its own, this one may already be gone.
+                waiters.remove(waiter)
+
+            raise
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._wake()
+
+    def _next_lane(self) -> Optional[Priority]:
+        interactive = self._waiters[Priority.Interactive]
+        bulk = self._waiters[Priority.Bulk]
+
+        if not bulk:
+            return Priority.Interactive if interactive else None
+
+        if not interactive or self._since_bulk >= math.ceil(1 / self.bulk_share) - 1:
+            return Priority.Bulk
+
+        return Priority.Interactive
+
+    def _wake(self) -> None:
+        while not self.locked():
+            lane = self._next_lane()
+            if lane is None:
+                return
+
+            waiter = self._waiters[lane].popleft()
+            # Cancelled while queued, e.g. by a deadline, its owner is no longer waiting.
+            if waiter.done():
+                continue
+
+            self.in_flight += 1
+            self.granted[lane] += 1
+
+            if lane is Priority.Bulk:
+                self._since_bulk = 0
+            else:
+                self._since_bulk += 1
+
+            waiter.set_result(None)
+
+    def record(self, latency: float, status: int) -> None:
+        pass
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'limit': self.limit,
+            'in_flight': self.in_flight,
+            'waiting': self.depth(),
+            'granted': {lane.value: count for lane, count in self.granted.items()},
+        }
+
+class AdaptiveConcurrencyLimiter(ConcurrencyLimiter):
+    # Additive increase, multiplicative decrease: the limit grows by `increase` once per
+    # `limit` healthy responses and is cut by `decrease` on a 429, a 5xx or when the p95
+    # latency drifts `latency_tolerance` times above the baseline. The baseline drops to any
+    # lower p95 right away and moves `baseline_decay` of the way towards higher ones every
+    # window, so a permanent shift in latency becomes the new normal instead of pinning the
+    # limit at `min_limit`.
+
+    def __init__(
+        self,
+        initial: int = 4,
+        *,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        increase: int = 1,
+        decrease: float = 0.5,
+        latency_tolerance: float = 2.0,
+        baseline_decay: float = 0.1,
+        window: int = 100,
+        history: int = 1000,
+        bulk_share: float = 0.1,
+    ) -> None:
+        super().__init__(initial, bulk_share=bulk_share)
+
+        if not 0 <= baseline_decay <= 1:
+            raise ValueError('baseline_decay must be between 0 and 1')
+
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_tolerance = latency_tolerance
+        self.baseline_decay = baseline_decay
+
+        self.latencies = LatencyWindow(window)
+        self.baseline: Optional[float] = None
+        self.history: Deque[Tuple[float, int, str]] = deque(maxlen=history)
+
+        self._successes = 0
+        self._samples = 0
+        self._last_decrease = 0.0
+
+    def _set_limit(self, limit: int, reason: str) -> None:
+        limit = max(self.min_limit, min(self.max_limit, limit))
+        if limit == self.limit:
+            return
+
+        self.limit = limit
+        self.history.append((time.time(), limit, reason))
+        self._wake()
+
+    def _shrink(self, reason: str) -> None:
+        # Responses that were already in flight when the limit was cut report the same
+        # congestion, only react once per round trip.
+        now = time.monotonic()
+        cooldown = self.latencies.percentile(50) or 0.0
+        if now - self._last_decrease < cooldown:
+            return
+
+        self._last_decrease = now
+        self._successes = 0
+        self._set_limit(int(self.limit * self.decrease), reason)
+
+    def record(self, latency: float, status: int) -> None:
+        if status == 429 or status >= 500:
+            self._shrink(str(status))
+            return
+
+        self.latencies.add(latency)
+        self._samples += 1
+
+        if self._samples >= self.latencies.samples.maxlen: # type: ignore
+            self._samples = 0
+
+            p95 = self.latencies.percentile(95)
+            assert p95 is not None
+
+            if self.baseline is None or p95 < self.baseline:
+                self.baseline = p95
+            else:
+                degraded = p95 > self.baseline * self.latency_tolerance
+                self.baseline += (p95 - self.baseline) * self.baseline_decay
+
+                if degraded:
+                    self._shrink('latency')
+                    return
+
+        self._successes += 1
+        if self._successes >= self.limit:
+            self._successes = 0
+            self._set_limit(self.limit + self.increase, 'healthy')
+
+    def history_list(self) -> List[Dict[str, Any]]:
+        return [{'time': at, 'limit': limit, 'reason': reason} for at, limit, reason in self.history]
+
+    def snapshot(self) -> Dict[str, Any]:
+        snapshot = super().snapshot()
+        snapshot.update(
+            p95=self.latencies.percentile(95),
+            baseline=self.baseline,
+            history=self.history_list(),
+        )
+
+        return snapshot
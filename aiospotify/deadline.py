@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from typing import Any, Coroutine, Iterator, Optional, TypeVar
+import contextlib
+import contextvars
+import asyncio
+import time
+
+from .errors import DeadlineExceeded
+
+__all__ = (
+    'current_deadline',
+    'timeout',
+    'remaining',
+)
+
+T = TypeVar('T')
+
+# Absolute `time.monotonic()` deadline of the current call, None when there is no limit.
+current_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    'aiospotify_deadline', default=None
+)
+
+@contextlib.contextmanager
+def timeout(seconds: Optional[float]) -> Iterator[None]:
+    # Nested timeouts can only tighten the deadline, never extend it.
+    deadline = current_deadline.get()
+    if seconds is not None:
+        until = time.monotonic() + seconds
+        deadline = until if deadline is None else min(deadline, until)
+
+    token = current_deadline.set(deadline)
+    try:
+        yield
+    finally:
+        current_deadline.reset(token)
+
+def remaining() -> Optional[float]:
+    deadline = current_deadline.get()
+    if deadline is None:
+        return None
+
+    return deadline - time.monotonic()
+
+def check(phase: str, needed: float = 0.0) -> None:
+    left = remaining()
+    if left is not None and left <= needed:
+        raise DeadlineExceeded(phase, left, needed)
+
+async def within(coro: Coroutine[Any, Any, T], phase: str) -> T:
+    left = remaining()
+    if left is None:
+        return await coro
+
+    if left <= 0:
+        coro.close()
+        raise DeadlineExceeded(phase, left)
+
+    try:
+        return await asyncio.wait_for(coro, left)
+    except DeadlineExceeded:
+        raise
+    except asyncio.TimeoutError:
+        raise DeadlineExceeded(phase, 0.0) from None
@@ -3,7 +3,9 @@ from enum import Enum
 __all__ = (
     'ObjectType',
     'AlbumType',
-    'MediaType'
+    'MediaType',
+    'PlaybackEventType',
+    'Priority'
 )
 
 class ObjectType(Enum):
@@ -42,3 +44,18 @@ class RepeatState(Enum):
 class ShuffleState(Enum):
     Off = 'off'
     On = 'on'
+
+class PlaybackEventType(Enum):
+    Started = 'started'
+    Stopped = 'stopped'
+    TrackChanged = 'track_changed'
+    Paused = 'paused'
+    Resumed = 'resumed'
+    Seeked = 'seeked'
+    DeviceChanged = 'device_changed'
+    Mismatch = 'mismatch'
+    Error = 'error'
+
+class Priority(Enum):
+    Interactive = 'interactive'
+    Bulk = 'bulk'
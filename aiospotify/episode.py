@@ -1,8 +1,12 @@
-from typing import Dict, Any, List
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, Any, List
 
-from .http import HTTPClient
 from .partials import PartialEpisode, PartialShow
 
+if TYPE_CHECKING:
+    from .http import HTTPClient
+
 class Episode(PartialEpisode):
     __slots__ = PartialEpisode.__slots__ + ('is_playable', 'languages')
 
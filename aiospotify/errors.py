@@ -1,4 +1,5 @@
 from typing import Any, Dict
+import asyncio
 
 __all__ = (
     'SpotifyException',
@@ -6,7 +7,10 @@ __all__ = (
     'Forbidden',
     'BadRequest',
     'NotFound',
-    'Unauthorized'
+    'Unauthorized',
+    'ServerError',
+    'DeadlineExceeded',
+    'MissingRecording',
 )
 
 class SpotifyException(Exception):
@@ -14,9 +18,10 @@ class SpotifyException(Exception):
 
 class HTTPException(SpotifyException):
     def __init__(self, data: Dict[str, Any]) -> None:
-        self.error: Dict[str, Any] = data['error']
-        self.message: str = self.error['message']
-        self.status: int = self.error['status']
+        error = data.get('error')
+        self.error: Dict[str, Any] = error if isinstance(error, dict) else {}
+        self.message: str = self.error.get('message') or 'Unknown error'
+        self.status: int = self.error.get('status', 0)
 
         super().__init__(self.message)
 
@@ -31,3 +36,24 @@ class NotFound(HTTPException):
 
 class Unauthorized(HTTPException):
     pass
+
+class ServerError(HTTPException):
+    pass
+
+class DeadlineExceeded(SpotifyException, asyncio.TimeoutError):
+    def __init__(self, phase: str, remaining: float, needed: float = 0.0) -> None:
+        self.phase = phase
+        self.remaining = max(0.0, remaining)
+        self.needed = needed
+
+        if needed:
+            message = f'Deadline exceeded during {phase}: {self.remaining:.2f}s left but {needed:.2f}s required'
+        else:
+            message = f'Deadline exceeded during {phase}'
+
+        super().__init__(message)
+
+class MissingRecording(SpotifyException):
+    def __init__(self, key: str) -> None:
+        self.key = key
+        super().__init__(f'No recorded response for {key!r}')
\ No newline at end of file
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Collection, Coroutine, Dict, FrozenSet, List, Optional, TypeVar
+from collections import Counter
+import asyncio
+import time
+
+from .concurrency import LatencyWindow
+from .retry import RetryBudget
+
+__all__ = (
+    'HedgingPolicy',
+)
+
+T = TypeVar('T')
+
+class HedgingPolicy:
+    # A request that hasn't answered after `delay` seconds (or the route's observed
+    # `percentile` latency when no delay is given) is sent a second time. Whichever copy
+    # answers first wins and the other one is cancelled. Hedges are capped at `max_ratio`
+    # of the hedgeable requests made recently. The delay percentile is taken over the
+    # primary attempts only, recording the winner would pull it down with every hedge.
+
+    def __init__(
+        self,
+        delay: Optional[float] = None,
+        *,
+        percentile: float = 95,
+        min_delay: float = 0.01,
+        min_samples: int = 20,
+        window: int = 256,
+        max_ratio: float = 0.05,
+        methods: Optional[Collection[str]] = None,
+    ) -> None:
+        self.delay = delay
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.window = window
+        self.methods: FrozenSet[str] = frozenset(method.upper() for method in methods or ('GET',))
+        self.budget = RetryBudget(max_ratio, min_retries=0)
+
+        self.latencies: Dict[str, LatencyWindow] = {}
+        self.requests: Counter[str] = Counter()
+        self.hedged: Counter[str] = Counter()
+        self.wins: Counter[str] = Counter()
+
+    def __repr__(self) -> str:
+        return f'<HedgingPolicy delay={self.delay} hedged={sum(self.hedged.values())} wins={sum(self.wins.values())}>'
+
+    def is_hedgeable(self, method: str) -> bool:
+        return method.upper() in self.methods
+
+    def threshold(self, bucket: str) -> Optional[float]:
+        if self.delay is not None:
+            return self.delay
+
+        latencies = self.latencies.get(bucket)
+        if latencies is None or len(latencies) < self.min_samples:
+            return None
+
+        return max(self.min_delay, latencies.percentile(self.percentile)) # type: ignore
+
+    def record(self, bucket: str, latency: float) -> None:
+        latencies = self.latencies.get(bucket)
+        if latencies is None:
+            latencies = self.latencies[bucket] = LatencyWindow(self.window)
+
+        latencies.add(latency)
+
+    async def send(
+        self,
+        bucket: str,
+        factory: Callable[[], Coroutine[Any, Any, T]],
+        *,
+        on_hedge: Optional[Callable[[], Any]] = None,
+    ) -> T:
+        self.requests[bucket] += 1
+        self.budget.deposit()
+
+        started = time.monotonic()
+        primary = asyncio.ensure_future(factory())
+        tasks = {primary}
+
+        finished: List[float] = []
+        primary.add_done_callback(lambda _: finished.append(time.monotonic()))
+
+        try:
+            delay = self.threshold(bucket)
+            if delay is not None:
+                await asyncio.wait(tasks, timeout=delay)
+
+                if not primary.done() and self.budget.withdraw():
+                    self.hedged[bucket] += 1
+                    tasks.add(asyncio.ensure_future(factory()))
+
+                    if on_hedge is not None:
+                        on_hedge()
+
+            while True:
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+
+                # A copy that failed only loses if the other one is still in the race.
+                winner = next((task for task in done if task.exception() is None), None)
+                if winner is None:
+                    tasks -= done
+                    if tasks:
+                        continue
+
+                    winner = done.pop()
+
+                break
+
+            if winner is not primary:
+                self.wins[bucket] += 1
+
+            result = winner.result()
+
+            # A primary that lost is cancelled below, the time it had taken so far is a lower
+            # bound on its latency and still above the delay that triggered the hedge.
+            self.record(bucket, (finished[0] if finished else time.monotonic()) - started)
+
+            return result
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            bucket: {
+                'requests': self.requests[bucket],
+                'hedged': self.hedged[bucket],
+                'wins': self.wins[bucket],
+                'threshold': self.threshold(bucket),
+            }
+            for bucket in sorted(self.requests)
+        }
@@ -1,33 +1,71 @@
-from typing import Any, Dict, List, Optional, Type
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Type, Union
 import aiohttp
 import asyncio
+import os
 import urllib.parse
 import base64
 import datetime
-
-from .errors import Forbidden, HTTPException, NotFound, Unauthorized, BadRequest
+import time
+
+from .errors import Forbidden, HTTPException, NotFound, Unauthorized, BadRequest, ServerError
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy
+from .hedging import HedgingPolicy
+from .metrics import Metrics
+from .tracing import Tracer
+from .interning import Interner
+from .concurrency import ConcurrencyLimiter, current_priority
+from . import deadline
+from .enums import Priority
+from .tokens import StoredToken, TokenStore
+from .middleware import Handler, Middleware, Request, Response, build_handler
+from .recording import Cassette, Recorder, Replayer
+from .transport import AiohttpTransport, ConnectionSettings, Transport
+from .utils import to_thread
+
+if TYPE_CHECKING:
+    from .watcher import PlaybackWatcher
+    from .commands import PlaybackCommandQueue
 
 class Authentication:
     __slots__ = (
         '_refresh_token',
+        '_lock',
         'client_id',
         'client_secret',
-        'session',
+        'transport',
+        'store',
+        'store_key',
         'expires_at',
         'token',
+        'url',
     )
 
     URL = 'https://accounts.spotify.com/api/token'
 
-    def __init__(self, client_id: str, client_secret: str, session: aiohttp.ClientSession) -> None:
+    def __init__(
+        self,
+        client_id: str,
+        client_secret: str,
+        transport: Transport,
+        *,
+        store: Optional[TokenStore] = None,
+        store_key: Optional[str] = None,
+    ) -> None:
         self.client_id = client_id
         self.client_secret = client_secret
-        self.session = session
+        self.transport = transport
+        self.store = store
+        self.store_key = store_key or client_id
+        self.url = self.URL
 
         self.expires_at: Optional[datetime.datetime] = None
         self.token: Optional[str] = None
 
         self._refresh_token: Optional[str] = None
+        self._lock = asyncio.Lock()
 
     def is_expired(self):
         if not self.expires_at:
@@ -47,18 +85,78 @@ class Authentication:
 
         return token
 
-    async def fetch_token(self) -> str:
-        if self.is_expired():
-            if self.is_oauth2():
-                return await self.fetch_refresh_token()
-            else:
-                return await self.fetch_access_token()
+    def to_stored(self) -> StoredToken:
+        assert self.token is not None
+
+        expires_at = None
+        if self.expires_at is not None:
+            expires_at = self.expires_at.replace(tzinfo=datetime.timezone.utc).timestamp()
 
-        if self.token is not None:
+        return StoredToken(self.token, expires_at, self._refresh_token)
+
+    def load_stored(self, stored: Optional[StoredToken]) -> bool:
+        if stored is None or stored.is_expired():
+            return False
+
+        self.token = stored.access_token
+        if stored.expires_at is not None:
+            expires_at = datetime.datetime.fromtimestamp(stored.expires_at, datetime.timezone.utc)
+            self.expires_at = expires_at.replace(tzinfo=None)
+        if stored.refresh_token is not None:
+            self._refresh_token = stored.refresh_token
+
+        return True
+
+    async def fetch_token(self) -> str:
+        if self.token is not None and not self.is_expired():
             return self.token
 
+        async with self._lock:
+            # Another task may have renewed the token while this one was waiting.
+            if self.token is not None and not self.is_expired():
+                return self.token
+
+            if self.store is None:
+                return await self.renew_token()
+
+            return await self.renew_shared_token(self.store)
+
+    async def renew_token(self) -> str:
+        if self.is_oauth2():
+            return await self.fetch_refresh_token()
+
         return await self.fetch_access_token()
 
+    async def renew_shared_token(self, store: TokenStore) -> str:
+        key = self.store_key
+        if self.load_stored(await to_thread(store.load, key)):
+            return self.token # type: ignore
+
+        lock = store.lock(key)
+        acquire = asyncio.ensure_future(to_thread(lock.acquire))
+
+        try:
+            await asyncio.shield(acquire)
+        except asyncio.CancelledError:
+            acquire.add_done_callback(lambda _: lock.release())
+            raise
+
+        try:
+            # Whoever held the lock before us has most likely refreshed already.
+            stored = await to_thread(store.load, key)
+            if self.load_stored(stored):
+                return self.token # type: ignore
+
+            if stored is not None and stored.refresh_token is not None:
+                self._refresh_token = stored.refresh_token
+
+            token = await self.renew_token()
+            await to_thread(store.save, key, self.to_stored())
+
+            return token
+        finally:
+            lock.release()
+
     async def fetch_access_token(self) -> str:
         data = {
             'grant_type': 'client_credentials'
@@ -68,29 +166,34 @@ class Authentication:
             'Authorization': f'Basic {self.build_basic_token()}',
         }
 
-        async with self.session.post(self.URL, headers=headers, data=data) as response:
-            data: Dict[str, Any] = await response.json()
+        response = await self.transport.request('POST', self.url, headers=headers, data=data)
+        data: Dict[str, Any] = response.json()
 
-            self.expires_at = datetime.datetime.utcnow() + datetime.timedelta(seconds=data['expires_in'])
-            self.token = data['access_token']
+        self.expires_at = datetime.datetime.utcnow() + datetime.timedelta(seconds=data['expires_in'])
+        self.token = data['access_token']
 
-            self._refresh_token = data.get('refresh_token')
+        self._refresh_token = data.get('refresh_token')
 
         return self.token
 
     async def fetch_refresh_token(self) -> str:
         data = {
-            'refresh_token': self.token,
+            'refresh_token': self._refresh_token,
             'grant_type': 'refresh_token'
         }
 
-        async with self.session.post(self.URL, data=data) as response:
-            data: Dict[str, Any] = await response.json()
+        headers = {
+            'Authorization': f'Basic {self.build_basic_token()}',
+        }
 
-            self.expires_at = datetime.datetime.utcnow() + datetime.timedelta(seconds=data['expires_in'])
-            self.token = data['access_token']
+        response = await self.transport.request('POST', self.url, headers=headers, data=data)
+        data: Dict[str, Any] = response.json()
 
-            self._refresh_token = data.get('refresh_token')
+        self.expires_at = datetime.datetime.utcnow() + datetime.timedelta(seconds=data['expires_in'])
+        self.token = data['access_token']
+
+        # Spotify only sometimes rotates the refresh token.
+        self._refresh_token = data.get('refresh_token', self._refresh_token)
 
         return self.token
 
@@ -103,53 +206,322 @@ class HTTPClient:
         *, 
         loop: asyncio.AbstractEventLoop, 
         session: Optional[aiohttp.ClientSession] = None,
+        transport: Optional[Transport] = None,
+        connection: Optional[ConnectionSettings] = None,
+        warm_connections: int = 0,
+        token_store: Optional[TokenStore] = None,
+        token_store_key: Optional[str] = None,
+        ratelimit: Optional[RateLimiter] = None,
+        limiter: Optional[ConcurrencyLimiter] = None,
+        retry: Optional[RetryPolicy] = None,
+        hedging: Optional[HedgingPolicy] = None,
+        metrics: Optional[Metrics] = None,
+        tracer: Optional[Tracer] = None,
+        interner: Optional[Interner] = None,
     ) -> None:
         self.client_id = client_id
         self.client_secret = client_secret
         self.loop = loop
-        self.session = session or aiohttp.ClientSession(loop=self.loop)
-        self.auth = Authentication(client_id, client_secret, self.session)
+        if transport is not None and (session is not None or connection is not None):
+            raise TypeError('transport is mutually exclusive with session and connection')
+
+        self.transport = transport or AiohttpTransport(session, loop=self.loop, settings=connection)
+        self.warm_connections = warm_connections
+        self.auth = Authentication(
+            client_id, client_secret, self.transport, store=token_store, store_key=token_store_key
+        )
         self.errors: Dict[int, Type[HTTPException]] = {
             401: Unauthorized,
             403: Forbidden,
             404: NotFound,
-            400: BadRequest
+            400: BadRequest,
+            500: ServerError,
+            502: ServerError,
+            503: ServerError,
+            504: ServerError,
         }
 
-        self.lock = asyncio.Lock()
+        self.limiter = limiter or ConcurrencyLimiter(1)
+        self.ratelimit = ratelimit or RateLimiter()
+        self.retry = retry or RetryPolicy()
+        self.hedging = hedging
+        self.metrics = metrics or Metrics()
+        self.tracer = tracer
+        self.interner = interner
+        self.last_used = time.monotonic()
+        self.playback_watcher: Optional[PlaybackWatcher] = None
+        self.playback_commands: Optional[PlaybackCommandQueue] = None
+
+        if tracer is not None:
+            self.transport.install(tracer)
+
+        self.middlewares: List[Middleware] = [
+            self.retry_middleware,
+            self.ratelimit_middleware,
+            self.auth_middleware,
+            # Above the limiter and metrics, so that a hedged copy takes its own slot and is
+            # recorded like any other attempt.
+            self.hedging_middleware,
+            self.limiter_middleware,
+            self.metrics_middleware,
+        ]
 
     def update_params(self, **kwargs: Any) -> Dict[str, Any]:
         return {key: value for key, value in kwargs.items() if value is not None}
 
+    @property
+    def session(self) -> Optional[aiohttp.ClientSession]:
+        return getattr(self.transport, 'session', None)
+
+    async def start(self, connections: Optional[int] = None) -> int:
+        # Everything the first request would otherwise pay for: the token, DNS, TCP and TLS.
+        if connections is None:
+            connections = self.warm_connections
+
+        auth = self.auth
+        tasks = []
+        if auth.client_id or auth.is_oauth2():
+            tasks.append(auth.fetch_token())
+
+        warm = asyncio.ensure_future(self.transport.warm(self.URL, connections)) if connections else None
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            warmed = await warm if warm is not None else 0
+
+        return warmed
+
+    async def close(self) -> None:
+        await self.transport.close()
+
     async def read(self, url: str):
-        async with self.session.get(url) as response:
-            return await response.read()
+        response = await self.transport.request('GET', url)
+        return response.body
 
-    async def request(self, path: str, method: str, **kwargs) -> Dict[str, Any]:
-        token = await self.auth.fetch_token()
+    def add_middleware(self, middleware: Middleware, *, index: int = 0) -> None:
+        # Inserted in front of the built-in layers by default, so it sees every retry as one call.
+        self.middlewares.insert(index, middleware)
 
-        url = self.URL + path
-        headers = {
-            'Authorization': 'Bearer ' + token
-        }
+    def remove_middleware(self, middleware: Middleware) -> None:
+        self.middlewares.remove(middleware)
+
+    def record(self, cassette: Optional[Cassette] = None) -> Recorder:
+        recorder = Recorder(cassette)
+        self.add_middleware(recorder)
+
+        return recorder
+
+    def replay(self, cassette: Union[Cassette, str, os.PathLike[str]], *, latency: Union[float, str, None] = None) -> Replayer:
+        if not isinstance(cassette, Cassette):
+            cassette = Cassette.load(cassette)
+
+        replayer = Replayer(cassette, latency=latency)
+        self.add_middleware(replayer)
+
+        return replayer
+
+    async def request(
+        self,
+        path: str,
+        method: str,
+        *,
+        priority: Optional[Priority] = None,
+        timeout: Optional[float] = None,
+        params: Optional[Dict[str, Any]] = None,
+        json: Any = None,
+        data: Any = None,
+        **kwargs: Any
+    ) -> Dict[str, Any]:
+        with deadline.timeout(timeout):
+            request = Request(
+                method,
+                path,
+                self.URL + path,
+                params=params,
+                json=json,
+                data=data,
+                priority=priority or current_priority.get(),
+                deadline=deadline.current_deadline.get(),
+                kwargs=kwargs,
+            )
+
+            handler = build_handler(self.middlewares, self.send)
+            if self.tracer is not None:
+                return await self._traced_request(request, handler, self.tracer)
+
+            response = await handler(request)
+
+        return self._result(response)
+
+    def _result(self, response: Response) -> Dict[str, Any]:
+        if response.ok:
+            if self.interner is not None:
+                return self.interner.intern(response.data)
+
+            return response.data
+
+        error = self.errors.get(response.status, HTTPException)
+        raise error(response.data)
+
+    async def _traced_request(self, request: Request, handler: Handler, tracer: Tracer) -> Dict[str, Any]:
+        trace = request.trace = tracer.start(request.method, request.path, request.bucket)
+
+        try:
+            response = await handler(request)
+            trace.status = response.status
+
+            started = time.monotonic()
+            result = self._result(response)
+            trace.add('decode', time.monotonic() - started)
+
+            return result
+        except BaseException as exc:
+            trace.error = type(exc).__name__
+            raise
+        finally:
+            trace.attempts = request.attempt + 1
+            tracer.finish(trace)
+
+    async def send(self, request: Request) -> Response:
+        started = time.monotonic()
+
+        async def perform() -> Response:
+            response = await self.transport.request(
+                request.method,
+                request.url,
+                params=request.params,
+                json=request.json,
+                data=request.data,
+                headers=request.headers,
+                trace=request.trace,
+                kwargs=request.kwargs,
+            )
+
+            return Response(
+                request,
+                response.status,
+                response.headers,
+                response.body,
+                reason=response.reason,
+                latency=time.monotonic() - started,
+            )
+
+        return await deadline.within(perform(), 'request')
+
+    async def retry_middleware(self, request: Request, handler: Handler) -> Response:
+        retry = self.retry
+        if retry.is_retryable(request.method):
+            retry.budget.deposit()
+
+        while True:
+            failure: Optional[Exception] = None
+
+            try:
+                response = await handler(request)
+            except retry.exceptions as exc:
+                failure = exc
+            else:
+                if response.status not in retry.statuses:
+                    return response
+
+            request.attempt += 1
+            delay = retry.backoff(request.method, request.bucket, request.attempt, deadline.remaining())
+            if delay is None:
+                if failure is not None:
+                    raise failure
+
+                return response
+
+            if request.trace is not None:
+                request.trace.add('backoff', delay)
 
-        async with self.lock:
-            async with self.session.request(method, url, headers=headers, **kwargs) as response:
-                data = await response.json(encoding='utf-8')
+            await asyncio.sleep(delay)
 
-                if 300 > response.status >= 200:
-                    return data
+    async def ratelimit_middleware(self, request: Request, handler: Handler) -> Response:
+        bucket = request.bucket
 
-                if response.status == 429:
-                    retry_after = float(response.headers['Retry-After'])
-                    await asyncio.sleep(retry_after)
+        while True:
+            # Sleeping out a pause that outlasts the deadline would only end in a timeout.
+            deadline.check('ratelimit', await self.ratelimit.fetch_remaining_pause(bucket))
 
-                    return await self.request(path, method, **kwargs)
+            started = time.monotonic()
+            await deadline.within(self.ratelimit.wait(bucket), 'ratelimit')
 
-                error = self.errors.get(response.status, HTTPException)
-                raise error(data)
+            if request.trace is not None:
+                request.trace.add('ratelimit', time.monotonic() - started)
 
-        raise RuntimeError('Unreachable')
+            response = await handler(request)
+            if response.status != 429:
+                return response
+
+            retry_after = float(response.headers['Retry-After'])
+            await self.ratelimit.pause(retry_after, bucket)
+
+    async def auth_middleware(self, request: Request, handler: Handler) -> Response:
+        auth = self.auth
+        if auth.token is not None and not auth.is_expired():
+            token = auth.token
+        else:
+            started = time.monotonic()
+            token = await deadline.within(auth.fetch_token(), 'token')
+
+            elapsed = time.monotonic() - started
+            self.metrics.observe_token_refresh(elapsed)
+
+            if request.trace is not None:
+                request.trace.add('token', elapsed)
+
+        request.headers['Authorization'] = 'Bearer ' + token
+
+        return await handler(request)
+
+    async def limiter_middleware(self, request: Request, handler: Handler) -> Response:
+        queued = time.monotonic()
+        await deadline.within(self.limiter.acquire(request.priority), 'queue')
+        try:
+            self.last_used = started = time.monotonic()
+            if request.trace is not None:
+                request.trace.add('queue', started - queued)
+
+            response = await handler(request)
+            self.limiter.record(time.monotonic() - started, response.status)
+
+            return response
+        finally:
+            self.limiter.release()
+
+    async def metrics_middleware(self, request: Request, handler: Handler) -> Response:
+        started = time.monotonic()
+        try:
+            response = await handler(request)
+        except asyncio.CancelledError:
+            # Mostly the copy that lost a hedge, it still went out.
+            self.metrics.observe_cancelled(request.method, request.bucket)
+            raise
+        except Exception:
+            self.metrics.observe_error(request.method, request.bucket, time.monotonic() - started)
+            raise
+
+        retry_after = None
+        if response.status == 429:
+            retry_after = float(response.headers.get('Retry-After', 0))
+
+        self.metrics.observe_response(
+            request.method, request.bucket, response.status, time.monotonic() - started, len(response.body), retry_after
+        )
+
+        return response
+
+    async def hedging_middleware(self, request: Request, handler: Handler) -> Response:
+        hedging = self.hedging
+        if hedging is None or not hedging.is_hedgeable(request.method):
+            return await handler(request)
+
+        return await hedging.send(
+            request.bucket,
+            lambda: handler(request),
+            on_hedge=lambda: self.metrics.observe_hedge(request.method, request.bucket),
+        )
 
     async def search(
         self, query: str, type: str, market: Optional[str] = None, limit: int = 20, offset: int = 0
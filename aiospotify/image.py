@@ -1,12 +1,14 @@
 from __future__ import annotations
 
-from typing import Any, Dict, BinaryIO, Union
+from typing import TYPE_CHECKING, Any, Dict, BinaryIO, Union
 import asyncio
 import os
 
-from .http import HTTPClient
 from .utils import PY39
 
+if TYPE_CHECKING:
+    from .http import HTTPClient
+
 __all__ = (
     'Image',
 )
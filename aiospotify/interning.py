@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+import sys
+
+__all__ = (
+    'DEFAULT_INTERNED_FIELDS',
+    'Interner',
+)
+
+# Fields whose values repeat across payloads. A name matches that key in any object, a dotted
+# `parent.key` only matches the key inside the object stored under `parent`, which keeps
+# free-form fields like `id` out of the pool. List values have each string interned.
+DEFAULT_INTERNED_FIELDS: FrozenSet[str] = frozenset({
+    'available_markets',
+    'type',
+    'album_type',
+    'album_group',
+    'release_date',
+    'release_date_precision',
+    'media_type',
+    'language',
+    'languages',
+    'genres',
+    'country',
+    'product',
+    'url',
+    'added_by.id',
+    'added_by.href',
+    'added_by.uri',
+    'owner.id',
+    'owner.href',
+    'owner.uri',
+    'owner.display_name',
+})
+
+class Interner:
+    # One pool of canonical strings shared by every field, so that equal values coming from
+    # different payloads end up as the same object. Strings are pooled here rather than with
+    # `sys.intern` so that the pool can be bounded and dropped. Once `max_size` values are
+    # pooled, new values are left alone and existing ones keep being shared.
+    __slots__ = ('fields', 'nested', 'max_size', 'pool', 'hits', 'misses', 'saved')
+
+    def __init__(self, fields: Optional[Iterable[str]] = None, *, max_size: int = 65536) -> None:
+        if fields is None:
+            fields = DEFAULT_INTERNED_FIELDS
+
+        self.fields: FrozenSet[str] = frozenset(field for field in fields if '.' not in field)
+
+        nested: Dict[str, List[str]] = {}
+        for field in fields:
+            if '.' in field:
+                parent, key = field.split('.', 1)
+                nested.setdefault(parent, []).append(key)
+
+        # Merged up front, the walk would otherwise build a set for every nested object.
+        self.nested: Dict[str, FrozenSet[str]] = {
+            parent: self.fields | frozenset(keys) for parent, keys in nested.items()
+        }
+        self.max_size = max_size
+        self.pool: Dict[str, str] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.saved = 0
+
+    def __repr__(self) -> str:
+        return f'<Interner size={len(self.pool)} hits={self.hits} saved={self.saved}>'
+
+    def __len__(self) -> int:
+        return len(self.pool)
+
+    def clear(self) -> None:
+        self.pool.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {'size': len(self.pool), 'hits': self.hits, 'misses': self.misses, 'saved': self.saved}
+
+    def value(self, value: str) -> str:
+        canonical = self.pool.get(value)
+        if canonical is None:
+            self.misses += 1
+            if len(self.pool) < self.max_size:
+                self.pool[value] = value
+
+            return value
+
+        if canonical is not value:
+            self.hits += 1
+            self.saved += sys.getsizeof(value)
+
+        return canonical
+
+    def intern(self, data: Any) -> Any:
+        # Rewrites `data` in place and returns it. Only strings are swapped for equal ones, so
+        # the payload stays plain JSON. The walk is iterative and only descends into lists of
+        # objects, lists of strings are skipped unless their key is interned.
+        fields = self.fields
+        nested = self.nested
+        value = self.value
+        get = self.pool.get
+
+        stack: List[Tuple[Any, FrozenSet[str]]] = [(data, fields)]
+        pop = stack.pop
+        push = stack.append
+
+        # Decoded JSON only holds exact types, comparing them is cheaper than isinstance.
+        while stack:
+            obj, keys = pop()
+            if type(obj) is list:
+                for item in obj:
+                    if type(item) is dict:
+                        push((item, keys))
+
+                continue
+
+            for key, item in obj.items():
+                cls = type(item)
+                if cls is str:
+                    if key in keys:
+                        obj[key] = value(item)
+                elif cls is dict:
+                    push((item, nested.get(key, fields)))
+                elif cls is list and item:
+                    first = type(item[0])
+                    if first is dict:
+                        push((item, fields))
+                    elif first is str and key in keys:
+                        # Market lists run to ~185 codes, most of them already pooled, so
+                        # hits are resolved with a plain lookup and only misses pay a call.
+                        misses = self.misses
+                        item[:] = [get(element) or value(element) for element in item]
+
+                        hits = len(item) - (self.misses - misses)
+                        self.hits += hits
+                        self.saved += hits * sys.getsizeof(item[0])
+
+        return data
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Tuple, TypeVar
+
+__all__ = (
+    'Markets',
+    'register_markets',
+    'available_in',
+)
+
+T = TypeVar('T')
+
+# The markets returned by `GET /markets`, in order. A market's position is its bit, codes that
+# show up later are appended by `register_markets`, existing bits never move.
+SPOTIFY_MARKETS: Tuple[str, ...] = (
+    'AD', 'AE', 'AG', 'AL', 'AM', 'AO', 'AR', 'AT', 'AU', 'AZ', 'BA', 'BB', 'BD', 'BE', 'BF', 'BG', 'BH', 'BI',
+    'BJ', 'BN', 'BO', 'BR', 'BS', 'BT', 'BW', 'BY', 'BZ', 'CA', 'CD', 'CG', 'CH', 'CI', 'CL', 'CM', 'CO', 'CR',
+    'CV', 'CW', 'CY', 'CZ', 'DE', 'DJ', 'DK', 'DM', 'DO', 'DZ', 'EC', 'EE', 'EG', 'ES', 'ET', 'FI', 'FJ', 'FM',
+    'FR', 'GA', 'GB', 'GD', 'GE', 'GH', 'GM', 'GN', 'GQ', 'GR', 'GT', 'GW', 'GY', 'HK', 'HN', 'HR', 'HT', 'HU',
+    'ID', 'IE', 'IL', 'IN', 'IQ', 'IS', 'IT', 'JM', 'JO', 'JP', 'KE', 'KG', 'KH', 'KI', 'KM', 'KN', 'KR', 'KW',
+    'KZ', 'LA', 'LB', 'LC', 'LI', 'LK', 'LR', 'LS', 'LT', 'LU', 'LV', 'LY', 'MA', 'MC', 'MD', 'ME', 'MG', 'MH',
+    'MK', 'ML', 'MN', 'MO', 'MR', 'MT', 'MU', 'MV', 'MW', 'MX', 'MY', 'MZ', 'NA', 'NE', 'NG', 'NI', 'NL', 'NO',
+    'NP', 'NR', 'NZ', 'OM', 'PA', 'PE', 'PG', 'PH', 'PK', 'PL', 'PR', 'PS', 'PT', 'PW', 'PY', 'QA', 'RO', 'RS',
+    'RW', 'SA', 'SB', 'SC', 'SE', 'SG', 'SI', 'SK', 'SL', 'SM', 'SN', 'SR', 'ST', 'SV', 'SZ', 'TD', 'TG', 'TH',
+    'TJ', 'TL', 'TN', 'TO', 'TR', 'TT', 'TV', 'TW', 'TZ', 'UA', 'UG', 'US', 'UY', 'UZ', 'VC', 'VE', 'VN', 'VU',
+    'WS', 'XK', 'ZA', 'ZM', 'ZW',
+)
+
+MARKETS: List[str] = list(SPOTIFY_MARKETS)
+BITS: Dict[str, int] = {code: 1 << index for index, code in enumerate(MARKETS)}
+EMPTY_EXTRA: FrozenSet[str] = frozenset()
+
+def register_markets(codes: Iterable[str]) -> None:
+    # Pass the result of `HTTPClient.get_available_markets` to index markets Spotify added
+    # after this release up front. Unknown codes in payloads are registered as they come if
+    # they look like country codes, which bounds the table to 26 * 26 entries.
+    for code in codes:
+        if code not in BITS:
+            BITS[code] = 1 << len(MARKETS)
+            MARKETS.append(code)
+
+def _is_country(code: str) -> bool:
+    return len(code) == 2 and code.isascii() and code.isalpha() and code.isupper()
+
+def _mask(codes: Iterable[str]) -> Tuple[int, FrozenSet[str]]:
+    codes = set(codes)
+    try:
+        return sum(map(BITS.__getitem__, codes)), EMPTY_EXTRA
+    except KeyError:
+        pass
+
+    register_markets(sorted(code for code in codes if code not in BITS and _is_country(code)))
+
+    # Anything else is kept by name on the instance instead of growing the global table.
+    extra = frozenset(code for code in codes if code not in BITS)
+    return sum(BITS[code] for code in codes if code in BITS), extra
+
+# Most tracks of an album, and most albums, share the exact same list. Identical lists share
+# one instance, so a cached track pays a single pointer for its markets. Keyed by the bits,
+# keeping the codes around would defeat the point.
+_interned: Dict[Tuple[int, FrozenSet[str]], Markets] = {}
+MAX_INTERNED = 4096
+
+# Consecutive payloads (the tracks of one page) usually carry the same list, comparing against
+# the previous one is several times cheaper than building the mask again. The codes are copied
+# into a tuple so that a list mutated after the fact can't match its old self.
+_last: List[Any] = [None, None]
+
+class Markets:
+    __slots__ = ('bits', 'extra')
+
+    def __init__(self, bits: int = 0, extra: FrozenSet[str] = EMPTY_EXTRA) -> None:
+        self.bits = bits
+        self.extra = extra
+
+    @classmethod
+    def from_codes(cls, codes: Iterable[str]) -> Markets:
+        if isinstance(codes, Markets):
+            return codes
+
+        key = tuple(codes)
+        if key == _last[0]:
+            return _last[1]
+
+        mask = _mask(key)
+        markets = _interned.get(mask)
+        if markets is None:
+            markets = Markets(*mask)
+            if len(_interned) < MAX_INTERNED:
+                _interned[mask] = markets
+
+        _last[:] = key, markets
+        return markets
+
+    @classmethod
+    def from_data(cls, data: Dict[str, Any]) -> Markets:
+        codes = data.get('available_markets')
+        if codes is None:
+            return EMPTY
+
+        return cls.from_codes(codes)
+
+    @classmethod
+    def split(cls, data: Dict[str, Any]) -> Tuple[Dict[str, Any], Markets]:
+        # For models, which keep the bitset in place of the list: the payload comes back as a
+        # shallow copy without `available_markets`, the caller's dict is left alone.
+        if 'available_markets' not in data:
+            return data, EMPTY
+
+        data = data.copy()
+        codes = data.pop('available_markets')
+        return data, EMPTY if codes is None else cls.from_codes(codes)
+
+    def __repr__(self) -> str:
+        return f'<Markets count={len(self)}>'
+
+    def __contains__(self, code: object) -> bool:
+        bit = BITS.get(code) # type: ignore
+        if bit is None:
+            return code in self.extra
+
+        return self.bits & bit != 0
+
+    def __iter__(self) -> Iterator[str]:
+        bits = self.bits
+        while bits:
+            low = bits & -bits
+            yield MARKETS[low.bit_length() - 1]
+            bits ^= low
+
+        yield from sorted(self.extra)
+
+    def __len__(self) -> int:
+        return bin(self.bits).count('1') + len(self.extra)
+
+    def __bool__(self) -> bool:
+        return self.bits != 0 or bool(self.extra)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Markets):
+            return NotImplemented
+
+        return self.bits == other.bits and self.extra == other.extra
+
+    def __hash__(self) -> int:
+        return hash((self.bits, self.extra))
+
+    def __and__(self, other: Markets) -> Markets:
+        return Markets(self.bits & other.bits, self.extra & other.extra)
+
+    def __or__(self, other: Markets) -> Markets:
+        return Markets(self.bits | other.bits, self.extra | other.extra)
+
+    def __sub__(self, other: Markets) -> Markets:
+        return Markets(self.bits & ~other.bits, self.extra - other.extra)
+
+    def to_list(self) -> List[str]:
+        return list(self)
+
+EMPTY = Markets()
+
+def available_in(items: Iterable[T], *codes: str) -> List[T]:
+    # Keeps the items available in every one of `codes`. The codes are folded into a single
+    # mask up front, each item then costs one integer and.
+    known = {code for code in codes if code in BITS}
+    extra = frozenset(codes) - known
+    mask = sum(BITS[code] for code in known)
+
+    if extra:
+        return [item for item in items if item.markets.bits & mask == mask and extra <= item.markets.extra] # type: ignore
+
+    return [item for item in items if item.markets.bits & mask == mask] # type: ignore
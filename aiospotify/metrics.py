@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from collections import Counter
+import bisect
+import math
+
+__all__ = (
+    'Histogram',
+    'EndpointMetrics',
+    'Metrics',
+)
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _labels(**labels: str) -> str:
+    return ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return '+Inf'
+
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Histogram:
+    __slots__ = ('bounds', 'counts', 'count', 'sum')
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.bounds = tuple(sorted(bounds))
+        # One extra slot for everything above the last bound.
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def __repr__(self) -> str:
+        return f'<Histogram count={self.count} sum={self.sum:.3f}>'
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        buckets = []
+        total = 0
+
+        for bound, count in zip(self.bounds + (math.inf,), self.counts):
+            total += count
+            buckets.append((bound, total))
+
+        return buckets
+
+    def quantile(self, quantile: float) -> Optional[float]:
+        # Upper bound of the bucket holding the quantile, the same estimate Prometheus would give.
+        if not self.count:
+            return None
+
+        rank = quantile * self.count
+        for bound, total in self.cumulative():
+            if total >= rank:
+                return bound
+
+        return math.inf
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'buckets': {_number(bound): total for bound, total in self.cumulative()},
+        }
+
+class EndpointMetrics:
+    __slots__ = (
+        'method',
+        'route',
+        'requests',
+        'statuses',
+        'errors',
+        'latency',
+        'bytes_received',
+        'ratelimited',
+        'retry_after',
+        'hedged',
+        'cancelled',
+    )
+
+    def __init__(self, method: str, route: str, bounds: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.method = method
+        self.route = route
+        self.requests = 0
+        self.statuses: Counter[int] = Counter()
+        self.errors = 0
+        self.latency = Histogram(bounds)
+        self.bytes_received = 0
+        self.ratelimited = 0
+        self.retry_after = 0.0
+        self.hedged = 0
+        self.cancelled = 0
+
+    def __repr__(self) -> str:
+        return f'<EndpointMetrics method={self.method!r} route={self.route!r} requests={self.requests}>'
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'requests': self.requests,
+            'statuses': dict(self.statuses),
+            'errors': self.errors,
+            'latency': self.latency.to_dict(),
+            'p50': self.latency.quantile(0.5),
+            'p95': self.latency.quantile(0.95),
+            'p99': self.latency.quantile(0.99),
+            'bytes_received': self.bytes_received,
+            'ratelimited': self.ratelimited,
+            'retry_after': self.retry_after,
+            'hedged': self.hedged,
+            'cancelled': self.cancelled,
+        }
+
+class Metrics:
+    # Every attempt that reaches the network is recorded under its route template, so ids
+    # don't blow up the number of series.
+
+    def __init__(self, *, buckets: Sequence[float] = DEFAULT_BUCKETS, namespace: str = 'aiospotify') -> None:
+        self.buckets = tuple(buckets)
+        self.namespace = namespace
+
+        self.endpoints: Dict[Tuple[str, str], EndpointMetrics] = {}
+        self.token_refresh = Histogram(self.buckets)
+
+    def __repr__(self) -> str:
+        return f'<Metrics endpoints={len(self.endpoints)}>'
+
+    def endpoint(self, method: str, route: str) -> EndpointMetrics:
+        key = (method, route)
+        endpoint = self.endpoints.get(key)
+        if endpoint is None:
+            endpoint = self.endpoints[key] = EndpointMetrics(method, route, self.buckets)
+
+        return endpoint
+
+    def observe_response(
+        self, method: str, route: str, status: int, latency: float, size: int, retry_after: Optional[float] = None
+    ) -> None:
+        endpoint = self.endpoint(method, route)
+        endpoint.requests += 1
+        endpoint.statuses[status] += 1
+        endpoint.latency.observe(latency)
+        endpoint.bytes_received += size
+
+        if status == 429:
+            endpoint.ratelimited += 1
+            endpoint.retry_after += retry_after or 0.0
+
+    def observe_error(self, method: str, route: str, latency: float) -> None:
+        endpoint = self.endpoint(method, route)
+        endpoint.requests += 1
+        endpoint.errors += 1
+        endpoint.latency.observe(latency)
+
+    def observe_cancelled(self, method: str, route: str) -> None:
+        endpoint = self.endpoint(method, route)
+        endpoint.requests += 1
+        endpoint.cancelled += 1
+
+    def observe_hedge(self, method: str, route: str) -> None:
+        self.endpoint(method, route).hedged += 1
+
+    def observe_token_refresh(self, seconds: float) -> None:
+        self.token_refresh.observe(seconds)
+
+    def reset(self) -> None:
+        self.endpoints.clear()
+        self.token_refresh = Histogram(self.buckets)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'endpoints': {
+                f'{method} {route}': endpoint.to_dict() for (method, route), endpoint in sorted(self.endpoints.items())
+            },
+            'token_refresh': self.token_refresh.to_dict(),
+        }
+
+    def to_prometheus(self) -> str:
+        prefix = self.namespace
+        lines: List[str] = []
+
+        def header(name: str, kind: str, help: str) -> str:
+            lines.append(f'# HELP {prefix}_{name} {help}')
+            lines.append(f'# TYPE {prefix}_{name} {kind}')
+            return f'{prefix}_{name}'
+
+        def histogram(name: str, histogram: Histogram, **labels: str) -> None:
+            for bound, total in histogram.cumulative():
+                lines.append(f'{name}_bucket{{{_labels(**labels, le=_number(bound))}}} {total}')
+
+            suffix = f'{{{_labels(**labels)}}}' if labels else ''
+            lines.append(f'{name}_sum{suffix} {_number(histogram.sum)}')
+            lines.append(f'{name}_count{suffix} {histogram.count}')
+
+        endpoints = sorted(self.endpoints.items())
+
+        name = header('requests_total', 'counter', 'Requests sent to the Spotify API.')
+        for (method, route), endpoint in endpoints:
+            lines.append(f'{name}{{{_labels(method=method, route=route)}}} {endpoint.requests}')
+
+        name = header('responses_total', 'counter', 'Responses by status code.')
+        for (method, route), endpoint in endpoints:
+            for status, count in sorted(endpoint.statuses.items()):
+                lines.append(f'{name}{{{_labels(method=method, route=route, status=str(status))}}} {count}')
+
+        name = header('request_errors_total', 'counter', 'Requests that failed without a response.')
+        for (method, route), endpoint in endpoints:
+            lines.append(f'{name}{{{_labels(method=method, route=route)}}} {endpoint.errors}')
+
+        name = header('request_duration_seconds', 'histogram', 'Time from sending a request to reading its body.')
+        for (method, route), endpoint in endpoints:
+            histogram(name, endpoint.latency, method=method, route=route)
+
+        name = header('response_bytes_total', 'counter', 'Response body bytes received.')
+        for (method, route), endpoint in endpoints:
+            lines.append(f'{name}{{{_labels(method=method, route=route)}}} {endpoint.bytes_received}')
+
+        name = header('ratelimited_total', 'counter', 'Responses with status 429.')
+        for (method, route), endpoint in endpoints:
+            lines.append(f'{name}{{{_labels(method=method, route=route)}}} {endpoint.ratelimited}')
+
+        name = header('retry_after_seconds_total', 'counter', 'Sum of Retry-After delays received.')
+        for (method, route), endpoint in endpoints:
+            lines.append(f'{name}{{{_labels(method=method, route=route)}}} {_number(endpoint.retry_after)}')
+
+        name = header('hedged_requests_total', 'counter', 'Requests that were sent a second time by hedging.')
+        for (method, route), endpoint in endpoints:
+            lines.append(f'{name}{{{_labels(method=method, route=route)}}} {endpoint.hedged}')
+
+        name = header('requests_cancelled_total', 'counter', 'Requests cancelled before a response, mostly lost hedges.')
+        for (method, route), endpoint in endpoints:
+            lines.append(f'{name}{{{_labels(method=method, route=route)}}} {endpoint.cancelled}')
+
+        name = header('token_refresh_seconds', 'histogram', 'Time requests spent waiting for a token refresh.')
+        histogram(name, self.token_refresh)
+
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Iterable, Mapping, Optional
+import json
+import time
+
+from .enums import Priority
+from .utils import route_template
+
+if TYPE_CHECKING:
+    from .tracing import RequestTrace
+
+__all__ = (
+    'Request',
+    'Response',
+    'Handler',
+    'Middleware',
+    'build_handler',
+)
+
+class Request:
+    __slots__ = (
+        'method',
+        'path',
+        'url',
+        'params',
+        'json',
+        'data',
+        'headers',
+        'priority',
+        'deadline',
+        'bucket',
+        'attempt',
+        'kwargs',
+        'trace',
+    )
+
+    def __init__(
+        self,
+        method: str,
+        path: str,
+        url: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        json: Any = None,
+        data: Any = None,
+        headers: Optional[Dict[str, str]] = None,
+        priority: Priority = Priority.Interactive,
+        deadline: Optional[float] = None,
+        kwargs: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.method = method.upper()
+        self.path = path
+        self.url = url
+        self.params = params
+        self.json = json
+        self.data = data
+        self.headers: Dict[str, str] = headers or {}
+        self.priority = priority
+        self.deadline = deadline
+        self.bucket = route_template(path)
+        self.attempt = 0
+        self.kwargs: Dict[str, Any] = kwargs or {}
+        self.trace: Optional[RequestTrace] = None
+
+    def __repr__(self) -> str:
+        return f'<Request method={self.method!r} path={self.path!r} priority={self.priority} attempt={self.attempt}>'
+
+    def remaining(self) -> Optional[float]:
+        if self.deadline is None:
+            return None
+
+        return self.deadline - time.monotonic()
+
+class Response:
+    __slots__ = ('request', 'status', 'reason', 'headers', 'body', 'latency', '_data')
+
+    def __init__(
+        self,
+        request: Request,
+        status: int,
+        headers: Mapping[str, str],
+        body: bytes,
+        *,
+        reason: Optional[str] = None,
+        latency: float = 0.0,
+    ) -> None:
+        self.request = request
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+        self.latency = latency
+        self._data: Optional[Dict[str, Any]] = None
+
+    def __repr__(self) -> str:
+        return f'<Response status={self.status} path={self.request.path!r} size={len(self.body)}>'
+
+    @property
+    def ok(self) -> bool:
+        return 300 > self.status >= 200
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        if self._data is None:
+            self._data = self._decode()
+
+        return self._data
+
+    def _decode(self) -> Dict[str, Any]:
+        # Player endpoints answer with an empty 204 when there is nothing to report.
+        try:
+            data = json.loads(self.body.decode('utf-8')) if self.body else {}
+        except ValueError:
+            # Proxies and load balancers answer outages with HTML pages.
+            if self.ok:
+                raise
+
+            data = {}
+
+        if not self.ok:
+            data = self._error(data)
+
+        return data
+
+    def _error(self, data: Any) -> Dict[str, Any]:
+        # Error bodies aren't always Spotify's `{"error": {"status", "message"}}`: the accounts
+        # service sends `{"error": "...", "error_description": "..."}` and anything else may
+        # send a list or a bare string. Whatever comes in, the result has both fields.
+        if not isinstance(data, dict):
+            data = {}
+
+        error = data.get('error')
+        if isinstance(error, dict):
+            message = error.get('message')
+        else:
+            message = data.get('error_description') or error
+            error = {}
+
+        data['error'] = {
+            **error,
+            'status': error.get('status') or self.status,
+            'message': message if isinstance(message, str) and message else self.reason or 'Unknown error',
+        }
+        return data
+
+Handler = Callable[[Request], Awaitable[Response]]
+Middleware = Callable[[Request, Handler], Awaitable[Response]]
+
+def _bind(middleware: Middleware, handler: Handler) -> Handler:
+    async def call(request: Request) -> Response:
+        return await middleware(request, handler)
+
+    return call
+
+def build_handler(middlewares: Iterable[Middleware], handler: Handler) -> Handler:
+    # The first middleware is the outermost one, it sees the request first and the response last.
+    for middleware in reversed(list(middlewares)):
+        handler = _bind(middleware, handler)
+
+    return handler
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, Callable, Coroutine, Generic, List, Protocol, TypeVar, Generator
+from typing import TYPE_CHECKING, Any, Callable, Coroutine, Deque, Dict, Generic, Hashable, List, Optional, Protocol, Set, TypeVar, Generator
 from abc import ABC, abstractmethod
+from collections import deque
+import asyncio
 
 if TYPE_CHECKING:
     from typing_extensions import Self
@@ -12,12 +14,18 @@ M = TypeVar('M')
 
 __all__ = (
     'Paginator',
+    'CursorPaginator',
+    'CursorTail',
 )
 
 class PaginatorCallback(Protocol, Generic[T]):
     async def __call__(self, *args: Any, offset: int, limit: int) -> List[T]:
         ...
 
+class CursorPaginatorCallback(Protocol):
+    async def __call__(self, *args: Any, limit: int, **kwargs: Any) -> Dict[str, Any]:
+        ...
+
 class EmptyPage(Exception):
     pass
 
@@ -103,3 +111,212 @@ class Paginator(AbstractPaginator[T]):
         self.items.extend(items)
 
         return items
+
+class CursorPaginator(AbstractPaginator[T]):
+    __slots__ = (
+        'items',
+        'callback',
+        'factory',
+        'limit',
+        'max',
+        'key',
+        'direction',
+        'cursor',
+        'fetched',
+        'exhausted',
+        'args',
+        'kwargs'
+    )
+
+    def __init__(
+        self,
+        callback: CursorPaginatorCallback,
+        factory: Callable[[Dict[str, Any]], T],
+        limit: int = 50,
+        max: Optional[int] = None,
+        *args: Any,
+        key: Optional[str] = None,
+        direction: str = 'after',
+        cursor: Optional[Any] = None,
+        **kwargs: Any
+    ) -> None:
+        if not 0 < limit <= 50:
+            raise ValueError('limit value must be between 1 and 50')
+
+        if direction not in ('after', 'before'):
+            raise ValueError("direction must be either 'after' or 'before'")
+
+        self.items: List[T] = []
+        self.callback = callback
+        self.factory = factory
+        self.limit = limit
+        self.max = max
+        self.key = key
+        self.direction = direction
+        self.cursor = cursor
+        self.fetched = 0
+        self.exhausted = False
+        self.args = args
+        self.kwargs = kwargs
+
+    def __repr__(self):
+        return f'<CursorPaginator {self.direction}={self.cursor!r} limit={self.limit} max={self.max}>'
+
+    def __len__(self):
+        return len(self.items)
+
+    async def next(self) -> List[T]:
+        if self.exhausted:
+            raise EmptyPage
+
+        if self.max is not None and self.fetched >= self.max:
+            raise MaxReached
+
+        kwargs = self.kwargs.copy()
+        if self.cursor is not None:
+            kwargs[self.direction] = self.cursor
+
+        data = await self.callback(*self.args, limit=self.limit, **kwargs)
+        if self.key is not None:
+            data = data[self.key]
+
+        payloads: List[Dict[str, Any]] = data.get('items', [])
+        if self.max is not None:
+            payloads = payloads[:self.max - self.fetched]
+
+        cursors = data.get('cursors') or {}
+        self.cursor = cursors.get(self.direction)
+
+        # Spotify signals the last page with a null `next` url, the cursors are
+        # not guaranteed to be null at that point.
+        if data.get('next') is None or self.cursor is None:
+            self.exhausted = True
+
+        if not payloads:
+            raise EmptyPage
+
+        items = [self.factory(payload) for payload in payloads]
+
+        self.fetched += len(items)
+        self.items.extend(items)
+
+        return items
+
+class CursorTail(AbstractPaginator[T]):
+    __slots__ = (
+        'items',
+        'callback',
+        'factory',
+        'identity',
+        'interval',
+        'limit',
+        'cursor',
+        'include_existing',
+        'max_pages',
+        'seeded',
+        'seen',
+        '_seen_order',
+        'args',
+        'kwargs'
+    )
+
+    def __init__(
+        self,
+        callback: CursorPaginatorCallback,
+        factory: Callable[[Dict[str, Any]], T],
+        identity: Callable[[Dict[str, Any]], Hashable],
+        interval: float = 30.0,
+        limit: int = 50,
+        *args: Any,
+        cursor: Optional[Any] = None,
+        include_existing: bool = False,
+        history: int = 1000,
+        max_pages: int = 20,
+        **kwargs: Any
+    ) -> None:
+        if not 0 < limit <= 50:
+            raise ValueError('limit value must be between 1 and 50')
+
+        if max_pages < 1:
+            raise ValueError('max_pages must be at least 1')
+
+        self.items: List[T] = []
+        self.callback = callback
+        self.factory = factory
+        self.identity = identity
+        self.interval = interval
+        self.limit = limit
+        self.cursor = cursor
+        self.include_existing = include_existing
+        self.max_pages = max_pages
+        self.seeded = cursor is not None
+        self.seen: Set[Hashable] = set()
+        self._seen_order: Deque[Hashable] = deque(maxlen=history)
+        self.args = args
+        self.kwargs = kwargs
+
+    def __repr__(self):
+        return f'<CursorTail after={self.cursor!r} interval={self.interval}>'
+
+    def __len__(self):
+        return len(self.items)
+
+    def _remember(self, key: Hashable) -> None:
+        if len(self._seen_order) == self._seen_order.maxlen:
+            self.seen.discard(self._seen_order[0])
+
+        self._seen_order.append(key)
+        self.seen.add(key)
+
+    async def poll(self) -> List[T]:
+        new: List[Dict[str, Any]] = []
+
+        # Bounded, a poll that keeps being told there's more is picked up by the next one.
+        for _ in range(self.max_pages):
+            previous = self.cursor
+            kwargs = self.kwargs.copy()
+            if self.cursor is not None:
+                kwargs['after'] = self.cursor
+
+            data = await self.callback(*self.args, limit=self.limit, **kwargs)
+
+            page: List[Dict[str, Any]] = []
+            for payload in data.get('items', []):
+                key = self.identity(payload)
+                if key in self.seen:
+                    continue
+
+                self._remember(key)
+                page.append(payload)
+
+            # Pages come newest first and `items` is consumed from the end, so newer
+            # pages go in front to keep plays yielded in chronological order.
+            new = page + new
+
+            cursors = data.get('cursors') or {}
+            if cursors.get('after') is not None:
+                self.cursor = cursors['after']
+
+            # More plays happened since the last poll than fit in a single page. Asking again
+            # with a cursor that didn't move, or after a page with nothing new, would only
+            # fetch the same page.
+            if data.get('next') is None or not self.seeded or not page or self.cursor == previous:
+                break
+
+        if not self.seeded:
+            self.seeded = True
+            if not self.include_existing:
+                return []
+
+        items = [self.factory(payload) for payload in new]
+        self.items.extend(items)
+
+        return items
+
+    async def next(self) -> List[T]:
+        while True:
+            items = await self.poll()
+            if items:
+                return items
+
+            await asyncio.sleep(self.interval)
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
-from typing import Dict, Any, List, Optional
+from typing import TYPE_CHECKING, Dict, Any, List, Optional
 
-from .http import HTTPClient
 from .enums import AlbumType, ObjectType, MediaType
 from .image import Image
+from .markets import Markets
 from .objects import Copyright, ExternalURLs, ExternalIDs, IDComparable
 from .utils import cached_slot_property
 
+if TYPE_CHECKING:
+    from .http import HTTPClient
+
 __all__ = (
     'PartialTrack',
     'PartialUser',
@@ -78,7 +81,7 @@ class PartialShow(IDComparable):
     __slots__ = (
         '_data',
         '_http',
-        'available_markets',
+        'markets',
         'description',
         'explicit',
         'href',
@@ -93,10 +96,9 @@ class PartialShow(IDComparable):
     )
 
     def __init__(self, data: Dict[str, Any], http: HTTPClient) -> None:
-        self._data = data
+        self._data, self.markets = Markets.split(data)
         self._http = http
 
-        self.available_markets: List[str] = data.get('available_markets', [])
         self.description: str = data['description']
         self.explicit: bool = data['explicit']
         self.href: str = data['href']
@@ -112,6 +114,14 @@ class PartialShow(IDComparable):
     def __repr__(self) -> str:
         return f'<{self.__class__.__name__} name={self.name!r} id={self.id!r} uri={self.uri!r}>'
 
+    @property
+    def available_markets(self) -> List[str]:
+        return self.markets.to_list()
+
+    @available_markets.setter
+    def available_markets(self, value: List[str]) -> None:
+        self.markets = Markets.from_codes(value)
+
     @property
     def images(self) -> List[Image]:
         return [Image(image, self._http) for image in self._data['images']]
@@ -151,7 +161,7 @@ class PartialTrack(IDComparable):
     __slots__ = (
         '_cs_artists'
         '_data',
-        'available_markets',
+        'markets',
         'disc_number',
         'duration',
         'explicit',
@@ -165,9 +175,8 @@ class PartialTrack(IDComparable):
     )
 
     def __init__(self, data: Dict[str, Any]) -> None:
-        self._data = data
+        self._data, self.markets = Markets.split(data)
 
-        self.available_markets: List[str] = data.get('available_markets', [])
         self.disc_number: int = data['disc_number']
         self.duration: int = data['duration_ms']
         self.explicit: bool = data['explicit']
@@ -184,6 +193,14 @@ class PartialTrack(IDComparable):
     def __repr__(self) -> str:
         return f'<{self.__class__.__name__} name={self.name!r} id={self.id!r} uri={self.uri!r}>'
 
+    @property
+    def available_markets(self) -> List[str]:
+        return self.markets.to_list()
+
+    @available_markets.setter
+    def available_markets(self, value: List[str]) -> None:
+        self.markets = Markets.from_codes(value)
+
     @property
     def external_ids(self):
         return ExternalIDs(self._data.get('external_ids', {}))
@@ -218,7 +235,7 @@ class PartialAlbum(IDComparable):
         '_data',
         'album_type',
         'type',
-        'available_markets',
+        'markets',
         'href',
         'id',
         'uri',
@@ -227,10 +244,9 @@ class PartialAlbum(IDComparable):
 
     def __init__(self, data: Dict[str, Any], http: HTTPClient) -> None:
         self._http = http
-        self._data = data
+        self._data, self.markets = Markets.split(data)
         self.album_type = AlbumType(data['album_type']) 
         self.type = ObjectType(data['type'])
-        self.available_markets: List[str] = data.get('available_markets', [])
         self.href: str = data['href']
         self.id: str = data['id']
         self.uri: str = data['uri']
@@ -239,6 +255,14 @@ class PartialAlbum(IDComparable):
     def __repr__(self) -> str:
         return f'<{self.__class__.__name__} id={self.id!r} uri={self.uri!r}>'
 
+    @property
+    def available_markets(self) -> List[str]:
+        return self.markets.to_list()
+
+    @available_markets.setter
+    def available_markets(self, value: List[str]) -> None:
+        self.markets = Markets.from_codes(value)
+
     @property
     def external_urls(self):
         return ExternalURLs(self._data['external_urls'])
@@ -1,14 +1,24 @@
-from typing import Dict, Any, List, Optional, Union
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable, Coroutine, Dict, Any, List, Optional, Tuple, Union
+import time
 
-from .http import HTTPClient
 from .enums import DeviceType, ObjectType, RepeatState, ShuffleState, CurrentPlayingType
-from .objects import ExternalURLs
+from .objects import ExternalURLs, Object
 from .partials import PartialTrack, PartialEpisode
+from .track import Track
+from .episode import Episode
+from .utils import fromisoformat
+
+if TYPE_CHECKING:
+    from .http import HTTPClient
 
 __all__ = (
     'Device',
     'PlaybackContext',
     'PlaybackActions',
+    'PlayHistory',
+    'PlaybackMismatch',
     'UserPlayback'
 )
 
@@ -50,18 +60,166 @@ class PlaybackActions:
         self.toggling_repeat_track: Optional[bool] = data.get('toggling_repeat_track')
         self.transferring_playback: Optional[bool] = data.get('transferring_playback')
 
-class UserPlayback:
+class PlayHistory:
+    __slots__ = ('_data', '_http', 'track', 'played_at')
+
     def __init__(self, data: Dict[str, Any], http: HTTPClient) -> None:
         self._data = data
         self._http = http
 
+        self.track = Track(data['track'], http)
+        self.played_at = fromisoformat(data['played_at'])
+
+    def __repr__(self) -> str:
+        return f'<PlayHistory track={self.track!r} played_at={self.played_at!r}>'
+
+    @property
+    def context(self) -> Optional[PlaybackContext]:
+        context = self._data.get('context')
+        return PlaybackContext(context) if context else None
+
+class PlaybackMismatch:
+    __slots__ = ('field', 'expected', 'actual')
+
+    def __init__(self, field: str, expected: Any, actual: Any) -> None:
+        self.field = field
+        self.expected = expected
+        self.actual = actual
+
+    def __repr__(self) -> str:
+        return f'<PlaybackMismatch field={self.field!r} expected={self.expected!r} actual={self.actual!r}>'
+
+class UserPlayback:
+    # The fields of the local model each command kind changes optimistically.
+    FIELDS: Dict[str, Tuple[str, ...]] = {
+        'play': ('is_playing', 'item', 'progress_ms'),
+        'pause': ('is_playing',),
+        'skip': ('item', 'previous_item', 'progress_ms'),
+        'seek': ('progress_ms',),
+        'repeat': ('repeat',),
+        'shuffle': ('shuffle',),
+        'volume': ('volume',),
+    }
+
+    def __init__(self, data: Dict[str, Any], http: HTTPClient) -> None:
+        self._http = http
+
+        # Local model: commands update these attributes right away and record what they
+        # expect the server to report, `reconcile` later checks that against server truth.
+        self.queued: List[Union[PartialTrack, PartialEpisode]] = []
+        self._expected: Dict[str, Tuple[Any, float]] = {}
+        # Commands that are queued or in flight, per field. Until they are acknowledged the
+        # server can't know about them yet.
+        self._inflight: Dict[str, int] = {}
+
+        self._update(data)
+
+    def _update(self, data: Dict[str, Any]) -> None:
+        self._data = data
+        self._item: Optional[Union[PartialTrack, PartialEpisode]] = None
+
         self.repeat = RepeatState(data['repeat_state'])
-        self.shuffle = ShuffleState(data['shuffle_state'])
+        # The API sends shuffle_state as a boolean rather than the 'on'/'off' strings.
+        self.shuffle = ShuffleState.On if data['shuffle_state'] else ShuffleState.Off
         self.timestamp: int = data['timestamp']
         self.progress_ms: Optional[int] = data['progress_ms']
         self.is_playing: bool = data['is_playing']
         self.currently_playing_type = CurrentPlayingType(data['currently_playing_type'])
 
+        device = data.get('device')
+        self.volume: Optional[int] = device['volume_percent'] if device else None
+
+    def _item_uri(self) -> Optional[str]:
+        if self._item is not None:
+            return self._item.uri
+
+        item = self._data.get('item')
+        return item['uri'] if item else None
+
+    def _expect(self, field: str, value: Any) -> None:
+        self._expected[field] = (value, time.monotonic())
+
+    @property
+    def pending(self) -> Dict[str, Any]:
+        return {field: value for field, (value, _) in self._expected.items()}
+
+    def _held(self, started: Optional[float]) -> List[str]:
+        # Fields the server can't be expected to reflect yet: their command hasn't been
+        # acknowledged, or the poll went out before it was.
+        held = list(self._inflight)
+        if started is not None:
+            held.extend(field for field, (_, at) in self._expected.items() if started < at and field not in held)
+
+        return held
+
+    def reconcile(
+        self, data: Dict[str, Any], *, started: Optional[float] = None, tolerance_ms: int = 2000
+    ) -> List[PlaybackMismatch]:
+        # `started` is the monotonic time the poll that returned `data` was sent at.
+        server = UserPlayback(data, self._http)
+        item = data.get('item')
+        uri = item['uri'] if item else None
+
+        mismatches: List[PlaybackMismatch] = []
+        now = time.monotonic()
+        held = self._held(started)
+
+        for field, (expected, at) in list(self._expected.items()):
+            if field in held:
+                continue
+
+            del self._expected[field]
+            if field == 'item':
+                if uri != expected:
+                    mismatches.append(PlaybackMismatch(field, expected, uri))
+            elif field == 'previous_item':
+                # A skip without a known queued item only promises that something else plays.
+                if uri == expected:
+                    mismatches.append(PlaybackMismatch('item', None, uri))
+            elif field == 'progress_ms':
+                actual = server.progress_ms
+                elapsed = int((now - at) * 1000) if server.is_playing else 0
+
+                if actual is None or not expected - tolerance_ms <= actual <= expected + elapsed + tolerance_ms:
+                    mismatches.append(PlaybackMismatch(field, expected, actual))
+            else:
+                actual = getattr(server, field)
+                if actual != expected:
+                    mismatches.append(PlaybackMismatch(field, expected, actual))
+
+        keep_item = 'item' in held or 'previous_item' in held
+        if not keep_item:
+            uris = [queued.uri for queued in self.queued]
+            if uri in uris:
+                del self.queued[:uris.index(uri) + 1]
+
+        # Server truth for everything else, the optimistic values of held fields stay.
+        local = {field: getattr(self, field) for field in held if field not in ('item', 'previous_item')}
+        current = self._item
+
+        self._update(data)
+
+        for field, value in local.items():
+            setattr(self, field, value)
+        if keep_item:
+            self._item = current
+
+        return mismatches
+
+    async def refresh(self) -> List[PlaybackMismatch]:
+        started = time.monotonic()
+        data = await self._http.get_user_current_playback(additional_types=['track', 'episode'])
+        if not data:
+            held = self._held(started)
+            mismatches = [
+                PlaybackMismatch(field, value, None) for field, value in self.pending.items() if field not in held
+            ]
+            self._expected = {field: expected for field, expected in self._expected.items() if field in held}
+
+            return mismatches
+
+        return self.reconcile(data, started=started)
+
     @property
     def actions(self) -> PlaybackActions:
         return PlaybackActions(self._data['actions'])
@@ -75,38 +233,161 @@ class UserPlayback:
     def device(self) -> Device:
         return Device(self._data['device'])
 
+    @property
+    def item(self) -> Optional[Union[PartialTrack, PartialEpisode]]:
+        if self._item is not None:
+            return self._item
+
+        item = self._data.get('item')
+        if not item:
+            return None
+
+        if self.currently_playing_type is CurrentPlayingType.Episode:
+            return Episode(item, self._http)
+
+        return Track(item, self._http)
+
     async def fetch_devices(self) -> List[Device]:
         data = await self._http.get_user_devices()
         return [Device(device) for device in data['devices']]
 
+    async def _send(
+        self,
+        kind: str,
+        device_id: Optional[str],
+        func: Callable[..., Coroutine[Any, Any, Any]],
+        /,
+        *args: Any,
+        **kwargs: Any
+    ) -> None:
+        fields = self.FIELDS.get(kind, ())
+        inflight = self._inflight
+        for field in fields:
+            inflight[field] = inflight.get(field, 0) + 1
+
+        try:
+            commands = self._http.playback_commands
+            if commands is not None:
+                await commands.submit(kind, device_id, func, *args, **kwargs)
+            else:
+                await func(*args, **kwargs)
+        finally:
+            # Polls sent before this point may predate the command, `reconcile` skips them.
+            acknowledged = time.monotonic()
+            for field in fields:
+                count = inflight[field] - 1
+                if count:
+                    inflight[field] = count
+                    continue
+
+                del inflight[field]
+                expected = self._expected.get(field)
+                if expected is not None:
+                    self._expected[field] = (expected[0], acknowledged)
+
+    async def play(
+        self,
+        items: Optional[List[Union[PartialTrack, PartialEpisode]]] = None,
+        *,
+        context: Optional[Object] = None,
+        position_ms: Optional[int] = None,
+        device: Optional[Device] = None
+    ) -> None:
+        device_id = device.id if device else None
+        uris = [item.uri for item in items] if items else None
+        context_uri = context.uri if context else None
+
+        self.is_playing = True
+        self._expect('is_playing', True)
+
+        if items:
+            self._item = items[0]
+            self._expect('item', items[0].uri)
+        if position_ms is not None or items or context:
+            self.progress_ms = position_ms or 0
+            self._expect('progress_ms', self.progress_ms)
+
+        await self._send(
+            'play',
+            device_id,
+            self._http.start_or_resume_user_playback,
+            device_id=device_id,
+            context_uri=context_uri,
+            uris=uris,
+            position_ms=position_ms
+        )
+
+    async def pause(self, *, device: Optional[Device] = None) -> None:
+        device_id = device.id if device else None
+
+        self.is_playing = False
+        self._expect('is_playing', False)
+
+        await self._send('pause', device_id, self._http.pause_user_playback, device_id=device_id)
+
     async def skip(self, *, next: bool = True, device: Optional[Device] = None) -> None:
         device_id = device.id if device else None
-        await self._http.skip_user_playback(next=next, device_id=device_id)
+
+        current = self._item_uri()
+        self._expected.pop('item', None)
+        self._expected.pop('previous_item', None)
+
+        if next and self.queued:
+            self._item = self.queued.pop(0)
+            self._expect('item', self._item.uri)
+        elif next and current is not None:
+            self._expect('previous_item', current)
+
+        self.progress_ms = 0
+        self._expect('progress_ms', 0)
+
+        await self._send('skip', device_id, self._http.skip_user_playback, next=next, device_id=device_id)
 
     async def seek(self, position_ms: int, *, device: Optional[Device] = None) -> None:
         device_id = device.id if device else None
-        await self._http.seek_to_position_in_currently_playing_track(
-            position_ms=position_ms, device_id=device_id
+
+        self.progress_ms = position_ms
+        self._expect('progress_ms', position_ms)
+
+        await self._send(
+            'seek',
+            device_id,
+            self._http.seek_to_position_in_currently_playing_track,
+            position_ms=position_ms,
+            device_id=device_id
         )
 
     async def set_repeat(self, state: RepeatState, *, device: Optional[Device] = None) -> None:
         device_id = device.id if device else None
-        await self._http.set_repeat_on_user_playback(state.value, device_id=device_id)
+
+        self.repeat = state
+        self._expect('repeat', state)
+
+        await self._send('repeat', device_id, self._http.set_repeat_on_user_playback, state.value, device_id=device_id)
 
     async def set_shuffle(self, state: ShuffleState, *, device: Optional[Device] = None) -> None:
         device_id = device.id if device else None
         value = True if state is ShuffleState.On else False
 
-        await self._http.toggle_shuffle_for_user_playback(value, device_id=device_id)
+        self.shuffle = state
+        self._expect('shuffle', state)
+
+        await self._send('shuffle', device_id, self._http.toggle_shuffle_for_user_playback, value, device_id=device_id)
 
     async def set_volume(self, volume: int, *, device: Optional[Device] = None) -> None:
         device_id = device.id if device else None
-        await self._http.set_volume_for_user_playback(volume, device_id=device_id)
+
+        self.volume = volume
+        self._expect('volume', volume)
+
+        await self._send('volume', device_id, self._http.set_volume_for_user_playback, volume, device_id=device_id)
 
     async def transfer(self, devices: List[Device], *, play: Optional[bool] = None) -> None:
         device_ids = [device.id for device in devices]
-        await self._http.transfer_user_playback(device_ids=device_ids, play=play)
+        await self._send('transfer', None, self._http.transfer_user_playback, device_ids=device_ids, play=play)
 
     async def queue(self, item: Union[PartialTrack, PartialEpisode], *, device: Optional[Device] = None) -> None:
         device_id = device.id if device else None
-        await self._http.add_item_to_queue(item.uri, device_id=device_id)
\ No newline at end of file
+        self.queued.append(item)
+
+        await self._send('queue', device_id, self._http.add_item_to_queue, item.uri, device_id=device_id)
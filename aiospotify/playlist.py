@@ -1,8 +1,7 @@
 from __future__ import annotations
 
-from typing import Dict, Any, List, Optional, Sequence
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Sequence
 
-from .http import HTTPClient
 from .image import Image
 from .objects import Followers, ExternalURLs
 from .track import Track
@@ -11,6 +10,9 @@ from .partials import PartialUser
 from .paginator import Paginator
 from .utils import fromisoformat
 
+if TYPE_CHECKING:
+    from .http import HTTPClient
+
 __all__ = ('PlaylistTrack', 'Playlist')
 
 class PlaylistTrack(Track):
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Dict, Hashable, List, Optional
+from collections import OrderedDict
+import asyncio
+import datetime
+import time
+
+import aiohttp
+
+from .client import SpotifyClient, get_event_loop
+from .http import HTTPClient
+from .tokens import TokenStore
+from .ratelimit import MemoryRateLimitStore, RateLimiter, RateLimitStore
+from .retry import RetryBudget, RetryPolicy
+from .metrics import Metrics
+from .interning import Interner
+from .transport import AiohttpTransport, ConnectionSettings, Transport
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+__all__ = (
+    'PooledClient',
+    'ClientPool',
+)
+
+class PooledClient(SpotifyClient):
+    def __init__(self, pool: ClientPool, key: Hashable, **kwargs: Any) -> None:
+        super().__init__(
+            pool.client_id,
+            pool.client_secret,
+            loop=pool.loop,
+            transport=pool.transport,
+            token_store=pool.token_store,
+            token_store_key=f'{pool.client_id}:{key}',
+            ratelimit=RateLimiter(pool.ratelimit_store),
+            retry=RetryPolicy(budget=pool.retry_budget),
+            metrics=pool.metrics,
+            interner=pool.interner,
+            **kwargs
+        )
+
+        self.pool = pool
+        self.key = key
+
+    def __repr__(self) -> str:
+        return f'<PooledClient key={self.key!r}>'
+
+    async def close(self):
+        # The transport belongs to the pool, closing a view only forgets its user state.
+        self.pool.evict(self.key)
+
+class ClientPool:
+    def __init__(
+        self,
+        client_id: str = '',
+        client_secret: str = '',
+        *,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+        session: Optional[aiohttp.ClientSession] = None,
+        connector: Optional[aiohttp.BaseConnector] = None,
+        transport: Optional[Transport] = None,
+        connection: Optional[ConnectionSettings] = None,
+        warm_connections: int = 0,
+        idle_timeout: Optional[float] = 600.0,
+        max_clients: Optional[int] = None,
+        token_store: Optional[TokenStore] = None,
+        ratelimit_store: Optional[RateLimitStore] = None,
+        retry_budget: Optional[RetryBudget] = None,
+        metrics: Optional[Metrics] = None,
+        interner: Optional[Interner] = None,
+    ) -> None:
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.loop = get_event_loop(loop)
+        if transport is not None and (session is not None or connector is not None or connection is not None):
+            raise TypeError('transport is mutually exclusive with session, connector and connection')
+
+        self.transport = transport or AiohttpTransport(session, connector=connector, settings=connection)
+        self.warm_connections = warm_connections
+        self.idle_timeout = idle_timeout
+        self.max_clients = max_clients
+        self.token_store = token_store
+        # Spotify rate limits per app, so every user of the pool shares the same deadlines.
+        self.ratelimit_store = ratelimit_store or MemoryRateLimitStore()
+        self.retry_budget = retry_budget or RetryBudget()
+        self.metrics = metrics or Metrics()
+        # Shared, users of one app mostly fetch the same catalog.
+        self.interner = interner
+
+        self.clients: OrderedDict[Hashable, PooledClient] = OrderedDict()
+        self._reaper: Optional[asyncio.Task[None]] = None
+
+    @property
+    def session(self) -> Optional[aiohttp.ClientSession]:
+        return getattr(self.transport, 'session', None)
+
+    def __repr__(self) -> str:
+        return f'<ClientPool clients={len(self.clients)} idle_timeout={self.idle_timeout}>'
+
+    def __len__(self) -> int:
+        return len(self.clients)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.clients
+
+    async def __aenter__(self) -> Self:
+        await self.start()
+        return self
+
+    async def start(self, connections: Optional[int] = None) -> int:
+        # Tokens are per user, so only the shared connections can be opened ahead of time.
+        if connections is None:
+            connections = self.warm_connections
+
+        return await self.transport.warm(HTTPClient.URL, connections) if connections else 0
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.close()
+
+    def get(
+        self,
+        key: Hashable,
+        *,
+        token: Optional[str] = None,
+        refresh_token: Optional[str] = None,
+        expires_in: Optional[float] = None,
+    ) -> PooledClient:
+        client = self.clients.get(key)
+        if client is None:
+            client = PooledClient(self, key)
+            self.clients[key] = client
+
+        auth = client.auth
+        if token is not None:
+            auth.token = token
+        if refresh_token is not None:
+            auth._refresh_token = refresh_token
+        if expires_in is not None:
+            auth.expires_at = datetime.datetime.utcnow() + datetime.timedelta(seconds=expires_in)
+
+        client.http.last_used = time.monotonic()
+        self.clients.move_to_end(key)
+
+        if self.max_clients is not None:
+            while len(self.clients) > self.max_clients:
+                oldest = next(iter(self.clients))
+                self.evict(oldest)
+
+        self._ensure_reaper()
+        return client
+
+    def evict(self, key: Hashable) -> bool:
+        client = self.clients.pop(key, None)
+        if client is None:
+            return False
+
+        http = client.http
+        if http.playback_watcher is not None:
+            http.playback_watcher.stop()
+        if http.playback_commands is not None:
+            http.playback_commands.close()
+
+        return True
+
+    def idle(self) -> List[Hashable]:
+        if self.idle_timeout is None:
+            return []
+
+        deadline = time.monotonic() - self.idle_timeout
+        return [key for key, client in self.clients.items() if client.http.last_used < deadline]
+
+    def evict_idle(self) -> int:
+        keys = self.idle()
+        for key in keys:
+            self.evict(key)
+
+        return len(keys)
+
+    def stats(self) -> Dict[Hashable, Dict[str, Any]]:
+        return {
+            key: {
+                'requests': client.http.ratelimit.requests,
+                'ratelimited': client.http.ratelimit.ratelimited,
+                'sleep_time': client.http.ratelimit.sleep_time,
+                'retries': sum(client.http.retry.retries.values()),
+                'idle': time.monotonic() - client.http.last_used,
+            }
+            for key, client in self.clients.items()
+        }
+
+    def _ensure_reaper(self) -> None:
+        if self.idle_timeout is None:
+            return
+
+        if self._reaper is None or self._reaper.done():
+            self._reaper = self.loop.create_task(self._reap())
+
+    async def _reap(self) -> None:
+        assert self.idle_timeout is not None
+
+        while self.clients:
+            await asyncio.sleep(self.idle_timeout / 2)
+            self.evict_idle()
+
+    async def close(self) -> None:
+        if self._reaper is not None:
+            self._reaper.cancel()
+            self._reaper = None
+
+        for key in list(self.clients):
+            self.evict(key)
+
+        await self.transport.close()
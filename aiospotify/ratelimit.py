@@ -0,0 +1,291 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+from abc import ABC, abstractmethod
+import asyncio
+import mmap
+import os
+import sqlite3
+import struct
+import threading
+import time
+import zlib
+
+from .utils import FileLock, to_thread
+
+__all__ = (
+    'RateLimitStore',
+    'MemoryRateLimitStore',
+    'MmapRateLimitStore',
+    'SQLiteRateLimitStore',
+    'RateLimiter',
+)
+
+GLOBAL_BUCKET = '*'
+
+T = TypeVar('T')
+
+class RateLimitStore(ABC):
+    # Deadlines are wall clock timestamps so that they mean the same thing in every process.
+    # Implementations are called straight from the event loop and must stay cheap, unless
+    # they set `blocking`, then `RateLimiter` calls them from a worker thread instead.
+    blocking: bool = False
+
+    @abstractmethod
+    def get_pause(self, bucket: str) -> float:
+        raise NotImplementedError
+
+    @abstractmethod
+    def set_pause(self, bucket: str, until: float) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def take(self, bucket: str, rate: float, capacity: float) -> float:
+        # Takes a token from the bucket, returns how long to wait if there was none.
+        raise NotImplementedError
+
+def _refill(tokens: float, updated: float, now: float, rate: float, capacity: float) -> Tuple[float, float]:
+    if updated <= 0:
+        return capacity - 1, 0.0
+
+    tokens = min(capacity, tokens + (now - updated) * rate)
+    if tokens >= 1:
+        return tokens - 1, 0.0
+
+    return tokens, (1 - tokens) / rate
+
+class MemoryRateLimitStore(RateLimitStore):
+    def __init__(self) -> None:
+        self.pauses: Dict[str, float] = {}
+        self.buckets: Dict[str, Tuple[float, float]] = {}
+
+    def __repr__(self) -> str:
+        return f'<MemoryRateLimitStore buckets={len(self.pauses)}>'
+
+    def get_pause(self, bucket: str) -> float:
+        return self.pauses.get(bucket, 0.0)
+
+    def set_pause(self, bucket: str, until: float) -> None:
+        self.pauses[bucket] = max(self.pauses.get(bucket, 0.0), until)
+
+    def take(self, bucket: str, rate: float, capacity: float) -> float:
+        now = time.time()
+        tokens, updated = self.buckets.get(bucket, (0.0, 0.0))
+
+        tokens, delay = _refill(tokens, updated, now, rate, capacity)
+        self.buckets[bucket] = (tokens, now)
+
+        return delay
+
+class MmapRateLimitStore(RateLimitStore):
+    # Each slot is (bucket hash, paused until, tokens, last refill). Buckets are placed by
+    # open addressing on their crc32, the table never shrinks.
+    SLOT = struct.Struct('<Qddd')
+    blocking = True
+
+    def __init__(self, path: str, *, slots: int = 256) -> None:
+        self.path = os.fspath(path)
+        self.slots = slots
+        self.lock = FileLock(self.path + '.lock')
+        # The file lock only excludes other processes, worker threads share `self.lock`.
+        self._thread_lock = threading.Lock()
+
+        size = self.SLOT.size * slots
+        with self.lock:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                if os.fstat(fd).st_size < size:
+                    os.ftruncate(fd, size)
+
+                self.map = mmap.mmap(fd, size)
+            finally:
+                os.close(fd)
+
+    def __repr__(self) -> str:
+        return f'<MmapRateLimitStore path={self.path!r} slots={self.slots}>'
+
+    def _find(self, bucket: str) -> Tuple[int, Tuple[int, float, float, float]]:
+        key = zlib.crc32(bucket.encode('utf-8')) + 1
+        index = key % self.slots
+
+        for _ in range(self.slots):
+            offset = index * self.SLOT.size
+            slot = self.SLOT.unpack_from(self.map, offset)
+            if slot[0] in (0, key):
+                return offset, (key, slot[1], slot[2], slot[3])
+
+            index = (index + 1) % self.slots
+
+        raise RuntimeError('rate limit table is full')
+
+    def get_pause(self, bucket: str) -> float:
+        _, slot = self._find(bucket)
+        return slot[1]
+
+    def set_pause(self, bucket: str, until: float) -> None:
+        with self._thread_lock, self.lock:
+            offset, (key, paused_until, tokens, updated) = self._find(bucket)
+            self.SLOT.pack_into(self.map, offset, key, max(paused_until, until), tokens, updated)
+
+    def take(self, bucket: str, rate: float, capacity: float) -> float:
+        with self._thread_lock, self.lock:
+            offset, (key, paused_until, tokens, updated) = self._find(bucket)
+
+            now = time.time()
+            tokens, delay = _refill(tokens, updated, now, rate, capacity)
+            self.SLOT.pack_into(self.map, offset, key, paused_until, tokens, now)
+
+        return delay
+
+    def close(self) -> None:
+        self.map.close()
+
+class SQLiteRateLimitStore(RateLimitStore):
+    blocking = True
+
+    def __init__(self, path: str, *, timeout: float = 5.0) -> None:
+        self.path = os.fspath(path)
+        # Used from worker threads, one at a time.
+        self.connection = sqlite3.connect(self.path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        self._thread_lock = threading.Lock()
+
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS buckets ('
+            'name TEXT PRIMARY KEY, paused_until REAL NOT NULL DEFAULT 0, '
+            'tokens REAL NOT NULL DEFAULT 0, updated REAL NOT NULL DEFAULT 0)'
+        )
+
+    def __repr__(self) -> str:
+        return f'<SQLiteRateLimitStore path={self.path!r}>'
+
+    def get_pause(self, bucket: str) -> float:
+        with self._thread_lock:
+            row = self.connection.execute('SELECT paused_until FROM buckets WHERE name = ?', (bucket,)).fetchone()
+
+        return row[0] if row else 0.0
+
+    def set_pause(self, bucket: str, until: float) -> None:
+        with self._thread_lock:
+            self.connection.execute(
+                'INSERT INTO buckets (name, paused_until) VALUES (?, ?) '
+                'ON CONFLICT(name) DO UPDATE SET paused_until = MAX(paused_until, excluded.paused_until)',
+                (bucket, until)
+            )
+
+    def take(self, bucket: str, rate: float, capacity: float) -> float:
+        with self._thread_lock:
+            return self._take(bucket, rate, capacity)
+
+    def _take(self, bucket: str, rate: float, capacity: float) -> float:
+        connection = self.connection
+        connection.execute('BEGIN IMMEDIATE')
+
+        try:
+            row = connection.execute('SELECT tokens, updated FROM buckets WHERE name = ?', (bucket,)).fetchone()
+            tokens, updated = row if row else (0.0, 0.0)
+
+            now = time.time()
+            tokens, delay = _refill(tokens, updated, now, rate, capacity)
+
+            connection.execute(
+                'INSERT INTO buckets (name, tokens, updated) VALUES (?, ?, ?) '
+                'ON CONFLICT(name) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated',
+                (bucket, tokens, now)
+            )
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        else:
+            connection.execute('COMMIT')
+
+        return delay
+
+    def close(self) -> None:
+        with self._thread_lock:
+            self.connection.close()
+
+class RateLimiter:
+    __slots__ = (
+        'store',
+        'rate',
+        'capacity',
+        'global_pause',
+        'requests',
+        'ratelimited',
+        'sleep_time',
+    )
+
+    def __init__(
+        self,
+        store: Optional[RateLimitStore] = None,
+        *,
+        rate: Optional[float] = None,
+        capacity: Optional[float] = None,
+        global_pause: bool = True,
+    ) -> None:
+        self.store = store or MemoryRateLimitStore()
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self.global_pause = global_pause
+
+        self.requests = 0
+        self.ratelimited = 0
+        self.sleep_time = 0.0
+
+    def __repr__(self) -> str:
+        return f'<RateLimiter requests={self.requests} ratelimited={self.ratelimited} sleep_time={self.sleep_time:.2f}>'
+
+    def buckets(self, bucket: str) -> List[str]:
+        return [GLOBAL_BUCKET] if bucket == GLOBAL_BUCKET else [GLOBAL_BUCKET, bucket]
+
+    def remaining_pause(self, bucket: str = GLOBAL_BUCKET) -> float:
+        until = max(self.store.get_pause(name) for name in self.buckets(bucket))
+        return max(0.0, until - time.time())
+
+    def is_paused(self, bucket: str = GLOBAL_BUCKET) -> bool:
+        return self.remaining_pause(bucket) > 0
+
+    async def _call(self, func: Callable[..., T], *args: Any) -> T:
+        # Blocking stores take file locks or wait on SQLite, never do that on the event loop.
+        if self.store.blocking:
+            return await to_thread(func, *args)
+
+        return func(*args)
+
+    async def fetch_remaining_pause(self, bucket: str = GLOBAL_BUCKET) -> float:
+        return await self._call(self.remaining_pause, bucket)
+
+    async def _sleep(self, delay: float) -> None:
+        self.sleep_time += delay
+        await asyncio.sleep(delay)
+
+    async def wait(self, bucket: str = GLOBAL_BUCKET) -> None:
+        # Every request waits out a pause, not just the one that received the 429.
+        delay = await self.fetch_remaining_pause(bucket)
+        while delay > 0:
+            await self._sleep(delay)
+            delay = await self.fetch_remaining_pause(bucket)
+
+        if self.rate is not None:
+            assert self.capacity is not None
+
+            delay = await self._call(self.store.take, GLOBAL_BUCKET, self.rate, self.capacity)
+            while delay > 0:
+                await self._sleep(delay)
+                delay = await self._call(self.store.take, GLOBAL_BUCKET, self.rate, self.capacity)
+
+        self.requests += 1
+
+    async def pause(self, retry_after: float, bucket: str = GLOBAL_BUCKET) -> None:
+        self.ratelimited += 1
+
+        until = time.time() + retry_after
+        await self._call(self._set_pause, bucket, until)
+
+    def _set_pause(self, bucket: str, until: float) -> None:
+        self.store.set_pause(bucket, until)
+
+        # Spotify rate limits per app, a 429 on one route usually means every route is throttled.
+        if self.global_pause and bucket != GLOBAL_BUCKET:
+            self.store.set_pause(GLOBAL_BUCKET, until)
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+import asyncio
+import hashlib
+import json
+import os
+import struct
+import urllib.parse
+import zlib
+
+from multidict import CIMultiDict, CIMultiDictProxy
+
+from .errors import MissingRecording
+from .middleware import Handler, Request, Response
+
+__all__ = (
+    'request_key',
+    'Recording',
+    'Cassette',
+    'Recorder',
+    'Replayer',
+)
+
+MAGIC = b'ASPYREC1'
+# key length, status, latency, headers length, body length
+RECORD = struct.Struct('>IHdII')
+
+def _encode_value(value: Any) -> str:
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+
+    return str(value)
+
+def request_key(request: Request) -> str:
+    # Headers are left out on purpose, a recording made with one token must replay with another.
+    key = f'{request.method} {request.path}'
+    if request.params:
+        params = sorted((str(name), _encode_value(value)) for name, value in request.params.items())
+        key += '?' + urllib.parse.urlencode(params)
+
+    if request.json is not None:
+        body = json.dumps(request.json, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    elif isinstance(request.data, dict):
+        body = urllib.parse.urlencode(sorted(request.data.items())).encode('utf-8')
+    elif isinstance(request.data, (bytes, str)):
+        body = request.data.encode('utf-8') if isinstance(request.data, str) else request.data
+    else:
+        body = b''
+
+    if body:
+        key += ' #' + hashlib.sha1(body).hexdigest()[:16]
+
+    return key
+
+class Recording:
+    __slots__ = ('status', 'headers', 'body', 'latency')
+
+    def __init__(self, status: int, headers: CIMultiDictProxy[str], body: bytes, latency: float = 0.0) -> None:
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.latency = latency
+
+    def __repr__(self) -> str:
+        return f'<Recording status={self.status} size={len(self.body)} latency={self.latency:.3f}>'
+
+    @classmethod
+    def from_response(cls, response: Response) -> Recording:
+        return cls(response.status, CIMultiDictProxy(CIMultiDict(response.headers)), response.body, response.latency)
+
+    def pack_headers(self) -> bytes:
+        return '\r\n'.join(f'{name}: {value}' for name, value in self.headers.items()).encode('utf-8')
+
+    @staticmethod
+    def unpack_headers(data: bytes) -> CIMultiDictProxy[str]:
+        headers: CIMultiDict[str] = CIMultiDict()
+        for line in data.decode('utf-8').split('\r\n') if data else ():
+            name, _, value = line.partition(': ')
+            headers.add(name, value)
+
+        return CIMultiDictProxy(headers)
+
+class Cassette:
+    # Every key holds the responses in the order they were recorded. Replaying walks through
+    # them and keeps serving the last one once they run out, so a recording of a single call
+    # can back any number of identical calls.
+
+    def __init__(self) -> None:
+        self.recordings: Dict[str, List[Recording]] = {}
+        self.positions: Dict[str, int] = {}
+
+    def __repr__(self) -> str:
+        return f'<Cassette keys={len(self.recordings)} recordings={len(self)}>'
+
+    def __len__(self) -> int:
+        return sum(len(recordings) for recordings in self.recordings.values())
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.recordings
+
+    def __iter__(self) -> Iterator[Tuple[str, Recording]]:
+        for key, recordings in self.recordings.items():
+            for recording in recordings:
+                yield key, recording
+
+    def add(self, key: str, recording: Recording) -> None:
+        self.recordings.setdefault(key, []).append(recording)
+
+    def next(self, key: str) -> Optional[Recording]:
+        recordings = self.recordings.get(key)
+        if not recordings:
+            return None
+
+        position = self.positions.get(key, 0)
+        self.positions[key] = position + 1
+
+        return recordings[min(position, len(recordings) - 1)]
+
+    def rewind(self) -> None:
+        self.positions.clear()
+
+    def dumps(self, *, level: int = 6) -> bytes:
+        chunks = []
+        for key, recording in self:
+            encoded = key.encode('utf-8')
+            headers = recording.pack_headers()
+
+            chunks.append(RECORD.pack(len(encoded), recording.status, recording.latency, len(headers), len(recording.body)))
+            chunks.extend((encoded, headers, recording.body))
+
+        return MAGIC + zlib.compress(b''.join(chunks), level)
+
+    @classmethod
+    def loads(cls, data: bytes) -> Cassette:
+        if not data.startswith(MAGIC):
+            raise ValueError('not an aiospotify recording')
+
+        payload = memoryview(zlib.decompress(data[len(MAGIC):]))
+        cassette = cls()
+
+        offset = 0
+        while offset < len(payload):
+            key_length, status, latency, headers_length, body_length = RECORD.unpack_from(payload, offset)
+            offset += RECORD.size
+
+            key = bytes(payload[offset:offset + key_length]).decode('utf-8')
+            offset += key_length
+            headers = Recording.unpack_headers(bytes(payload[offset:offset + headers_length]))
+            offset += headers_length
+            body = bytes(payload[offset:offset + body_length])
+            offset += body_length
+
+            cassette.add(key, Recording(status, headers, body, latency))
+
+        return cassette
+
+    def save(self, path: Union[str, os.PathLike[str]]) -> None:
+        tmp = f'{os.fspath(path)}.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(self.dumps())
+
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Union[str, os.PathLike[str]]) -> Cassette:
+        with open(path, 'rb') as f:
+            return cls.loads(f.read())
+
+class Recorder:
+    # Runs as the outermost middleware, so it stores what the caller got back after
+    # retries and rate limit handling rather than every attempt.
+
+    def __init__(self, cassette: Optional[Cassette] = None) -> None:
+        self.cassette = cassette or Cassette()
+
+    def __repr__(self) -> str:
+        return f'<Recorder cassette={self.cassette!r}>'
+
+    async def __call__(self, request: Request, handler: Handler) -> Response:
+        response = await handler(request)
+        self.cassette.add(request_key(request), Recording.from_response(response))
+
+        return response
+
+class Replayer:
+    # Answers every request from a cassette without calling the rest of the chain, nothing
+    # touches the network. `latency` sleeps a fixed delay per response, or the latency seen
+    # while recording when set to 'recorded'.
+
+    def __init__(self, cassette: Cassette, *, latency: Union[float, str, None] = None) -> None:
+        if isinstance(latency, str) and latency != 'recorded':
+            raise ValueError("latency must be a number, 'recorded' or None")
+
+        self.cassette = cassette
+        self.latency = latency
+        self.served = 0
+        self.missed = 0
+
+    def __repr__(self) -> str:
+        return f'<Replayer served={self.served} missed={self.missed}>'
+
+    async def __call__(self, request: Request, handler: Handler) -> Response:
+        key = request_key(request)
+        recording = self.cassette.next(key)
+        if recording is None:
+            self.missed += 1
+            raise MissingRecording(key)
+
+        delay = recording.latency if self.latency == 'recorded' else self.latency
+        if delay:
+            await asyncio.sleep(delay) # type: ignore
+
+        self.served += 1
+        return Response(request, recording.status, recording.headers, recording.body, latency=delay or 0.0) # type: ignore
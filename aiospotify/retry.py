@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from typing import Collection, Deque, Dict, FrozenSet, Optional, Tuple, Type
+from collections import Counter, deque
+import random
+import time
+
+import aiohttp
+
+__all__ = (
+    'RetryBudget',
+    'RetryPolicy',
+)
+
+class RetryBudget:
+    # Retries may add at most `ratio` of the requests made in the last `window` seconds,
+    # plus `min_retries` so that a quiet client can still retry at all. During an outage
+    # the budget runs dry and requests fail straight away instead of piling up.
+
+    def __init__(self, ratio: float = 0.2, *, min_retries: int = 10, window: float = 10.0) -> None:
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window = window
+
+        self.requests: Deque[float] = deque()
+        self.retries: Deque[float] = deque()
+
+    def __repr__(self) -> str:
+        return f'<RetryBudget ratio={self.ratio} available={self.available()}>'
+
+    def _expire(self, now: float) -> None:
+        cutoff = now - self.window
+        for timestamps in (self.requests, self.retries):
+            while timestamps and timestamps[0] < cutoff:
+                timestamps.popleft()
+
+    def available(self) -> int:
+        self._expire(time.monotonic())
+        allowed = self.min_retries + int(len(self.requests) * self.ratio)
+
+        return max(0, allowed - len(self.retries))
+
+    def deposit(self) -> None:
+        now = time.monotonic()
+        self._expire(now)
+        self.requests.append(now)
+
+    def withdraw(self) -> bool:
+        if self.available() <= 0:
+            return False
+
+        self.retries.append(time.monotonic())
+        return True
+
+class RetryPolicy:
+    IDEMPOTENT_METHODS: FrozenSet[str] = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+    STATUSES: FrozenSet[int] = frozenset({500, 502, 503, 504})
+    EXCEPTIONS: Tuple[Type[BaseException], ...] = (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError)
+
+    def __init__(
+        self,
+        attempts: int = 3,
+        *,
+        base: float = 0.1,
+        cap: float = 5.0,
+        methods: Optional[Collection[str]] = None,
+        statuses: Optional[Collection[int]] = None,
+        exceptions: Optional[Tuple[Type[BaseException], ...]] = None,
+        budget: Optional[RetryBudget] = None,
+    ) -> None:
+        if attempts < 1:
+            raise ValueError('attempts must be at least 1')
+
+        self.attempts = attempts
+        self.base = base
+        self.cap = cap
+        self.methods = frozenset(method.upper() for method in methods) if methods is not None else self.IDEMPOTENT_METHODS
+        self.statuses = frozenset(statuses) if statuses is not None else self.STATUSES
+        self.exceptions = exceptions if exceptions is not None else self.EXCEPTIONS
+        self.budget = budget or RetryBudget()
+
+        self.retries: Counter[str] = Counter()
+        self.exhausted: Counter[str] = Counter()
+
+    def __repr__(self) -> str:
+        return f'<RetryPolicy attempts={self.attempts} retries={sum(self.retries.values())}>'
+
+    def is_retryable(self, method: str) -> bool:
+        return self.attempts > 1 and method.upper() in self.methods
+
+    def delay(self, attempt: int) -> float:
+        # Full jitter, clients that failed together should not come back together.
+        return random.uniform(0, min(self.cap, self.base * 2 ** (attempt - 1)))
+
+    def backoff(self, method: str, bucket: str, attempt: int, remaining: Optional[float] = None) -> Optional[float]:
+        # Returns how long to sleep before the given retry attempt, None if it should not be made.
+        if not self.is_retryable(method) or attempt >= self.attempts:
+            return None
+
+        delay = self.delay(attempt)
+        if remaining is not None and remaining <= delay:
+            return None
+
+        if not self.budget.withdraw():
+            self.exhausted[bucket] += 1
+            return None
+
+        self.retries[bucket] += 1
+        return delay
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {
+            bucket: {'retries': self.retries[bucket], 'exhausted': self.exhausted[bucket]}
+            for bucket in sorted(set(self.retries) | set(self.exhausted))
+        }
@@ -1,10 +1,14 @@
-from typing import Any, Dict, Generic, List, Optional, TypeVar, Type
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Dict, Generic, List, Optional, TypeVar, Type
 
-from .http import HTTPClient
 from .artist import Artist
 from .track import Track
 from .utils import cached_slot_property
 
+if TYPE_CHECKING:
+    from .http import HTTPClient
+
 T = TypeVar('T')
 
 __all__ = 'SearchResult',
@@ -0,0 +1,3 @@
+from .catalog import *
+from .faults import *
+from .server import *
\ No newline at end of file
@@ -0,0 +1,522 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence
+import datetime
+import math
+import random
+import string
+
+from .. import ids
+from ..ids import encode_base62
+from ..markets import SPOTIFY_MARKETS
+
+__all__ = (
+    'Catalog',
+)
+
+# Spotify ids are 128-bit values written in base62.
+ID_SPACE = 1 << 128
+# Odd, so it has an inverse modulo 2 ** 128 and ids can be mapped back to indices.
+MULTIPLIER = 0x9E3779B97F4A7C15F39CC0605CEDC835
+INVERSE = pow(MULTIPLIER, -1, ID_SPACE)
+
+KINDS = {
+    'track': 1,
+    'album': 2,
+    'artist': 3,
+    'playlist': 4,
+    'show': 5,
+    'episode': 6,
+    'snapshot': 7,
+}
+
+MARKETS = list(SPOTIFY_MARKETS)
+
+GENRES = [
+    'acoustic', 'afrobeat', 'alt-rock', 'ambient', 'blues', 'classical', 'country', 'dance', 'disco', 'drum-and-bass',
+    'dubstep', 'edm', 'electronic', 'folk', 'funk', 'garage', 'gospel', 'grunge', 'hip-hop', 'house', 'indie',
+    'j-pop', 'jazz', 'k-pop', 'latin', 'metal', 'pop', 'punk', 'r-n-b', 'reggae', 'rock', 'soul', 'techno',
+]
+
+API = 'https://api.spotify.com/v1'
+OPEN = 'https://open.spotify.com'
+
+def decode_base62(value: str) -> Optional[int]:
+    try:
+        return ids.decode_base62(value)
+    except ValueError:
+        return None
+
+class Catalog:
+    # Every object is derived on demand from its kind and index, so a catalog of millions of
+    # tracks costs nothing until it is read. Ids encode the index, any id can be mapped back
+    # to its object without a lookup table.
+
+    def __init__(
+        self,
+        *,
+        tracks: int = 5_000_000,
+        albums: Optional[int] = None,
+        artists: Optional[int] = None,
+        playlists: int = 100_000,
+        users: int = 10_000,
+        shows: int = 10_000,
+        episodes_per_show: int = 50,
+        playlist_size: Optional[int] = None,
+        max_playlist_size: int = 500,
+        seed: int = 0,
+    ) -> None:
+        self.tracks = tracks
+        self.albums = albums or max(1, tracks // 10)
+        self.artists = artists or max(1, self.albums // 4)
+        self.playlists = playlists
+        self.users = users
+        self.shows = shows
+        self.episodes = shows * episodes_per_show
+        self.episodes_per_show = episodes_per_show
+        self.playlist_size = playlist_size
+        self.max_playlist_size = max_playlist_size
+        self.seed = seed
+
+        self.tracks_per_album = math.ceil(self.tracks / self.albums)
+        self.playlist_sizes: Dict[int, int] = {}
+
+    def __repr__(self) -> str:
+        return f'<Catalog tracks={self.tracks} albums={self.albums} artists={self.artists} playlists={self.playlists}>'
+
+    def count(self, kind: str) -> int:
+        return {
+            'track': self.tracks,
+            'album': self.albums,
+            'artist': self.artists,
+            'playlist': self.playlists,
+            'show': self.shows,
+            'episode': self.episodes,
+            'user': self.users,
+        }.get(kind, 0)
+
+    def _rng(self, kind: str, index: int) -> random.Random:
+        return random.Random((self.seed * 16 + KINDS.get(kind, 0)) * ID_SPACE + index)
+
+    def _offset(self, kind: str) -> int:
+        return (self.seed * 16 + KINDS[kind]) << 48
+
+    def id(self, kind: str, index: int) -> str:
+        if kind == 'user':
+            return f'user{index}'
+
+        return encode_base62((index + self._offset(kind)) * MULTIPLIER % ID_SPACE)
+
+    def index(self, kind: str, id: str) -> Optional[int]:
+        if kind == 'user':
+            index = int(id[4:]) if id.startswith('user') and id[4:].isdigit() else -1
+        else:
+            value = decode_base62(id)
+            if value is None or kind not in KINDS:
+                return None
+
+            index = value * INVERSE % ID_SPACE - self._offset(kind)
+
+        return index if 0 <= index < self.count(kind) else None
+
+    def uri(self, kind: str, index: int) -> str:
+        return f'spotify:{kind}:{self.id(kind, index)}'
+
+    def _words(self, rng: random.Random, count: int) -> str:
+        return ' '.join(
+            ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9))) for _ in range(count)
+        ).title()
+
+    def _images(self, id: str) -> List[Dict[str, Any]]:
+        return [{'url': f'https://i.scdn.co/image/{id}{size}', 'height': size, 'width': size} for size in (640, 300, 64)]
+
+    def _markets(self, rng: random.Random) -> List[str]:
+        # Like the real catalog, most releases are available everywhere.
+        if rng.random() < 0.8:
+            return list(MARKETS)
+
+        return sorted(rng.sample(MARKETS, rng.randint(len(MARKETS) // 2, len(MARKETS))))
+
+    def _base(self, kind: str, index: int) -> Dict[str, Any]:
+        id = self.id(kind, index)
+        return {
+            'external_urls': {'spotify': f'{OPEN}/{kind}/{id}'},
+            'href': f'{API}/{kind}s/{id}',
+            'id': id,
+            'type': kind,
+            'uri': f'spotify:{kind}:{id}',
+        }
+
+    def simplified_artist(self, index: int) -> Dict[str, Any]:
+        data = self._base('artist', index)
+        data['name'] = self._words(self._rng('artist', index), 2)
+
+        return data
+
+    def artist(self, index: int) -> Dict[str, Any]:
+        rng = self._rng('artist', index)
+        data = self._base('artist', index)
+        data.update(
+            name=self._words(rng, 2),
+            followers={'href': None, 'total': rng.randint(0, 10_000_000)},
+            genres=rng.sample(GENRES, rng.randint(0, 3)),
+            images=self._images(data['id']),
+            popularity=rng.randint(0, 100),
+        )
+
+        return data
+
+    def album_tracks(self, index: int) -> range:
+        start = index * self.tracks_per_album
+        return range(start, min(self.tracks, start + self.tracks_per_album))
+
+    def artist_albums(self, index: int) -> range:
+        return range(index, self.albums, self.artists)
+
+    def simplified_album(self, index: int) -> Dict[str, Any]:
+        rng = self._rng('album', index)
+        data = self._base('album', index)
+        data.update(
+            album_type=rng.choice(['album', 'album', 'single', 'compilation']),
+            artists=[self.simplified_artist(index % self.artists)],
+            available_markets=self._markets(rng),
+            images=self._images(data['id']),
+            name=self._words(rng, rng.randint(1, 4)),
+            release_date=f'{rng.randint(1960, 2023)}-{rng.randint(1, 12):02}-{rng.randint(1, 28):02}',
+            release_date_precision='day',
+            total_tracks=len(self.album_tracks(index)),
+        )
+
+        return data
+
+    def album(self, index: int, *, limit: int = 50) -> Dict[str, Any]:
+        rng = self._rng('album', index)
+        data = self.simplified_album(index)
+        data.update(
+            copyrights=[{'text': f'(C) {data["release_date"][:4]} {data["artists"][0]["name"]}', 'type': 'C'}],
+            external_ids={'upc': ''.join(rng.choice(string.digits) for _ in range(12))},
+            genres=[],
+            label=self._words(rng, 2),
+            popularity=rng.randint(0, 100),
+            tracks=self.page(
+                f'{API}/albums/{data["id"]}/tracks',
+                [self.simplified_track(track) for track in self.album_tracks(index)[:limit]],
+                0, limit, len(self.album_tracks(index)),
+            ),
+        )
+
+        return data
+
+    def simplified_track(self, index: int) -> Dict[str, Any]:
+        rng = self._rng('track', index)
+        album = index // self.tracks_per_album
+        data = self._base('track', index)
+        data.update(
+            artists=[self.simplified_artist((album + offset) % self.artists) for offset in range(rng.randint(1, 3))],
+            available_markets=self._markets(rng),
+            disc_number=1,
+            duration_ms=rng.randint(90_000, 420_000),
+            explicit=rng.random() < 0.2,
+            is_local=False,
+            name=self._words(rng, rng.randint(1, 5)),
+            popularity=rng.randint(0, 100),
+            preview_url=f'https://p.scdn.co/mp3-preview/{data["id"]}',
+            track_number=index - album * self.tracks_per_album + 1,
+        )
+
+        return data
+
+    def track(self, index: int) -> Dict[str, Any]:
+        rng = self._rng('track', index)
+        data = self.simplified_track(index)
+        data.update(
+            album=self.simplified_album(index // self.tracks_per_album),
+            external_ids={'isrc': 'US' + ''.join(rng.choice(string.digits) for _ in range(10))},
+        )
+
+        return data
+
+    def audio_features(self, index: int) -> Dict[str, Any]:
+        rng = self._rng('track', index)
+        id = self.id('track', index)
+
+        return {
+            'acousticness': round(rng.random(), 4),
+            'analysis_url': f'{API}/audio-analysis/{id}',
+            'danceability': round(rng.random(), 3),
+            'duration_ms': self.simplified_track(index)['duration_ms'],
+            'energy': round(rng.random(), 3),
+            'id': id,
+            'instrumentalness': round(rng.random(), 4),
+            'key': rng.randint(0, 11),
+            'liveness': round(rng.random(), 4),
+            'loudness': round(rng.uniform(-20, 0), 3),
+            'mode': rng.randint(0, 1),
+            'speechiness': round(rng.random(), 4),
+            'tempo': round(rng.uniform(60, 190), 3),
+            'time_signature': 4,
+            'track_href': f'{API}/tracks/{id}',
+            'type': 'audio_features',
+            'uri': f'spotify:track:{id}',
+            'valence': round(rng.random(), 3),
+        }
+
+    def audio_analysis(self, index: int) -> Dict[str, Any]:
+        # Real analyses of a three minute track weigh in at around 300-500 KB, mostly segments.
+        rng = self._rng('track', index)
+        duration = self.simplified_track(index)['duration_ms'] / 1000
+        tempo = rng.uniform(70, 180)
+        beat = 60 / tempo
+
+        def spans(step: float, extra: Any = None) -> List[Dict[str, Any]]:
+            items = []
+            start = 0.0
+            while start < duration:
+                item = {'start': round(start, 5), 'duration': round(step, 5), 'confidence': round(rng.random(), 3)}
+                if extra is not None:
+                    item.update(extra())
+
+                items.append(item)
+                start += step
+
+            return items
+
+        def section() -> Dict[str, Any]:
+            return {
+                'loudness': round(rng.uniform(-20, 0), 3),
+                'tempo': round(tempo, 3),
+                'tempo_confidence': round(rng.random(), 3),
+                'key': rng.randint(0, 11),
+                'key_confidence': round(rng.random(), 3),
+                'mode': rng.randint(0, 1),
+                'mode_confidence': round(rng.random(), 3),
+                'time_signature': 4,
+                'time_signature_confidence': round(rng.random(), 3),
+            }
+
+        def segment() -> Dict[str, Any]:
+            return {
+                'loudness_start': round(rng.uniform(-60, 0), 3),
+                'loudness_max': round(rng.uniform(-30, 0), 3),
+                'loudness_max_time': round(rng.random() / 10, 5),
+                'loudness_end': 0.0,
+                'pitches': [round(rng.random(), 3) for _ in range(12)],
+                'timbre': [round(rng.uniform(-100, 100), 3) for _ in range(12)],
+            }
+
+        return {
+            'meta': {
+                'analyzer_version': '4.0.0',
+                'platform': 'Linux',
+                'detailed_status': 'OK',
+                'status_code': 0,
+                'timestamp': 1495193577,
+                'analysis_time': 6.93906,
+                'input_process': 'libvorbisfile L+R 44100->22050',
+            },
+            'track': {
+                'num_samples': int(duration * 22050),
+                'duration': duration,
+                'sample_md5': '',
+                'offset_seconds': 0,
+                'window_seconds': 0,
+                'analysis_sample_rate': 22050,
+                'analysis_channels': 1,
+                'end_of_fade_in': 0,
+                'start_of_fade_out': duration - 5,
+                'loudness': -5.883,
+                'tempo': tempo,
+                'tempo_confidence': 0.73,
+                'time_signature': 4,
+                'time_signature_confidence': 0.994,
+                'key': rng.randint(0, 11),
+                'key_confidence': 0.408,
+                'mode': 0,
+                'mode_confidence': 0.485,
+                'codestring': '',
+                'code_version': 3.15,
+                'echoprintstring': '',
+                'echoprint_version': 4.15,
+                'synchstring': '',
+                'synch_version': 1,
+                'rhythmstring': '',
+                'rhythm_version': 1,
+            },
+            'bars': spans(beat * 4),
+            'beats': spans(beat),
+            'sections': spans(duration / 8, section),
+            'segments': spans(0.25, segment),
+            'tatums': spans(beat / 2),
+        }
+
+    def user(self, index: int, *, private: bool = False) -> Dict[str, Any]:
+        rng = self._rng('user', index)
+        id = self.id('user', index)
+        data = {
+            'display_name': self._words(rng, 2),
+            'external_urls': {'spotify': f'{OPEN}/user/{id}'},
+            'followers': {'href': None, 'total': rng.randint(0, 5000)},
+            'href': f'{API}/users/{id}',
+            'id': id,
+            'images': [],
+            'type': 'user',
+            'uri': f'spotify:user:{id}',
+        }
+
+        if private:
+            data.update(country=rng.choice(MARKETS), email=f'{id}@example.com', product=rng.choice(['free', 'premium']))
+
+        return data
+
+    def playlist_length(self, index: int) -> int:
+        if index in self.playlist_sizes:
+            return self.playlist_sizes[index]
+        if self.playlist_size is not None:
+            return self.playlist_size
+
+        return self._rng('playlist', index).randint(1, self.max_playlist_size)
+
+    def playlist_track(self, index: int, position: int) -> int:
+        # Spread playlist entries over the whole catalog without generating anything.
+        return (index * 1_000_003 + position * 7_919) % self.tracks
+
+    def playlist_item(self, index: int, position: int) -> Dict[str, Any]:
+        added_at = datetime.datetime(2020, 1, 1) + datetime.timedelta(hours=position)
+        return {
+            'added_at': added_at.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'added_by': self.user(index % self.users),
+            'is_local': False,
+            'track': self.track(self.playlist_track(index, position)),
+        }
+
+    def playlist_page(self, index: int, offset: int, limit: int) -> Dict[str, Any]:
+        total = self.playlist_length(index)
+        items = [self.playlist_item(index, position) for position in range(offset, min(total, offset + limit))]
+
+        return self.page(f'{API}/playlists/{self.id("playlist", index)}/tracks', items, offset, limit, total)
+
+    def simplified_playlist(self, index: int) -> Dict[str, Any]:
+        rng = self._rng('playlist', index)
+        data = self._base('playlist', index)
+        data.update(
+            collaborative=False,
+            description=self._words(rng, 8),
+            images=self._images(data['id']),
+            name=self._words(rng, 3),
+            owner=self.user(index % self.users),
+            public=True,
+            snapshot_id=self.id('snapshot', index % ID_SPACE),
+            tracks={'href': f'{data["href"]}/tracks', 'total': self.playlist_length(index)},
+        )
+
+        return data
+
+    def playlist(self, index: int) -> Dict[str, Any]:
+        data = self.simplified_playlist(index)
+        data.update(
+            followers={'href': None, 'total': self._rng('playlist', index).randint(0, 100_000)},
+            tracks=self.playlist_page(index, 0, 100),
+        )
+
+        return data
+
+    def simplified_show(self, index: int) -> Dict[str, Any]:
+        rng = self._rng('show', index)
+        data = self._base('show', index)
+        data.update(
+            available_markets=self._markets(rng),
+            copyrights=[],
+            description=self._words(rng, 12),
+            explicit=rng.random() < 0.1,
+            images=self._images(data['id']),
+            is_externally_hosted=False,
+            languages=['en'],
+            media_type='audio',
+            name=self._words(rng, 3),
+            publisher=self._words(rng, 2),
+            total_episodes=self.episodes_per_show,
+        )
+
+        return data
+
+    def show_episodes(self, index: int) -> range:
+        start = index * self.episodes_per_show
+        return range(start, start + self.episodes_per_show)
+
+    def show(self, index: int, *, limit: int = 50) -> Dict[str, Any]:
+        data = self.simplified_show(index)
+        episodes = self.show_episodes(index)
+        data['episodes'] = self.page(
+            f'{data["href"]}/episodes',
+            [self.simplified_episode(episode) for episode in episodes[:limit]],
+            0, limit, len(episodes),
+        )
+
+        return data
+
+    def simplified_episode(self, index: int) -> Dict[str, Any]:
+        rng = self._rng('episode', index)
+        data = self._base('episode', index)
+        released = datetime.date(2015, 1, 1) + datetime.timedelta(days=index % self.episodes_per_show * 7)
+        data.update(
+            audio_preview_url=f'https://p.scdn.co/mp3-preview/{data["id"]}',
+            description=self._words(rng, 20),
+            duration_ms=rng.randint(600_000, 7_200_000),
+            explicit=False,
+            images=self._images(data['id']),
+            is_externally_hosted=False,
+            is_playable=True,
+            language='en',
+            languages=['en'],
+            name=self._words(rng, 5),
+            release_date=released.isoformat(),
+            release_date_precision='day',
+        )
+
+        return data
+
+    def episode(self, index: int) -> Dict[str, Any]:
+        data = self.simplified_episode(index)
+        data['show'] = self.simplified_show(index // self.episodes_per_show)
+
+        return data
+
+    def page(self, href: str, items: List[Dict[str, Any]], offset: int, limit: int, total: int) -> Dict[str, Any]:
+        end = min(total, offset + limit)
+        return {
+            'href': f'{href}?offset={offset}&limit={limit}',
+            'items': items,
+            'limit': limit,
+            'next': f'{href}?offset={end}&limit={limit}' if end < total else None,
+            'offset': offset,
+            'previous': f'{href}?offset={max(0, offset - limit)}&limit={limit}' if offset else None,
+            'total': total,
+        }
+
+    def search(self, query: str, types: Sequence[str], limit: int = 20, offset: int = 0, total: int = 1000) -> Dict[str, Any]:
+        # Results are a deterministic slice of the catalog picked by the query.
+        seed = sum(ord(char) * 31 ** position for position, char in enumerate(query[:16]))
+        result: Dict[str, Any] = {}
+
+        kinds = {
+            'track': self.track,
+            'album': self.simplified_album,
+            'artist': self.artist,
+            'playlist': self.simplified_playlist,
+            'show': self.simplified_show,
+            'episode': self.simplified_episode,
+        }
+
+        for kind in types:
+            factory = kinds.get(kind)
+            if factory is None:
+                continue
+
+            count = self.count(kind)
+            available = min(total, count)
+            items = [factory((seed + position) % count) for position in range(offset, min(available, offset + limit))]
+
+            href = f'{API}/search?query={query}&type={kind}'
+            result[f'{kind}s'] = self.page(href, items, offset, limit, available)
+
+        return result
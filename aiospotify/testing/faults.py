@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+from typing import Callable, Deque, Optional, Sequence, Tuple
+from collections import deque
+import math
+import random
+import time
+
+__all__ = (
+    'Latency',
+    'Fault',
+    'Faults',
+)
+
+class Latency:
+    __slots__ = ('name', '_sample')
+
+    def __init__(self, name: str, sample: Callable[[random.Random], float]) -> None:
+        self.name = name
+        self._sample = sample
+
+    def __repr__(self) -> str:
+        return f'<Latency {self.name}>'
+
+    def sample(self, rng: random.Random) -> float:
+        return max(0.0, self._sample(rng))
+
+    @classmethod
+    def fixed(cls, seconds: float) -> Latency:
+        return cls(f'fixed({seconds})', lambda rng: seconds)
+
+    @classmethod
+    def uniform(cls, low: float, high: float) -> Latency:
+        return cls(f'uniform({low}, {high})', lambda rng: rng.uniform(low, high))
+
+    @classmethod
+    def lognormal(cls, median: float, sigma: float = 0.5) -> Latency:
+        # Long right tail, the usual shape of real API latencies.
+        mu = math.log(median)
+        return cls(f'lognormal({median}, {sigma})', lambda rng: rng.lognormvariate(mu, sigma))
+
+    @classmethod
+    def bimodal(cls, fast: float, slow: float, slow_rate: float = 0.01) -> Latency:
+        return cls(
+            f'bimodal({fast}, {slow}, {slow_rate})',
+            lambda rng: slow if rng.random() < slow_rate else fast,
+        )
+
+class Fault:
+    # A single decision taken for one request, see `Faults.decide`.
+    __slots__ = ('delay', 'status', 'retry_after', 'body_rate', 'disconnect')
+
+    def __init__(
+        self,
+        *,
+        delay: float = 0.0,
+        status: Optional[int] = None,
+        retry_after: Optional[float] = None,
+        body_rate: Optional[float] = None,
+        disconnect: bool = False,
+    ) -> None:
+        self.delay = delay
+        self.status = status
+        self.retry_after = retry_after
+        self.body_rate = body_rate
+        self.disconnect = disconnect
+
+    def __repr__(self) -> str:
+        return (
+            f'<Fault delay={self.delay:.3f} status={self.status} retry_after={self.retry_after} '
+            f'body_rate={self.body_rate} disconnect={self.disconnect}>'
+        )
+
+class Faults:
+    # Rates are probabilities per request, drawn from a seeded generator so that a failing
+    # run can be replayed. `rate_limit` is a sliding window of (requests, seconds), requests
+    # over it get a 429 with a `Retry-After` of however long the window needs to drain.
+
+    def __init__(
+        self,
+        *,
+        latency: Optional[Latency] = None,
+        error_rate: float = 0.0,
+        error_statuses: Sequence[int] = (500, 502, 503),
+        throttle_rate: float = 0.0,
+        retry_after: float = 1.0,
+        rate_limit: Optional[Tuple[int, float]] = None,
+        slow_body_rate: float = 0.0,
+        body_rate: float = 64 * 1024,
+        disconnect_rate: float = 0.0,
+        seed: Optional[int] = 0,
+    ) -> None:
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_statuses = tuple(error_statuses)
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.rate_limit = rate_limit
+        self.slow_body_rate = slow_body_rate
+        self.body_rate = body_rate
+        self.disconnect_rate = disconnect_rate
+
+        self.rng = random.Random(seed)
+        self._window: Deque[float] = deque()
+
+    def __repr__(self) -> str:
+        return (
+            f'<Faults latency={self.latency!r} error_rate={self.error_rate} throttle_rate={self.throttle_rate} '
+            f'rate_limit={self.rate_limit} slow_body_rate={self.slow_body_rate}>'
+        )
+
+    def _over_limit(self) -> Optional[float]:
+        if self.rate_limit is None:
+            return None
+
+        requests, seconds = self.rate_limit
+        now = time.monotonic()
+
+        window = self._window
+        while window and window[0] <= now - seconds:
+            window.popleft()
+
+        if len(window) >= requests:
+            return window[0] + seconds - now
+
+        window.append(now)
+        return None
+
+    def decide(self) -> Fault:
+        rng = self.rng
+        fault = Fault(delay=self.latency.sample(rng) if self.latency is not None else 0.0)
+
+        wait = self._over_limit()
+        if wait is not None:
+            fault.status = 429
+            fault.retry_after = max(1, math.ceil(wait))
+        elif self.throttle_rate and rng.random() < self.throttle_rate:
+            fault.status = 429
+            fault.retry_after = self.retry_after
+        elif self.error_rate and rng.random() < self.error_rate:
+            fault.status = rng.choice(self.error_statuses)
+        elif self.disconnect_rate and rng.random() < self.disconnect_rate:
+            fault.disconnect = True
+        elif self.slow_body_rate and rng.random() < self.slow_body_rate:
+            fault.body_rate = self.body_rate
+
+        return fault
@@ -0,0 +1,1122 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, List, Optional, Tuple, Union
+from collections import Counter, deque
+import asyncio
+import datetime
+import functools
+import json
+import secrets
+import time
+
+from aiohttp import web
+
+from .catalog import API, GENRES, MARKETS, Catalog, decode_base62
+from .faults import Fault, Faults
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+    from ..client import SpotifyClient
+
+__all__ = (
+    'FakeSpotifyServer',
+)
+
+MAX_IDS = {
+    'track': 50,
+    'album': 20,
+    'artist': 50,
+    'show': 50,
+    'episode': 50,
+    'audio-features': 100,
+}
+
+DEVICE = {
+    'id': 'fake-device',
+    'is_active': True,
+    'is_private_session': False,
+    'is_restricted': False,
+    'name': 'Fake Speaker',
+    'type': 'Speaker',
+    'volume_percent': 50,
+}
+
+Payload = Union[Dict[str, Any], List[Any], None]
+
+class Reject(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        self.status = status
+        self.message = message
+
+def timestamp(at: datetime.datetime) -> str:
+    return at.strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+
+class FakeSpotifyServer:
+    # An in-process Web API over a generated `Catalog`. Catalog responses are encoded once
+    # and cached, library, playlist and player writes are kept in memory for the lifetime
+    # of the server. Every request is counted per route template (`GET /tracks/{id}`) so
+    # tests can assert on how many calls an operation took.
+
+    def __init__(
+        self,
+        catalog: Optional[Catalog] = None,
+        *,
+        host: str = '127.0.0.1',
+        port: int = 0,
+        faults: Optional[Faults] = None,
+        routes: Optional[Dict[str, Faults]] = None,
+        token_ttl: int = 3600,
+        strict_auth: bool = False,
+        user: int = 0,
+        history: int = 50,
+        cache_size: int = 4096,
+    ) -> None:
+        self.catalog = catalog or Catalog()
+        self.host = host
+        self.port = port
+        self.faults = faults
+        self.routes: Dict[str, Faults] = dict(routes or {})
+        self.token_ttl = token_ttl
+        self.strict_auth = strict_auth
+        self.user = user
+
+        self.requests: Counter[str] = Counter()
+        self.statuses: Counter[Tuple[str, int]] = Counter()
+        self.tokens: Dict[str, float] = {}
+        self.injected: Dict[str, Deque[Fault]] = {}
+
+        self.saved: Dict[str, Dict[str, str]] = {kind: {} for kind in ('track', 'album', 'episode', 'show')}
+        self.following: Dict[str, Dict[str, None]] = {'artist': {}, 'user': {}}
+        self.followed_playlists: Dict[str, None] = {}
+        self.playlists: Dict[str, Dict[str, Any]] = {}
+        self.player: Dict[str, Any] = {
+            'uris': [],
+            'position': 0,
+            'context': None,
+            'is_playing': False,
+            'progress_ms': 0,
+            'shuffle_state': False,
+            'repeat_state': 'off',
+            'volume_percent': DEVICE['volume_percent'],
+            'queue': deque(),
+        }
+
+        started = datetime.datetime(2023, 1, 1, tzinfo=datetime.timezone.utc)
+        self.played: List[Tuple[int, datetime.datetime]] = [
+            (self.catalog.playlist_track(user, position), started + datetime.timedelta(minutes=4 * position))
+            for position in range(history)
+        ]
+
+        self._encode = functools.lru_cache(maxsize=cache_size)(self._render)
+        self.runner: Optional[web.AppRunner] = None
+
+        self.app = web.Application(middlewares=[self.middleware])
+        self.setup_routes(self.app.router)
+
+    def __repr__(self) -> str:
+        return f'<FakeSpotifyServer url={self.url!r} requests={sum(self.requests.values())}>'
+
+    async def __aenter__(self) -> Self:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.close()
+
+    @property
+    def url(self) -> str:
+        return f'http://{self.host}:{self.port}'
+
+    @property
+    def api_url(self) -> str:
+        return self.url + '/v1'
+
+    @property
+    def token_url(self) -> str:
+        return self.url + '/api/token'
+
+    async def start(self) -> None:
+        self.runner = web.AppRunner(self.app, access_log=None)
+        await self.runner.setup()
+
+        site = web.TCPSite(self.runner, self.host, self.port)
+        await site.start()
+
+        self.port = site._server.sockets[0].getsockname()[1] # type: ignore
+
+    async def close(self) -> None:
+        if self.runner is not None:
+            await self.runner.cleanup()
+            self.runner = None
+
+    def configure(self, client: SpotifyClient) -> SpotifyClient:
+        client.http.URL = self.api_url
+        client.http.auth.url = self.token_url
+
+        return client
+
+    def client(self, client_id: str = 'fake-client', client_secret: str = 'fake-secret', **kwargs: Any) -> SpotifyClient:
+        from ..client import SpotifyClient
+        return self.configure(SpotifyClient(client_id, client_secret, **kwargs))
+
+    def issue_token(self, ttl: Optional[float] = None) -> str:
+        token = secrets.token_urlsafe(24)
+        self.tokens[token] = time.monotonic() + (self.token_ttl if ttl is None else ttl)
+
+        return token
+
+    def expire_tokens(self) -> None:
+        # Spotify revokes tokens early every now and then, clients must cope with a 401.
+        now = time.monotonic()
+        for token in self.tokens:
+            self.tokens[token] = now
+
+    def inject(
+        self,
+        route: str = '*',
+        status: Optional[int] = None,
+        *,
+        times: int = 1,
+        delay: float = 0.0,
+        retry_after: Optional[float] = None,
+        body_rate: Optional[float] = None,
+        disconnect: bool = False,
+    ) -> None:
+        # Scripted faults are served in order to the next `times` requests of the route,
+        # before any random `Faults` are drawn.
+        if status == 429 and retry_after is None:
+            retry_after = 1
+
+        queue = self.injected.setdefault(route, deque())
+        for _ in range(times):
+            queue.append(Fault(
+                delay=delay, status=status, retry_after=retry_after, body_rate=body_rate, disconnect=disconnect
+            ))
+
+    def reset_counters(self) -> None:
+        self.requests.clear()
+        self.statuses.clear()
+
+    def count(self, route: Optional[str] = None) -> int:
+        if route is None:
+            return sum(self.requests.values())
+
+        return self.requests[route]
+
+    def _decide(self, route: str) -> Optional[Fault]:
+        for key in (route, '*'):
+            queue = self.injected.get(key)
+            if queue:
+                return queue.popleft()
+
+        faults = self.routes.get(route, self.faults)
+        return faults.decide() if faults is not None else None
+
+    def _check_token(self, request: web.Request) -> None:
+        header = request.headers.get('Authorization', '')
+        if not header.startswith('Bearer '):
+            raise Reject(401, 'No token provided')
+
+        expires_at = self.tokens.get(header[7:])
+        if expires_at is None:
+            if self.strict_auth:
+                raise Reject(401, 'Invalid access token')
+        elif time.monotonic() >= expires_at:
+            raise Reject(401, 'The access token expired')
+
+    @web.middleware
+    async def middleware(self, request: web.Request, handler: Callable[[web.Request], Any]) -> web.StreamResponse:
+        resource = request.match_info.route.resource
+        path = resource.canonical if resource is not None else request.path
+        if path.startswith('/v1/'):
+            path = path[3:]
+
+        route = f'{request.method} {path}'
+        self.requests[route] += 1
+
+        fault = self._decide(route)
+        if fault is not None and fault.delay:
+            await asyncio.sleep(fault.delay)
+
+        try:
+            if fault is not None and fault.status is not None:
+                raise Reject(fault.status, 'API rate limit exceeded' if fault.status == 429 else 'Injected failure')
+
+            if request.path.startswith('/v1/'):
+                self._check_token(request)
+
+            response = await handler(request)
+        except Reject as exc:
+            response = self.error(exc.status, exc.message)
+            if exc.status == 429:
+                assert fault is not None
+                response.headers['Retry-After'] = f'{fault.retry_after:g}'
+        except web.HTTPException as exc:
+            response = self.error(exc.status, exc.reason)
+
+        self.statuses[(route, response.status)] += 1
+
+        if fault is not None and (fault.body_rate or fault.disconnect) and isinstance(response, web.Response):
+            return await self._stream(request, response, fault)
+
+        return response
+
+    async def _stream(self, request: web.Request, response: web.Response, fault: Fault) -> web.StreamResponse:
+        body = response.body
+        assert isinstance(body, bytes)
+
+        stream = web.StreamResponse(status=response.status, headers=response.headers)
+        stream.content_length = len(body)
+        await stream.prepare(request)
+
+        if fault.disconnect:
+            # Half a body and a dead socket, the client sees a payload error.
+            await stream.write(body[:len(body) // 2])
+            assert request.transport is not None
+            request.transport.close()
+
+            return stream
+
+        assert fault.body_rate is not None
+        chunk = max(1, int(fault.body_rate / 10))
+        for start in range(0, len(body), chunk):
+            await stream.write(body[start:start + chunk])
+            await asyncio.sleep(0.1)
+
+        await stream.write_eof()
+        return stream
+
+    def error(self, status: int, message: str) -> web.Response:
+        return self.json({'error': {'status': status, 'message': message}}, status=status)
+
+    def json(self, data: Payload, *, status: int = 200) -> web.Response:
+        if data is None:
+            return web.Response(status=204)
+
+        return web.Response(body=json.dumps(data).encode('utf-8'), status=status, content_type='application/json')
+
+    def _render(self, name: str, *args: Any) -> bytes:
+        if name == 'many':
+            kind, indices = args
+            key = 'audio_features' if kind == 'audio-features' else f'{kind}s'
+            factory = self.catalog.audio_features if kind == 'audio-features' else getattr(self.catalog, kind)
+            data: Payload = {key: [factory(index) if index is not None else None for index in indices]}
+        else:
+            data = getattr(self.catalog, name)(*args)
+
+        return json.dumps(data).encode('utf-8')
+
+    def cached(self, name: str, *args: Any) -> web.Response:
+        return web.Response(body=self._encode(name, *args), content_type='application/json')
+
+    def lookup(self, kind: str, id: str) -> int:
+        index = self.catalog.index(kind, id)
+        if index is None:
+            if decode_base62(id) is None and kind != 'user':
+                raise Reject(400, 'Invalid base62 id')
+
+            raise Reject(404, 'Non existing id')
+
+        return index
+
+    def ids(self, request: web.Request, kind: str, *, limit: Optional[int] = None) -> List[str]:
+        ids = [id for id in request.query.get('ids', '').split(',') if id]
+        if not ids:
+            raise Reject(400, 'Missing ids')
+
+        if len(ids) > (limit or MAX_IDS.get(kind, 50)):
+            raise Reject(400, 'Too many ids requested')
+
+        return ids
+
+    def paging(self, request: web.Request, *, default: int = 20, maximum: int = 50) -> Tuple[int, int]:
+        try:
+            limit = int(request.query.get('limit', default))
+            offset = int(request.query.get('offset', 0))
+        except ValueError:
+            raise Reject(400, 'Invalid limit or offset')
+
+        if not 0 < limit <= maximum:
+            raise Reject(400, 'Invalid limit')
+        if offset < 0:
+            raise Reject(400, 'Invalid offset')
+
+        return limit, offset
+
+    def setup_routes(self, router: web.UrlDispatcher) -> None:
+        router.add_post('/api/token', self.token)
+
+        get, put, post, delete = router.add_get, router.add_put, router.add_post, router.add_delete
+        get('/v1/search', self.search)
+        get('/v1/markets', self.get_markets)
+
+        get('/v1/tracks', self.get_many('track'))
+        get('/v1/tracks/{id}', self.get_one('track'))
+        get('/v1/audio-features', self.get_many('audio-features'))
+        get('/v1/audio-features/{id}', self.get_one('track', 'audio_features'))
+        get('/v1/audio-analysis/{id}', self.get_one('track', 'audio_analysis'))
+
+        get('/v1/albums', self.get_many('album'))
+        get('/v1/albums/{id}', self.get_one('album'))
+        get('/v1/albums/{id}/tracks', self.get_album_tracks)
+
+        get('/v1/artists', self.get_many('artist'))
+        get('/v1/artists/{id}', self.get_one('artist'))
+        get('/v1/artists/{id}/top-tracks', self.get_artist_top_tracks)
+        get('/v1/artists/{id}/related-artists', self.get_artist_related_artists)
+        get('/v1/artists/{id}/albums', self.get_artist_albums)
+
+        get('/v1/shows', self.get_many('show', 'simplified_show'))
+        get('/v1/shows/{id}', self.get_one('show'))
+        get('/v1/shows/{id}/episodes', self.get_show_episodes)
+        get('/v1/episodes', self.get_many('episode'))
+        get('/v1/episodes/{id}', self.get_one('episode'))
+
+        get('/v1/new-releases', self.get_new_releases)
+        get('/v1/browse/featured-playlists', self.get_featured_playlists)
+        get('/v1/browse/categories', self.get_categories)
+        get('/v1/browse/categories/{id}', self.get_category)
+        get('/v1/browse/categories/{id}/playlists', self.get_category_playlists)
+        get('/v1/recommendations', self.get_recommendations)
+        get('/v1/recommendations/available-genre-seeds', self.get_genre_seeds)
+
+        get('/v1/me', self.me)
+        get('/v1/users/{id}', self.get_user)
+        get('/v1/me/top/{type}', self.get_top)
+
+        for kind in self.saved:
+            get(f'/v1/me/{kind}s', self.get_saved(kind))
+            put(f'/v1/me/{kind}s', self.save(kind))
+            delete(f'/v1/me/{kind}s', self.unsave(kind))
+            get(f'/v1/me/{kind}s/contains', self.contains_saved(kind))
+
+        get('/v1/me/following', self.get_following)
+        put('/v1/me/following', self.follow)
+        delete('/v1/me/following', self.unfollow)
+        get('/v1/me/following/contains', self.contains_following)
+
+        get('/v1/users/{id}/playlists', self.get_user_playlists)
+        post('/v1/users/{id}/playlists', self.create_playlist)
+        get('/v1/playlists/{id}', self.get_playlist)
+        put('/v1/playlists/{id}', self.change_playlist)
+        get('/v1/playlists/{id}/tracks', self.get_playlist_items)
+        post('/v1/playlists/{id}/tracks', self.add_playlist_items)
+        delete('/v1/playlists/{id}/tracks', self.remove_playlist_items)
+        get('/v1/playlists/{id}/images', self.get_playlist_images)
+        put('/v1/playlists/{id}/followers', self.follow_playlist)
+        delete('/v1/playlists/{id}/followers', self.unfollow_playlist)
+        get('/v1/playlists/{id}/followers/contains', self.contains_playlist_followers)
+
+        get('/v1/me/player', self.get_playback)
+        put('/v1/me/player', self.transfer_playback)
+        get('/v1/me/player/devices', self.get_devices)
+        get('/v1/me/player/currently-playing', self.get_currently_playing)
+        put('/v1/me/player/play', self.play)
+        put('/v1/me/player/pause', self.pause)
+        for action in ('next', 'previous'):
+            put(f'/v1/me/player/{action}', self.skip)
+            post(f'/v1/me/player/{action}', self.skip)
+        put('/v1/me/player/seek', self.seek)
+        put('/v1/me/player/repeat', self.repeat)
+        put('/v1/me/player/volume', self.volume)
+        put('/v1/me/player/shuffle', self.shuffle)
+        get('/v1/me/player/recently-played', self.get_recently_played)
+        post('/v1/me/player/queue', self.add_to_queue)
+
+    # Authentication
+
+    async def token(self, request: web.Request) -> web.Response:
+        if not request.headers.get('Authorization', '').startswith('Basic '):
+            raise Reject(400, 'invalid_client')
+
+        form = await request.post()
+        grant = form.get('grant_type')
+        if grant not in ('client_credentials', 'refresh_token'):
+            raise Reject(400, 'unsupported_grant_type')
+
+        return self.json({
+            'access_token': self.issue_token(),
+            'token_type': 'Bearer',
+            'expires_in': self.token_ttl,
+            'scope': '',
+        })
+
+    # Catalog
+
+    def get_one(self, kind: str, name: Optional[str] = None) -> Callable[[web.Request], Any]:
+        async def handler(request: web.Request) -> web.Response:
+            return self.cached(name or kind, self.lookup(kind, request.match_info['id']))
+
+        return handler
+
+    def get_many(self, kind: str, name: Optional[str] = None) -> Callable[[web.Request], Any]:
+        lookup = 'track' if kind == 'audio-features' else kind
+
+        async def handler(request: web.Request) -> web.Response:
+            indices = tuple(self.catalog.index(lookup, id) for id in self.ids(request, kind))
+            if name is not None:
+                return self.json({f'{kind}s': [getattr(self.catalog, name)(i) if i is not None else None for i in indices]})
+
+            return self.cached('many', kind, indices)
+
+        return handler
+
+    async def search(self, request: web.Request) -> web.Response:
+        query = request.query.get('q') or request.query.get('query')
+        if not query:
+            raise Reject(400, 'No search query')
+
+        limit, offset = self.paging(request)
+        types = tuple(request.query.get('type', 'track').split(','))
+
+        return self.cached('search', query, types, limit, offset)
+
+    async def get_markets(self, request: web.Request) -> web.Response:
+        return self.json({'markets': MARKETS})
+
+    async def get_album_tracks(self, request: web.Request) -> web.Response:
+        index = self.lookup('album', request.match_info['id'])
+        limit, offset = self.paging(request)
+
+        tracks = self.catalog.album_tracks(index)
+        items = [self.catalog.simplified_track(track) for track in tracks[offset:offset + limit]]
+
+        return self.json(self.catalog.page(f'{API}/albums/{request.match_info["id"]}/tracks', items, offset, limit, len(tracks)))
+
+    async def get_artist_top_tracks(self, request: web.Request) -> web.Response:
+        index = self.lookup('artist', request.match_info['id'])
+        tracks = [track for album in self.catalog.artist_albums(index)[:10] for track in self.catalog.album_tracks(album)[:1]]
+
+        return self.json({'tracks': [self.catalog.track(track) for track in tracks]})
+
+    async def get_artist_related_artists(self, request: web.Request) -> web.Response:
+        index = self.lookup('artist', request.match_info['id'])
+        artists = self.catalog.artists
+
+        return self.json({'artists': [self.catalog.artist((index + step * 7919) % artists) for step in range(1, 21)]})
+
+    async def get_artist_albums(self, request: web.Request) -> web.Response:
+        index = self.lookup('artist', request.match_info['id'])
+        limit, offset = self.paging(request)
+
+        albums = self.catalog.artist_albums(index)
+        items = [self.catalog.simplified_album(album) for album in albums[offset:offset + limit]]
+
+        return self.json(self.catalog.page(f'{API}/artists/{request.match_info["id"]}/albums', items, offset, limit, len(albums)))
+
+    async def get_show_episodes(self, request: web.Request) -> web.Response:
+        index = self.lookup('show', request.match_info['id'])
+        limit, offset = self.paging(request)
+
+        episodes = self.catalog.show_episodes(index)
+        items = [self.catalog.simplified_episode(episode) for episode in episodes[offset:offset + limit]]
+
+        return self.json(self.catalog.page(f'{API}/shows/{request.match_info["id"]}/episodes', items, offset, limit, len(episodes)))
+
+    def _slice(self, kind: str, start: int, limit: int, offset: int, total: int = 1000) -> Tuple[List[Dict[str, Any]], int]:
+        count = self.catalog.count(kind)
+        total = min(total, count)
+        factory = {'album': self.catalog.simplified_album, 'playlist': self.catalog.simplified_playlist}[kind]
+
+        return [factory((start + position) % count) for position in range(offset, min(total, offset + limit))], total
+
+    async def get_new_releases(self, request: web.Request) -> web.Response:
+        limit, offset = self.paging(request)
+        items, total = self._slice('album', 0, limit, offset, 100)
+
+        return self.json({'albums': self.catalog.page(f'{API}/browse/new-releases', items, offset, limit, total)})
+
+    async def get_featured_playlists(self, request: web.Request) -> web.Response:
+        limit, offset = self.paging(request)
+        items, total = self._slice('playlist', 0, limit, offset, 100)
+
+        return self.json({
+            'message': 'Featured',
+            'playlists': self.catalog.page(f'{API}/browse/featured-playlists', items, offset, limit, total),
+        })
+
+    def category(self, index: int) -> Dict[str, Any]:
+        id = GENRES[index]
+        return {
+            'href': f'{API}/browse/categories/{id}',
+            'icons': [{'url': f'https://t.scdn.co/images/{id}.jpg', 'height': 274, 'width': 274}],
+            'id': id,
+            'name': id.replace('-', ' ').title(),
+        }
+
+    async def get_categories(self, request: web.Request) -> web.Response:
+        limit, offset = self.paging(request)
+        items = [self.category(index) for index in range(offset, min(len(GENRES), offset + limit))]
+
+        return self.json({'categories': self.catalog.page(f'{API}/browse/categories', items, offset, limit, len(GENRES))})
+
+    async def get_category(self, request: web.Request) -> web.Response:
+        id = request.match_info['id']
+        if id not in GENRES:
+            raise Reject(404, 'Unknown category')
+
+        return self.json(self.category(GENRES.index(id)))
+
+    async def get_category_playlists(self, request: web.Request) -> web.Response:
+        id = request.match_info['id']
+        if id not in GENRES:
+            raise Reject(404, 'Unknown category')
+
+        limit, offset = self.paging(request)
+        items, total = self._slice('playlist', GENRES.index(id) * 1000, limit, offset, 100)
+
+        return self.json({'playlists': self.catalog.page(f'{API}/browse/categories/{id}/playlists', items, offset, limit, total)})
+
+    async def get_recommendations(self, request: web.Request) -> web.Response:
+        limit, _ = self.paging(request, maximum=100)
+        seeds = [
+            {'id': id, 'type': kind.upper(), 'href': None, 'initialPoolSize': 250, 'afterFilteringSize': 250, 'afterRelinkingSize': 250}
+            for kind in ('artist', 'genre', 'track')
+            for id in request.query.get(f'seed_{kind}s', '').split(',') if id
+        ]
+
+        if not seeds:
+            raise Reject(400, 'No seeds provided')
+
+        start = sum(map(ord, request.query_string))
+        tracks = self.catalog.tracks
+
+        return self.json({'seeds': seeds, 'tracks': [self.catalog.track((start + step * 104729) % tracks) for step in range(limit)]})
+
+    async def get_genre_seeds(self, request: web.Request) -> web.Response:
+        return self.json({'genres': GENRES})
+
+    # Users
+
+    async def me(self, request: web.Request) -> web.Response:
+        return self.json(self.catalog.user(self.user, private=True))
+
+    async def get_user(self, request: web.Request) -> web.Response:
+        return self.cached('user', self.lookup('user', request.match_info['id']))
+
+    async def get_top(self, request: web.Request) -> web.Response:
+        kind = request.match_info['type']
+        if kind not in ('tracks', 'artists'):
+            raise Reject(400, 'Unsupported type')
+
+        limit, offset = self.paging(request)
+        factory = self.catalog.track if kind == 'tracks' else self.catalog.artist
+        count = self.catalog.count(kind[:-1])
+
+        items = [factory((self.user * 31 + position) % count) for position in range(offset, min(50, offset + limit))]
+        return self.json(self.catalog.page(f'{API}/me/top/{kind}', items, offset, limit, min(50, count)))
+
+    # Library
+
+    def get_saved(self, kind: str) -> Callable[[web.Request], Any]:
+        factory = {
+            'track': self.catalog.track,
+            'album': self.catalog.album,
+            'episode': self.catalog.episode,
+            'show': self.catalog.simplified_show,
+        }[kind]
+
+        async def handler(request: web.Request) -> web.Response:
+            limit, offset = self.paging(request)
+            saved = list(self.saved[kind].items())[::-1]
+
+            items = [
+                {'added_at': added_at, kind: factory(self.lookup(kind, id))} for id, added_at in saved[offset:offset + limit]
+            ]
+
+            return self.json(self.catalog.page(f'{API}/me/{kind}s', items, offset, limit, len(saved)))
+
+        return handler
+
+    async def _body_ids(self, request: web.Request, kind: str) -> List[str]:
+        if 'ids' in request.query:
+            return self.ids(request, kind)
+
+        data = await request.json() if request.can_read_body else {}
+        ids = data.get('ids') or []
+        if not ids:
+            raise Reject(400, 'Missing ids')
+
+        return ids
+
+    def save(self, kind: str) -> Callable[[web.Request], Any]:
+        async def handler(request: web.Request) -> web.Response:
+            saved = self.saved[kind]
+            added_at = timestamp(datetime.datetime.now(datetime.timezone.utc))
+
+            for id in await self._body_ids(request, kind):
+                self.lookup(kind, id)
+                saved.pop(id, None)
+                saved[id] = added_at
+
+            return self.json(None)
+
+        return handler
+
+    def unsave(self, kind: str) -> Callable[[web.Request], Any]:
+        async def handler(request: web.Request) -> web.Response:
+            for id in await self._body_ids(request, kind):
+                self.saved[kind].pop(id, None)
+
+            return self.json(None)
+
+        return handler
+
+    def contains_saved(self, kind: str) -> Callable[[web.Request], Any]:
+        async def handler(request: web.Request) -> web.Response:
+            return self.json([id in self.saved[kind] for id in self.ids(request, kind)])
+
+        return handler
+
+    def _following_type(self, request: web.Request) -> str:
+        kind = request.query.get('type')
+        if kind not in self.following:
+            raise Reject(400, 'Invalid type')
+
+        return kind # type: ignore
+
+    async def get_following(self, request: web.Request) -> web.Response:
+        if request.query.get('type') != 'artist':
+            raise Reject(400, 'Only artist type is supported')
+
+        limit, _ = self.paging(request)
+        ids = list(self.following['artist'])
+
+        after = request.query.get('after')
+        start = ids.index(after) + 1 if after in self.following['artist'] else 0
+        page = ids[start:start + limit]
+        more = start + limit < len(ids)
+
+        return self.json({'artists': {
+            'href': f'{API}/me/following?type=artist&limit={limit}',
+            'items': [self.catalog.artist(self.lookup('artist', id)) for id in page],
+            'limit': limit,
+            'next': f'{API}/me/following?type=artist&after={page[-1]}&limit={limit}' if more else None,
+            'cursors': {'after': page[-1] if more else None},
+            'total': len(ids),
+        }})
+
+    async def follow(self, request: web.Request) -> web.Response:
+        kind = self._following_type(request)
+        for id in await self._body_ids(request, kind):
+            self.lookup(kind, id)
+            self.following[kind][id] = None
+
+        return self.json(None)
+
+    async def unfollow(self, request: web.Request) -> web.Response:
+        kind = self._following_type(request)
+        for id in await self._body_ids(request, kind):
+            self.following[kind].pop(id, None)
+
+        return self.json(None)
+
+    async def contains_following(self, request: web.Request) -> web.Response:
+        kind = self._following_type(request)
+        return self.json([id in self.following[kind] for id in self.ids(request, kind)])
+
+    # Playlists
+
+    def _stored(self, id: str, *, write: bool = False) -> Optional[Dict[str, Any]]:
+        playlist = self.playlists.get(id)
+        if playlist is not None or not write:
+            return playlist
+
+        # The first write to a catalog playlist copies its items, reads stay generated.
+        index = self.lookup('playlist', id)
+        data = self.catalog.simplified_playlist(index)
+        added_by = data['owner']
+        items = [
+            {'uri': self.catalog.uri('track', self.catalog.playlist_track(index, position)), 'added_at': item_added_at, 'added_by': added_by}
+            for position, item_added_at in (
+                (position, timestamp(datetime.datetime(2020, 1, 1) + datetime.timedelta(hours=position)))
+                for position in range(self.catalog.playlist_length(index))
+            )
+        ]
+
+        playlist = self.playlists[id] = {'data': data, 'items': items, 'version': 0}
+        return playlist
+
+    def _item(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        _, kind, id = item['uri'].split(':')
+        factory = self.catalog.track if kind == 'track' else self.catalog.episode
+        index = self.catalog.index(kind, id)
+
+        return {
+            'added_at': item['added_at'],
+            'added_by': item['added_by'],
+            'is_local': False,
+            'track': factory(index) if index is not None else None,
+        }
+
+    def _snapshot(self, playlist: Dict[str, Any]) -> str:
+        playlist['version'] += 1
+        snapshot = self.catalog.id('snapshot', playlist['version'])
+        playlist['data']['snapshot_id'] = snapshot
+
+        return snapshot
+
+    def _stored_page(self, id: str, playlist: Dict[str, Any], limit: int, offset: int) -> Dict[str, Any]:
+        items = playlist['items']
+        return self.catalog.page(
+            f'{API}/playlists/{id}/tracks',
+            [self._item(item) for item in items[offset:offset + limit]],
+            offset, limit, len(items),
+        )
+
+    async def get_user_playlists(self, request: web.Request) -> web.Response:
+        id = request.match_info['id']
+        user = self.lookup('user', id)
+        limit, offset = self.paging(request)
+
+        created = [playlist['data'] for playlist in self.playlists.values() if playlist['data']['owner']['id'] == id]
+        owned = range(user, min(self.catalog.playlists, user + self.catalog.users * 20), self.catalog.users)
+        total = len(created) + len(owned)
+
+        items = created[offset:offset + limit]
+        for position in range(max(0, offset - len(created)), max(0, offset + limit - len(created))):
+            if position >= len(owned):
+                break
+
+            items.append(self.catalog.simplified_playlist(owned[position]))
+
+        return self.json(self.catalog.page(f'{API}/users/{id}/playlists', items, offset, limit, total))
+
+    async def create_playlist(self, request: web.Request) -> web.Response:
+        user = self.lookup('user', request.match_info['id'])
+        body = await request.json()
+        if not body.get('name'):
+            raise Reject(400, 'Missing name')
+
+        index = self.catalog.playlists + len(self.playlists)
+        data = self.catalog.simplified_playlist(0)
+        data.update(
+            id=self.catalog.id('playlist', index),
+            name=body['name'],
+            description=body.get('description'),
+            public=body.get('public', True),
+            collaborative=body.get('collaborative', False),
+            owner=self.catalog.user(user),
+            images=[],
+            tracks={'href': f'{API}/playlists/{self.catalog.id("playlist", index)}/tracks', 'total': 0},
+        )
+        data['href'] = f'{API}/playlists/{data["id"]}'
+        data['uri'] = f'spotify:playlist:{data["id"]}'
+        data['external_urls'] = {'spotify': f'https://open.spotify.com/playlist/{data["id"]}'}
+
+        playlist = self.playlists[data['id']] = {'data': data, 'items': [], 'version': 0}
+        self._snapshot(playlist)
+
+        return self.json(self._full_playlist(data['id'], playlist), status=201)
+
+    def _full_playlist(self, id: str, playlist: Dict[str, Any]) -> Dict[str, Any]:
+        data = dict(playlist['data'])
+        data['followers'] = {'href': None, 'total': 0}
+        data['tracks'] = self._stored_page(id, playlist, 100, 0)
+
+        return data
+
+    async def get_playlist(self, request: web.Request) -> web.Response:
+        id = request.match_info['id']
+        playlist = self._stored(id)
+        if playlist is not None:
+            return self.json(self._full_playlist(id, playlist))
+
+        return self.cached('playlist', self.lookup('playlist', id))
+
+    async def change_playlist(self, request: web.Request) -> web.Response:
+        playlist = self._stored(request.match_info['id'], write=True)
+        assert playlist is not None
+
+        body = await request.json()
+        for key in ('name', 'public', 'collaborative', 'description'):
+            if key in body:
+                playlist['data'][key] = body[key]
+
+        return self.json(None)
+
+    async def get_playlist_items(self, request: web.Request) -> web.Response:
+        id = request.match_info['id']
+        limit, offset = self.paging(request, default=100, maximum=100)
+
+        playlist = self._stored(id)
+        if playlist is not None:
+            return self.json(self._stored_page(id, playlist, limit, offset))
+
+        return self.cached('playlist_page', self.lookup('playlist', id), offset, limit)
+
+    async def add_playlist_items(self, request: web.Request) -> web.Response:
+        uris = [uri for uri in request.query.get('uris', '').split(',') if uri]
+        if not uris and request.can_read_body:
+            uris = (await request.json()).get('uris') or []
+
+        if not uris:
+            raise Reject(400, 'Missing uris')
+        if len(uris) > 100:
+            raise Reject(400, 'Too many uris')
+
+        playlist = self._stored(request.match_info['id'], write=True)
+        assert playlist is not None
+
+        added_by = self.catalog.user(self.user)
+        added_at = timestamp(datetime.datetime.now(datetime.timezone.utc))
+        items = [{'uri': uri, 'added_at': added_at, 'added_by': added_by} for uri in uris]
+
+        position = request.query.get('position')
+        index = int(position) if position is not None else len(playlist['items'])
+        playlist['items'][index:index] = items
+        playlist['data']['tracks']['total'] = len(playlist['items'])
+
+        return self.json({'snapshot_id': self._snapshot(playlist)}, status=201)
+
+    async def remove_playlist_items(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        uris = {track['uri'] if isinstance(track, dict) else track for track in body.get('tracks') or []}
+
+        playlist = self._stored(request.match_info['id'], write=True)
+        assert playlist is not None
+
+        playlist['items'] = [item for item in playlist['items'] if item['uri'] not in uris]
+        playlist['data']['tracks']['total'] = len(playlist['items'])
+
+        return self.json({'snapshot_id': self._snapshot(playlist)})
+
+    async def get_playlist_images(self, request: web.Request) -> web.Response:
+        id = request.match_info['id']
+        playlist = self._stored(id)
+        if playlist is not None:
+            return self.json(playlist['data']['images'])
+
+        return self.json(self.catalog.simplified_playlist(self.lookup('playlist', id))['images'])
+
+    async def follow_playlist(self, request: web.Request) -> web.Response:
+        id = request.match_info['id']
+        if id not in self.playlists:
+            self.lookup('playlist', id)
+
+        self.followed_playlists[id] = None
+        return self.json(None)
+
+    async def unfollow_playlist(self, request: web.Request) -> web.Response:
+        self.followed_playlists.pop(request.match_info['id'], None)
+        return self.json(None)
+
+    async def contains_playlist_followers(self, request: web.Request) -> web.Response:
+        following = request.match_info['id'] in self.followed_playlists
+        current = self.catalog.id('user', self.user)
+
+        return self.json([following and id == current for id in self.ids(request, 'user', limit=5)])
+
+    # Player
+
+    def _current(self) -> Optional[str]:
+        player = self.player
+        uris = player['uris']
+
+        return uris[player['position']] if 0 <= player['position'] < len(uris) else None
+
+    def _playback(self, *, currently_playing: bool = False) -> Payload:
+        player = self.player
+        uri = self._current()
+        if uri is None:
+            return None
+
+        item = self._item({'uri': uri, 'added_at': None, 'added_by': None})['track']
+        data: Dict[str, Any] = {
+            'timestamp': int(time.time() * 1000),
+            'context': player['context'],
+            'progress_ms': player['progress_ms'],
+            'is_playing': player['is_playing'],
+            'item': item,
+            'currently_playing_type': uri.split(':')[1],
+            'actions': {'disallows': {'resuming': player['is_playing']}},
+        }
+
+        if not currently_playing:
+            data.update(
+                device=dict(DEVICE, volume_percent=player['volume_percent']),
+                repeat_state=player['repeat_state'],
+                shuffle_state=player['shuffle_state'],
+            )
+
+        return data
+
+    def _device(self, request: web.Request) -> None:
+        device = request.query.get('device_id')
+        if device is not None and device != DEVICE['id']:
+            raise Reject(404, 'Device not found')
+
+    def _require_active(self) -> None:
+        if self._current() is None:
+            raise Reject(404, 'Player command failed: No active device found')
+
+    def _played(self) -> None:
+        uri = self._current()
+        if uri is None:
+            return
+
+        _, kind, id = uri.split(':')
+        index = self.catalog.index(kind, id)
+        if kind == 'track' and index is not None:
+            self.played.append((index, datetime.datetime.now(datetime.timezone.utc)))
+
+    async def get_playback(self, request: web.Request) -> web.Response:
+        return self.json(self._playback())
+
+    async def get_currently_playing(self, request: web.Request) -> web.Response:
+        return self.json(self._playback(currently_playing=True))
+
+    async def get_devices(self, request: web.Request) -> web.Response:
+        return self.json({'devices': [dict(DEVICE, volume_percent=self.player['volume_percent'])]})
+
+    async def transfer_playback(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        if body.get('device_ids') not in ([DEVICE['id']], DEVICE['id']):
+            raise Reject(404, 'Device not found')
+
+        if body.get('play'):
+            self.player['is_playing'] = self._current() is not None
+
+        return self.json(None)
+
+    async def play(self, request: web.Request) -> web.Response:
+        self._device(request)
+        body = await request.json() if request.can_read_body else {}
+        player = self.player
+
+        if body.get('uris'):
+            player.update(uris=list(body['uris']), context=None)
+        elif body.get('context_uri'):
+            _, kind, id = body['context_uri'].split(':')
+            if kind != 'playlist':
+                raise Reject(400, 'Unsupported context')
+
+            index = self.lookup('playlist', id)
+            length = min(self.catalog.playlist_length(index), 100)
+            player.update(
+                uris=[self.catalog.uri('track', self.catalog.playlist_track(index, position)) for position in range(length)],
+                context={'type': 'playlist', 'uri': body['context_uri'], 'href': f'{API}/playlists/{id}', 'external_urls': {}},
+            )
+        else:
+            self._require_active()
+            player['is_playing'] = True
+
+            return self.json(None)
+
+        offset = body.get('offset') or 0
+        player.update(
+            position=offset.get('position', 0) if isinstance(offset, dict) else offset,
+            progress_ms=body.get('position_ms', 0),
+            is_playing=True,
+        )
+
+        return self.json(None)
+
+    async def pause(self, request: web.Request) -> web.Response:
+        self._device(request)
+        self._require_active()
+        self.player['is_playing'] = False
+
+        return self.json(None)
+
+    async def skip(self, request: web.Request) -> web.Response:
+        self._device(request)
+        self._require_active()
+        self._played()
+
+        player = self.player
+        if request.path.endswith('/next'):
+            if player['queue']:
+                player['uris'].insert(player['position'] + 1, player['queue'].popleft())
+
+            player['position'] = min(player['position'] + 1, len(player['uris']) - 1)
+        else:
+            player['position'] = max(player['position'] - 1, 0)
+
+        player['progress_ms'] = 0
+        return self.json(None)
+
+    def _int(self, request: web.Request, key: str, low: int, high: int) -> int:
+        try:
+            value = int(request.query[key])
+        except (KeyError, ValueError):
+            raise Reject(400, f'Invalid {key}')
+
+        if not low <= value <= high:
+            raise Reject(400, f'{key} out of range')
+
+        return value
+
+    async def seek(self, request: web.Request) -> web.Response:
+        self._device(request)
+        self._require_active()
+        self.player['progress_ms'] = self._int(request, 'position_ms', 0, 2 ** 31)
+
+        return self.json(None)
+
+    async def repeat(self, request: web.Request) -> web.Response:
+        self._device(request)
+        state = request.query.get('state')
+        if state not in ('track', 'context', 'off'):
+            raise Reject(400, 'Invalid state')
+
+        self.player['repeat_state'] = state
+        return self.json(None)
+
+    async def volume(self, request: web.Request) -> web.Response:
+        self._device(request)
+        self.player['volume_percent'] = self._int(request, 'volume_percent' if 'volume_percent' in request.query else 'volume_percentage', 0, 100)
+
+        return self.json(None)
+
+    async def shuffle(self, request: web.Request) -> web.Response:
+        self._device(request)
+        state = request.query.get('state', '').lower()
+        if state not in ('true', 'false'):
+            raise Reject(400, 'Invalid state')
+
+        self.player['shuffle_state'] = state == 'true'
+        return self.json(None)
+
+    async def add_to_queue(self, request: web.Request) -> web.Response:
+        self._device(request)
+        uri = request.query.get('uri')
+        if not uri or uri.count(':') != 2:
+            raise Reject(400, 'Invalid uri')
+
+        self._require_active()
+        self.player['queue'].append(uri)
+
+        return self.json(None)
+
+    async def get_recently_played(self, request: web.Request) -> web.Response:
+        limit, _ = self.paging(request)
+        if 'after' in request.query and 'before' in request.query:
+            raise Reject(400, 'after and before are mutually exclusive')
+
+        def millis(at: datetime.datetime) -> int:
+            return int(at.timestamp() * 1000)
+
+        played = self.played
+        if 'after' in request.query:
+            after = int(request.query['after'])
+            newer = [play for play in played if millis(play[1]) > after]
+            page, more = newer[:limit], len(newer) > limit
+        else:
+            before = int(request.query.get('before', 2 ** 63))
+            older = [play for play in played if millis(play[1]) < before]
+            page, more = older[-limit:], len(older) > limit
+
+        page = page[::-1]
+        cursors = {'after': str(millis(page[0][1])), 'before': str(millis(page[-1][1]))} if page else None
+
+        return self.json({
+            'href': f'{API}/me/player/recently-played?limit={limit}',
+            'items': [
+                {'track': self.catalog.track(index), 'played_at': timestamp(at), 'context': None} for index, at in page
+            ],
+            'limit': limit,
+            'next': f'{API}/me/player/recently-played?before={cursors["before"]}&limit={limit}' if more and cursors else None,
+            'cursors': cursors,
+        })
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Optional
+from abc import ABC, abstractmethod
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import time
+
+from .utils import FileLock
+
+__all__ = (
+    'StoredToken',
+    'TokenStore',
+    'FileTokenStore',
+    'SQLiteTokenStore',
+)
+
+class StoredToken:
+    __slots__ = ('access_token', 'expires_at', 'refresh_token')
+
+    def __init__(self, access_token: str, expires_at: Optional[float], refresh_token: Optional[str] = None) -> None:
+        self.access_token = access_token
+        self.expires_at = expires_at
+        self.refresh_token = refresh_token
+
+    def __repr__(self) -> str:
+        return f'<StoredToken expires_at={self.expires_at!r} refreshable={self.refresh_token is not None}>'
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> StoredToken:
+        return cls(data['access_token'], data.get('expires_at'), data.get('refresh_token'))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'access_token': self.access_token,
+            'expires_at': self.expires_at,
+            'refresh_token': self.refresh_token,
+        }
+
+    def is_expired(self, margin: float = 0.0) -> bool:
+        if self.expires_at is None:
+            return False
+
+        return time.time() + margin >= self.expires_at
+
+class TokenStore(ABC):
+    # All methods are blocking, `Authentication` calls them from a worker thread.
+
+    @abstractmethod
+    def load(self, key: str) -> Optional[StoredToken]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def save(self, key: str, token: StoredToken) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def lock(self, key: str) -> FileLock:
+        raise NotImplementedError
+
+def _lock_path(path: str, key: str) -> str:
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+    return f'{path}.{digest}.lock'
+
+class FileTokenStore(TokenStore):
+    def __init__(self, path: str) -> None:
+        self.path = os.fspath(path)
+
+    def __repr__(self) -> str:
+        return f'<FileTokenStore path={self.path!r}>'
+
+    def _read(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def load(self, key: str) -> Optional[StoredToken]:
+        data = self._read().get(key)
+        return StoredToken.from_dict(data) if data else None
+
+    def save(self, key: str, token: StoredToken) -> None:
+        with FileLock(self.path + '.lock'):
+            data = self._read()
+            data[key] = token.to_dict()
+
+            # Readers never take the lock, so the file is swapped in atomically.
+            directory = os.path.dirname(os.path.abspath(self.path))
+            fd, tmp = tempfile.mkstemp(dir=directory, prefix='.tokens-')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(data, f)
+
+                os.chmod(tmp, 0o600)
+                os.replace(tmp, self.path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+
+    def lock(self, key: str) -> FileLock:
+        return FileLock(_lock_path(self.path, key))
+
+class SQLiteTokenStore(TokenStore):
+    def __init__(self, path: str, *, timeout: float = 30.0) -> None:
+        self.path = os.fspath(path)
+        self.timeout = timeout
+
+        with self._connect() as connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS tokens ('
+                'key TEXT PRIMARY KEY, access_token TEXT NOT NULL, expires_at REAL, refresh_token TEXT)'
+            )
+
+    def __repr__(self) -> str:
+        return f'<SQLiteTokenStore path={self.path!r}>'
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=self.timeout)
+
+    def load(self, key: str) -> Optional[StoredToken]:
+        connection = self._connect()
+        try:
+            row = connection.execute(
+                'SELECT access_token, expires_at, refresh_token FROM tokens WHERE key = ?', (key,)
+            ).fetchone()
+        finally:
+            connection.close()
+
+        return StoredToken(*row) if row else None
+
+    def save(self, key: str, token: StoredToken) -> None:
+        connection = self._connect()
+        try:
+            with connection:
+                connection.execute(
+                    'INSERT OR REPLACE INTO tokens (key, access_token, expires_at, refresh_token) VALUES (?, ?, ?, ?)',
+                    (key, token.access_token, token.expires_at, token.refresh_token)
+                )
+        finally:
+            connection.close()
+
+    def lock(self, key: str) -> FileLock:
+        return FileLock(_lock_path(self.path, key))
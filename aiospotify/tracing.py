@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Deque, Dict, List, Optional, Set, TypeVar
+from collections import deque
+import contextvars
+import asyncio
+import functools
+import inspect
+import logging
+import time
+
+import aiohttp
+
+if TYPE_CHECKING:
+    from typing_extensions import Concatenate, ParamSpec
+
+    from .client import SpotifyClient
+
+    P = ParamSpec('P')
+
+__all__ = (
+    'RequestTrace',
+    'Tracer',
+    'traced',
+)
+
+T = TypeVar('T')
+
+_log = logging.getLogger(__name__)
+
+TraceCallback = Callable[['RequestTrace'], Any]
+
+# Traces of the requests made by the `SpotifyClient` method currently running, if it is traced.
+current_operation: contextvars.ContextVar[Optional[List[RequestTrace]]] = contextvars.ContextVar(
+    'aiospotify_operation', default=None
+)
+
+class RequestTrace:
+    __slots__ = (
+        'method',
+        'path',
+        'route',
+        'operation',
+        'started',
+        'finished',
+        'status',
+        'attempts',
+        'error',
+        'phases',
+        '_marks',
+    )
+
+    def __init__(self, method: str, path: str, route: str) -> None:
+        self.method = method
+        self.path = path
+        self.route = route
+        self.operation: Optional[str] = None
+        self.started = time.monotonic()
+        self.finished: Optional[float] = None
+        self.status: Optional[int] = None
+        self.attempts = 0
+        self.error: Optional[str] = None
+        self.phases: Dict[str, float] = {}
+        self._marks: Dict[str, float] = {}
+
+    def __repr__(self) -> str:
+        return f'<RequestTrace method={self.method!r} route={self.route!r} status={self.status} total={self.total:.4f}>'
+
+    @property
+    def total(self) -> float:
+        finished = self.finished if self.finished is not None else time.monotonic()
+        return finished - self.started
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def mark(self, name: str) -> None:
+        self._marks[name] = time.monotonic()
+
+    def since(self, phase: str, mark: str) -> None:
+        started = self._marks.pop(mark, None)
+        if started is not None:
+            self.add(phase, time.monotonic() - started)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'method': self.method,
+            'path': self.path,
+            'route': self.route,
+            'operation': self.operation,
+            'status': self.status,
+            'attempts': self.attempts,
+            'error': self.error,
+            'total': self.total,
+            'phases': dict(self.phases),
+        }
+
+class Tracer:
+    # Phases, in the order a request goes through them:
+    #   backoff, ratelimit, token, queue           time spent in the client's own layers
+    #   connection_queued, dns, connect            waiting on the connector (connect includes TLS)
+    #   ttfb, body, decode, model                  server time, body read, JSON decode, object construction
+    # Only requests that took at least `threshold` seconds reach the callback.
+
+    def __init__(
+        self,
+        callback: Optional[TraceCallback] = None,
+        *,
+        threshold: Optional[float] = None,
+        history: int = 100,
+    ) -> None:
+        self.callback = callback
+        self.threshold = threshold
+        self.history: Deque[RequestTrace] = deque(maxlen=history)
+        # The loop only keeps weak references to tasks, async callbacks are held here until done.
+        self._tasks: Set[asyncio.Future[Any]] = set()
+
+        self.trace_config = aiohttp.TraceConfig()
+        self.trace_config.on_connection_queued_start.append(self._on_mark('connection_queued'))
+        self.trace_config.on_connection_queued_end.append(self._on_phase('connection_queued', 'connection_queued'))
+        self.trace_config.on_connection_create_start.append(self._on_mark('connect'))
+        self.trace_config.on_connection_create_end.append(self._on_phase('connect', 'connect'))
+        self.trace_config.on_dns_resolvehost_start.append(self._on_mark('dns'))
+        self.trace_config.on_dns_resolvehost_end.append(self._on_phase('dns', 'dns'))
+        self.trace_config.on_request_headers_sent.append(self._on_mark('sent'))
+        self.trace_config.on_request_end.append(self._on_phase('ttfb', 'sent'))
+        self.trace_config.freeze()
+
+    def __repr__(self) -> str:
+        return f'<Tracer threshold={self.threshold} history={len(self.history)}>'
+
+    def install(self, session: aiohttp.ClientSession) -> None:
+        if self.trace_config not in session.trace_configs:
+            session.trace_configs.append(self.trace_config)
+
+    @staticmethod
+    def _on_mark(name: str) -> Callable[..., Awaitable[None]]:
+        async def callback(session: aiohttp.ClientSession, context: Any, params: Any) -> None:
+            trace = context.trace_request_ctx
+            if isinstance(trace, RequestTrace):
+                trace.mark(name)
+
+        return callback
+
+    @staticmethod
+    def _on_phase(phase: str, mark: str) -> Callable[..., Awaitable[None]]:
+        async def callback(session: aiohttp.ClientSession, context: Any, params: Any) -> None:
+            trace = context.trace_request_ctx
+            if isinstance(trace, RequestTrace):
+                trace.since(phase, mark)
+
+        return callback
+
+    def start(self, method: str, path: str, route: str) -> RequestTrace:
+        return RequestTrace(method, path, route)
+
+    def finish(self, trace: RequestTrace) -> None:
+        trace.finished = time.monotonic()
+
+        # DNS resolution happens while the connection is being created, count it once.
+        if 'dns' in trace.phases and 'connect' in trace.phases:
+            trace.phases['connect'] = max(0.0, trace.phases['connect'] - trace.phases['dns'])
+
+        operation = current_operation.get()
+        if operation is not None:
+            # Emitted once the traced method has built its objects.
+            operation.append(trace)
+            return
+
+        self.emit(trace)
+
+    def emit(self, trace: RequestTrace) -> None:
+        self.history.append(trace)
+
+        if self.callback is None:
+            return
+
+        if self.threshold is not None and trace.total < self.threshold:
+            return
+
+        result = self.callback(trace)
+        if inspect.isawaitable(result):
+            task = asyncio.ensure_future(result)
+            self._tasks.add(task)
+            task.add_done_callback(self._callback_done)
+
+    def _callback_done(self, task: asyncio.Future[Any]) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            _log.error('trace callback %r raised', self.callback, exc_info=task.exception())
+
+def traced(
+    func: Callable[Concatenate[SpotifyClient, P], Awaitable[T]]
+) -> Callable[Concatenate[SpotifyClient, P], Awaitable[T]]:
+    # Attributes the time a `SpotifyClient` method spends outside of its requests, which is
+    # mostly building models from the payload, to the last request it made.
+    @functools.wraps(func)
+    async def wrapper(self: SpotifyClient, *args: P.args, **kwargs: P.kwargs) -> T:
+        tracer = self.http.tracer
+        if tracer is None:
+            return await func(self, *args, **kwargs)
+
+        traces: List[RequestTrace] = []
+        token = current_operation.set(traces)
+        started = time.monotonic()
+
+        try:
+            return await func(self, *args, **kwargs)
+        finally:
+            elapsed = time.monotonic() - started
+            current_operation.reset(token)
+
+            if traces:
+                requests = sum(trace.total for trace in traces)
+                traces[-1].add('model', max(0.0, elapsed - requests))
+
+            for trace in traces:
+                trace.operation = func.__name__
+                tracer.emit(trace)
+
+    return wrapper
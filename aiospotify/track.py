@@ -1,10 +1,14 @@
-from typing import Dict, Any, List, Optional
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, Any, List, Optional
 
 from .partials import PartialTrack, PartialAlbum
-from .http import HTTPClient
 from .image import Image
 from .utils import fromisoformat
 
+if TYPE_CHECKING:
+    from .http import HTTPClient
+
 __all__ = (
     'TrackAudioFeatures',
     'TrackAudioAnalysis',
@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Mapping, Optional, Tuple, Union
+from abc import ABC, abstractmethod
+from collections import Counter
+import asyncio
+import json
+import time
+import urllib.parse
+
+import aiohttp
+from multidict import CIMultiDict, CIMultiDictProxy
+
+if TYPE_CHECKING:
+    from .tracing import RequestTrace, Tracer
+
+__all__ = (
+    'ConnectionSettings',
+    'TransportRequest',
+    'TransportResponse',
+    'Transport',
+    'AiohttpTransport',
+    'MemoryTransport',
+)
+
+class ConnectionSettings:
+    # Defaults match aiohttp's own. `limit_per_host` caps the connections to
+    # api.spotify.com, which is the only host that matters besides the token endpoint.
+    __slots__ = ('limit', 'limit_per_host', 'keepalive_timeout', 'ttl_dns_cache', 'use_dns_cache')
+
+    def __init__(
+        self,
+        *,
+        limit: int = 100,
+        limit_per_host: int = 0,
+        keepalive_timeout: float = 15.0,
+        ttl_dns_cache: Optional[int] = 10,
+        use_dns_cache: bool = True,
+    ) -> None:
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.ttl_dns_cache = ttl_dns_cache
+        self.use_dns_cache = use_dns_cache
+
+    def __repr__(self) -> str:
+        return (
+            f'<ConnectionSettings limit={self.limit} limit_per_host={self.limit_per_host} '
+            f'keepalive_timeout={self.keepalive_timeout} ttl_dns_cache={self.ttl_dns_cache}>'
+        )
+
+    def connector(self) -> aiohttp.TCPConnector:
+        return aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=self.ttl_dns_cache,
+            use_dns_cache=self.use_dns_cache,
+        )
+
+class TransportRequest:
+    __slots__ = ('method', 'url', 'params', 'json', 'data', 'headers', 'trace', 'kwargs')
+
+    def __init__(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        json: Any = None,
+        data: Any = None,
+        headers: Optional[Dict[str, str]] = None,
+        trace: Optional[RequestTrace] = None,
+        kwargs: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.method = method
+        self.url = url
+        self.params = params
+        self.json = json
+        self.data = data
+        self.headers = headers or {}
+        self.trace = trace
+        self.kwargs = kwargs or {}
+
+    def __repr__(self) -> str:
+        return f'<TransportRequest method={self.method!r} url={self.url!r}>'
+
+    @property
+    def path(self) -> str:
+        return urllib.parse.urlsplit(self.url).path
+
+class TransportResponse:
+    __slots__ = ('status', 'headers', 'body', 'reason')
+
+    def __init__(self, status: int, headers: Mapping[str, str], body: bytes, *, reason: Optional[str] = None) -> None:
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.reason = reason
+
+    def __repr__(self) -> str:
+        return f'<TransportResponse status={self.status} size={len(self.body)}>'
+
+    def json(self) -> Any:
+        return json.loads(self.body.decode('utf-8'))
+
+class Transport(ABC):
+    # Everything that goes over the wire, API calls and token requests alike, goes through
+    # `send`. Implementations read the whole body before returning.
+
+    @abstractmethod
+    async def send(self, request: TransportRequest) -> TransportResponse:
+        raise NotImplementedError
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> TransportResponse:
+        return await self.send(TransportRequest(method, url, **kwargs))
+
+    def install(self, tracer: Tracer) -> None:
+        pass
+
+    async def warm(self, url: str, connections: int) -> int:
+        # Opens up to `connections` keep-alive connections to the host of `url`, returns how
+        # many were opened. Transports without a connection pool have nothing to do.
+        return 0
+
+    async def close(self) -> None:
+        pass
+
+class AiohttpTransport(Transport):
+    def __init__(
+        self,
+        session: Optional[aiohttp.ClientSession] = None,
+        *,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+        connector: Optional[aiohttp.BaseConnector] = None,
+        settings: Optional[ConnectionSettings] = None,
+    ) -> None:
+        if settings is not None:
+            if session is not None or connector is not None:
+                raise TypeError('settings are mutually exclusive with session and connector')
+
+            connector = settings.connector()
+
+        self.session = session or aiohttp.ClientSession(loop=loop, connector=connector)
+
+    def __repr__(self) -> str:
+        return f'<AiohttpTransport closed={self.session.closed}>'
+
+    async def send(self, request: TransportRequest) -> TransportResponse:
+        trace = request.trace
+
+        async with self.session.request(
+            request.method,
+            request.url,
+            params=request.params,
+            json=request.json,
+            data=request.data,
+            headers=request.headers,
+            trace_request_ctx=trace,
+            **request.kwargs
+        ) as response:
+            started = time.monotonic()
+            body = await response.read()
+
+            if trace is not None:
+                trace.add('body', time.monotonic() - started)
+
+        return TransportResponse(response.status, response.headers, body, reason=response.reason)
+
+    def install(self, tracer: Tracer) -> None:
+        tracer.install(self.session)
+
+    async def warm(self, url: str, connections: int) -> int:
+        # Concurrent requests each need their own connection, once read they all go back to
+        # the pool and stay open for `keepalive_timeout`. The status doesn't matter.
+        async def open() -> bool:
+            try:
+                async with self.session.head(url, allow_redirects=False) as response:
+                    await response.read()
+            except aiohttp.ClientError:
+                return False
+
+            return True
+
+        results = await asyncio.gather(*(open() for _ in range(connections)))
+        return sum(results)
+
+    async def close(self) -> None:
+        await self.session.close()
+
+MemoryHandler = Callable[[TransportRequest], Awaitable[TransportResponse]]
+
+class MemoryTransport(Transport):
+    # Serves canned responses keyed by method and URL path, e.g. ('GET', '/v1/tracks/{id}')
+    # with the id filled in. Requests without a route go to `handler` or get a 404. A token
+    # endpoint is registered up front so client credentials work out of the box.
+
+    def __init__(self, handler: Optional[MemoryHandler] = None, *, latency: float = 0.0) -> None:
+        self.handler = handler
+        self.latency = latency
+        self.routes: Dict[Tuple[str, str], TransportResponse] = {}
+        self.requests: Counter[Tuple[str, str]] = Counter()
+
+        self.add('POST', '/api/token', {'access_token': 'memory', 'token_type': 'Bearer', 'expires_in': 3600})
+
+    def __repr__(self) -> str:
+        return f'<MemoryTransport routes={len(self.routes)} requests={sum(self.requests.values())}>'
+
+    @staticmethod
+    def response(
+        data: Union[Dict[str, Any], Any, bytes, None] = None,
+        *,
+        status: int = 200,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> TransportResponse:
+        if isinstance(data, bytes):
+            body = data
+        elif data is None:
+            body = b''
+        else:
+            body = json.dumps(data).encode('utf-8')
+
+        merged: CIMultiDict[str] = CIMultiDict({'Content-Type': 'application/json'} if body else {})
+        merged.update(headers or {})
+
+        return TransportResponse(status, CIMultiDictProxy(merged), body)
+
+    def add(
+        self,
+        method: str,
+        path: str,
+        data: Union[Dict[str, Any], Any, bytes, None] = None,
+        *,
+        status: int = 200,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> None:
+        # Bodies are encoded once here, serving a route costs a dictionary lookup.
+        self.routes[(method.upper(), path)] = self.response(data, status=status, headers=headers)
+
+    def remove(self, method: str, path: str) -> None:
+        self.routes.pop((method.upper(), path), None)
+
+    async def send(self, request: TransportRequest) -> TransportResponse:
+        key = (request.method.upper(), request.path)
+        self.requests[key] += 1
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        response = self.routes.get(key)
+        if response is not None:
+            return response
+
+        if self.handler is not None:
+            return await self.handler(request)
+
+        return self.response({'error': {'status': 404, 'message': 'Not found.'}}, status=404)
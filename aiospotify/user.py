@@ -1,19 +1,43 @@
-from typing import Any, Dict, List, Optional
+from __future__ import annotations
 
-from .playback import UserPlayback
-from .http import HTTPClient
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from .playback import UserPlayback, PlayHistory
 from .objects import Followers, ExternalURLs
 from .image import Image
 from .track import UserTrack, Track
 from .album import Album
+from .artist import Artist
 from .partials import PartialUser
 from .playlist import Playlist
+from .paginator import CursorPaginator, CursorTail
+
+if TYPE_CHECKING:
+    from .http import HTTPClient
+    from .watcher import PlaybackWatcher
+    from .commands import PlaybackCommandQueue
 
 __all__ = (
     'User',
     'CurrentUser'
 )
 
+def _check_options(instance: Any, options: Dict[str, Any]) -> None:
+    # Watchers and command queues are shared by everything using the client, a caller asking
+    # for other settings would otherwise silently get the first caller's.
+    for key, value in options.items():
+        if not hasattr(instance, key):
+            raise TypeError(f'unexpected keyword argument {key!r}')
+
+        current = getattr(instance, key)
+        if isinstance(current, frozenset) and value is not None:
+            value = frozenset(value)
+
+        if current != value:
+            raise ValueError(
+                f'this client already has a {type(instance).__name__} with {key}={current!r}, got {value!r}'
+            )
+
 class User(PartialUser):
     __slots__ = PartialUser.__slots__ + ('_http',)
 
@@ -65,10 +89,37 @@ class CurrentUser(User):
         self.email: Optional[str] = data.get('email')
         self.product: Optional[str] = data.get('product')
 
-    async def fetch_playback(self) -> UserPlayback:
+    async def fetch_playback(self) -> Optional[UserPlayback]:
         data = await self._http.get_user_current_playback()
+        if not data:
+            return None
+
         return UserPlayback(data, self._http)
 
+    def watch_playback(self, **kwargs: Any) -> PlaybackWatcher:
+        watcher = self._http.playback_watcher
+        if watcher is None:
+            # Deferred so that importing the models doesn't pull in aiohttp.
+            from .watcher import PlaybackWatcher
+            watcher = self._http.playback_watcher = PlaybackWatcher(self._http, **kwargs)
+        else:
+            _check_options(watcher, kwargs)
+
+        return watcher
+
+    def command_queue(self, **kwargs: Any) -> PlaybackCommandQueue:
+        commands = self._http.playback_commands
+        if commands is None:
+            from .commands import PlaybackCommandQueue
+            commands = self._http.playback_commands = PlaybackCommandQueue(self._http, **kwargs)
+        else:
+            if 'mergeable' in kwargs and kwargs['mergeable'] is None:
+                kwargs['mergeable'] = commands.MERGEABLE
+
+            _check_options(commands, kwargs)
+
+        return commands
+
     async def fetch_albums(self, *, limit: int = 20, offset: int = 0, market: Optional[str] = None):
         data = await self._http.get_user_saved_albums(limit=limit, offset=offset, market=market)
         return [Album(album, self._http) for album in data['items']]
@@ -79,4 +130,52 @@ class CurrentUser(User):
 
     async def fetch_recommendations(self, **kwargs: Any):
         data = await self._http.get_recommendations(**kwargs)
-        return [Track(track, self._http) for track in data['tracks']]
\ No newline at end of file
+        return [Track(track, self._http) for track in data['tracks']]
+
+    def fetch_followed_artists(self, *, limit: int = 50, max: Optional[int] = None) -> CursorPaginator[Artist]:
+        return CursorPaginator(
+            self._http.get_user_followed_artists,
+            lambda data: Artist(data, self._http),
+            limit,
+            max,
+            key='artists'
+        )
+
+    def fetch_recently_played(
+        self,
+        *,
+        limit: int = 50,
+        max: Optional[int] = None,
+        after: Optional[int] = None,
+        before: Optional[int] = None
+    ) -> CursorPaginator[PlayHistory]:
+        if after is not None and before is not None:
+            raise ValueError('after and before are mutually exclusive')
+
+        direction = 'after' if after is not None else 'before'
+        return CursorPaginator(
+            self._http.get_user_recently_played_tracks,
+            lambda data: PlayHistory(data, self._http),
+            limit,
+            max,
+            direction=direction,
+            cursor=after if after is not None else before
+        )
+
+    def tail_recently_played(
+        self,
+        *,
+        interval: float = 30.0,
+        limit: int = 50,
+        after: Optional[int] = None,
+        include_existing: bool = False
+    ) -> CursorTail[PlayHistory]:
+        return CursorTail(
+            self._http.get_user_recently_played_tracks,
+            lambda data: PlayHistory(data, self._http),
+            lambda data: (data['track']['id'], data['played_at']),
+            interval,
+            limit,
+            cursor=after,
+            include_existing=include_existing
+        )
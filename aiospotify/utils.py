@@ -1,15 +1,43 @@
 from __future__ import annotations
 
 from typing import Callable, Generic, Optional, Type, TypeVar, Any, overload, Tuple
+import asyncio
 import datetime
+import functools
+import os
 import sys
 import re
 
+try:
+    import fcntl
+except ImportError: # pragma: no cover
+    fcntl = None
+    import msvcrt
+
 PY39 = sys.version_info >= (3, 9)
 PY310 = sys.version_info >= (3, 10)
 
-SPOTIFY_URL_REGEX = re.compile(r'https:\/\/(open.spotify.com|play.spotify.com)\/(?P<type>user|track|album|artist|playlist|show)\/(?P<id>\w*)')
-SPOTIFY_URI_REGEX = re.compile(r'^spotify:(?P<type>user|track|album|artist|playlist|show):(?P<id>.*)$')
+SPOTIFY_URL_REGEX = re.compile(
+    r'https?:\/\/(open|play)\.spotify\.com\/(?:embed\/)?(?:intl-[a-zA-Z-]+\/)?'
+    r'(?P<type>user|track|album|artist|playlist|show|episode)\/(?P<id>[^?#/]+)'
+)
+SPOTIFY_URI_REGEX = re.compile(r'^spotify:(?P<type>user|track|album|artist|playlist|show|episode):(?P<id>[^:?#]+)$')
+SPOTIFY_TYPES = frozenset({'user', 'track', 'album', 'artist', 'playlist', 'show', 'episode'})
+OPEN_URL_PREFIX = 'https://open.spotify.com/'
+
+# Path segments that are followed by an object id, used to group paths into routes.
+ROUTE_COLLECTIONS = frozenset({
+    'albums',
+    'artists',
+    'audio-analysis',
+    'audio-features',
+    'categories',
+    'episodes',
+    'playlists',
+    'shows',
+    'tracks',
+    'users',
+})
 
 T = TypeVar('T')
 T_co = TypeVar('T_co', covariant=True)
@@ -43,6 +71,78 @@ def cached_slot_property(name: str) -> Callable[[Callable[[T], T_co]], CachedSlo
         return CachedSlotProperty(name, func)
     return decorator
 
+async def to_thread(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    if PY39:
+        return await asyncio.to_thread(func, *args, **kwargs)
+    else:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+class FileLock:
+    __slots__ = ('path', '_fd')
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._fd: Optional[int] = None
+
+    def __repr__(self) -> str:
+        return f'<FileLock path={self.path!r} locked={self.locked()}>'
+
+    def __enter__(self) -> FileLock:
+        self.acquire()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.release()
+
+    def locked(self) -> bool:
+        return self._fd is not None
+
+    def acquire(self) -> None:
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            else:
+                while True:
+                    try:
+                        # LK_LOCK only retries for about 10 seconds before giving up.
+                        msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        continue
+        except BaseException:
+            os.close(fd)
+            raise
+
+        self._fd = fd
+
+    def release(self) -> None:
+        fd = self._fd
+        if fd is None:
+            return
+
+        self._fd = None
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(fd)
+
+@functools.lru_cache(maxsize=4096)
+def route_template(path: str) -> str:
+    segments = path.split('/')
+    for i in range(2, len(segments)):
+        # `/me/tracks/contains` names a collection of the current user, not an id.
+        if segments[i - 1] in ROUTE_COLLECTIONS and segments[i - 2] != 'me':
+            segments[i] = '{id}'
+
+    return '/'.join(segments)
+
 def fromisoformat(date: str) -> datetime.datetime:
     if date.endswith('Z'):
         date = date[:-1]
@@ -62,14 +162,47 @@ def parse_uri(uri: str) -> Tuple[str, str]:
 def parse_url(url: str) -> Tuple[str, str]:
     return _parse_from_regex(SPOTIFY_URL_REGEX, url)
 
+def split_argument(argument: str) -> Tuple[Optional[str], str]:
+    # Plain string operations cover raw ids, URIs and open.spotify.com links, which is
+    # nearly everything. The regexes only see the odd shapes. The type is None for a raw id.
+    if argument.startswith('spotify:'):
+        parts = argument.split(':')
+        if len(parts) == 3 and parts[1] in SPOTIFY_TYPES and parts[2]:
+            return parts[1], parts[2]
+        # Legacy playlist URIs, spotify:user:{owner}:playlist:{id}
+        if len(parts) == 5 and parts[1] == 'user' and parts[3] == 'playlist' and parts[4]:
+            return 'playlist', parts[4]
+    elif argument.startswith(OPEN_URL_PREFIX):
+        path = argument[len(OPEN_URL_PREFIX):]
+        end = len(path)
+        for separator in '?#':
+            index = path.find(separator)
+            if index != -1 and index < end:
+                end = index
+
+        parts = path[:end].split('/')
+        if parts and parts[0].startswith('intl-'):
+            parts = parts[1:]
+
+        # Legacy playlist links, /user/{owner}/playlist/{id}
+        if len(parts) >= 4 and parts[0] == 'user' and parts[2] == 'playlist' and parts[3]:
+            return 'playlist', parts[3]
+
+        if len(parts) >= 2 and parts[0] in SPOTIFY_TYPES and parts[1]:
+            return parts[0], parts[1]
+    elif '/' not in argument and ':' not in argument:
+        return None, argument
+
+    match = SPOTIFY_URI_REGEX.match(argument) or SPOTIFY_URL_REGEX.match(argument)
+    if match is None:
+        return None, argument
+
+    return match.group('type'), match.group('id')
+
 def parse_argument(argument: str, type: str) -> str:
-    try:
-        typ, id = parse_uri(argument)
-    except ValueError:
-        try:
-            typ, id = parse_url(argument)
-        except ValueError:
-            return argument # Assume the argument is a raw id
+    typ, id = split_argument(argument)
+    if typ is None:
+        return argument # Assume the argument is a raw id
 
     if type != typ:
         raise ValueError(f'{argument!r} is not a valid {type} url or uri')
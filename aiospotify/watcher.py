@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, List, Optional, Set, Union
+import asyncio
+import time
+
+import aiohttp
+
+from .enums import PlaybackEventType
+from .errors import HTTPException
+from .deadline import current_deadline
+from .playback import UserPlayback, PlaybackMismatch
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+    from .http import HTTPClient
+
+__all__ = (
+    'PlaybackEvent',
+    'PlaybackSubscription',
+    'PlaybackWatcher',
+)
+
+class PlaybackEvent:
+    __slots__ = ('type', 'before', 'after', 'mismatches', 'error')
+
+    def __init__(
+        self,
+        type: PlaybackEventType,
+        before: Optional[UserPlayback],
+        after: Optional[UserPlayback],
+        mismatches: Optional[List[PlaybackMismatch]] = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        self.type = type
+        self.before = before
+        self.after = after
+        self.mismatches = mismatches or []
+        self.error = error
+
+    def __repr__(self) -> str:
+        return f'<PlaybackEvent type={self.type!r}>'
+
+class PlaybackSubscription:
+    __slots__ = ('watcher', 'queue', 'closed')
+
+    def __init__(self, watcher: PlaybackWatcher) -> None:
+        self.watcher = watcher
+        self.queue: asyncio.Queue[Union[PlaybackEvent, BaseException]] = asyncio.Queue()
+        self.closed = False
+
+    def __repr__(self) -> str:
+        return f'<PlaybackSubscription pending={self.queue.qsize()} closed={self.closed}>'
+
+    def __aiter__(self) -> Self:
+        return self
+
+    async def __anext__(self) -> PlaybackEvent:
+        if self.closed:
+            raise StopAsyncIteration
+
+        item = await self.queue.get()
+        if isinstance(item, BaseException):
+            # Only errors the watcher can't recover from get here, it has stopped polling.
+            # `close` queues a StopAsyncIteration, which ends the iteration the same way.
+            self.close()
+            raise item
+
+        return item
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if not self.closed:
+            self.closed = True
+            # Wakes a consumer that is blocked on the queue.
+            self.queue.put_nowait(StopAsyncIteration())
+            self.watcher.unsubscribe(self)
+
+class PlaybackWatcher:
+    def __init__(
+        self,
+        http: HTTPClient,
+        *,
+        interval: float = 5.0,
+        paused_interval: float = 15.0,
+        min_interval: float = 0.5,
+        end_margin: float = 0.5,
+        seek_tolerance: int = 2000,
+        max_backoff: float = 60.0,
+        market: Optional[str] = None,
+    ) -> None:
+        self._http = http
+        self.interval = interval
+        self.paused_interval = paused_interval
+        self.min_interval = min_interval
+        self.end_margin = end_margin
+        self.seek_tolerance = seek_tolerance
+        self.max_backoff = max_backoff
+        self.market = market
+        self.failures = 0
+
+        self.current: Optional[UserPlayback] = None
+        self.subscribers: Set[PlaybackSubscription] = set()
+
+        self._fetched_at: Optional[float] = None
+        self._task: Optional[asyncio.Task[None]] = None
+
+    def __repr__(self) -> str:
+        return f'<PlaybackWatcher subscribers={len(self.subscribers)} running={self.is_running()}>'
+
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def subscribe(self) -> PlaybackSubscription:
+        subscription = PlaybackSubscription(self)
+        self.subscribers.add(subscription)
+
+        if not self.is_running():
+            self.start()
+
+        return subscription
+
+    def unsubscribe(self, subscription: PlaybackSubscription) -> None:
+        self.subscribers.discard(subscription)
+        if not self.subscribers:
+            self.stop()
+
+    def start(self) -> None:
+        if self.is_running():
+            return
+
+        self._task = self._http.loop.create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+        # Nothing will be polled anymore, every subscriber's iteration ends.
+        subscribers, self.subscribers = self.subscribers, set()
+        for subscription in subscribers:
+            subscription.close()
+
+    def next_interval(self) -> float:
+        playback = self.current
+        if playback is None or not playback.is_playing:
+            return self.paused_interval
+
+        item = playback._data.get('item')
+        if not item or playback.progress_ms is None:
+            return self.interval
+
+        # Wake up right after the current item should have ended so track changes are
+        # picked up quickly without polling fast for the whole track.
+        remaining = (item['duration_ms'] - playback.progress_ms) / 1000
+        if remaining < self.interval:
+            return max(self.min_interval, remaining + self.end_margin)
+
+        return self.interval
+
+    def _item_id(self, playback: UserPlayback) -> Optional[str]:
+        item = playback._data.get('item')
+        return item['id'] if item else None
+
+    def _device_id(self, playback: UserPlayback) -> Optional[str]:
+        device = playback._data.get('device')
+        return device['id'] if device else None
+
+    def diff(
+        self, before: Optional[UserPlayback], after: Optional[UserPlayback], elapsed: float
+    ) -> List[PlaybackEvent]:
+        if before is None and after is None:
+            return []
+
+        if before is None:
+            return [PlaybackEvent(PlaybackEventType.Started, before, after)]
+
+        if after is None:
+            return [PlaybackEvent(PlaybackEventType.Stopped, before, after)]
+
+        events: List[PlaybackEvent] = []
+        if self._device_id(before) != self._device_id(after):
+            events.append(PlaybackEvent(PlaybackEventType.DeviceChanged, before, after))
+
+        if self._item_id(before) != self._item_id(after):
+            events.append(PlaybackEvent(PlaybackEventType.TrackChanged, before, after))
+        elif before.progress_ms is not None and after.progress_ms is not None:
+            expected = before.progress_ms
+            if before.is_playing:
+                expected += int(elapsed * 1000)
+
+            if abs(after.progress_ms - expected) > self.seek_tolerance:
+                events.append(PlaybackEvent(PlaybackEventType.Seeked, before, after))
+
+        if before.is_playing and not after.is_playing:
+            events.append(PlaybackEvent(PlaybackEventType.Paused, before, after))
+        elif not before.is_playing and after.is_playing:
+            events.append(PlaybackEvent(PlaybackEventType.Resumed, before, after))
+
+        return events
+
+    def dispatch(self, item: Union[PlaybackEvent, BaseException]) -> None:
+        for subscription in self.subscribers:
+            subscription.queue.put_nowait(item)
+
+    async def poll(self) -> List[PlaybackEvent]:
+        started = time.monotonic()
+        data = await self._http.get_user_current_playback(market=self.market, additional_types=['track', 'episode'])
+        now = time.monotonic()
+
+        elapsed = now - self._fetched_at if self._fetched_at is not None else 0.0
+        first = self._fetched_at is None
+        self._fetched_at = now
+
+        # Events are computed between server snapshots, the optimistic state that
+        # commands applied to `current` must not hide changes from other subscribers.
+        before = UserPlayback(self.current._data, self._http) if self.current else None
+        after = UserPlayback(data, self._http) if data else None
+
+        # The first snapshot is only a baseline, playback that was already running hasn't started.
+        events = [] if first else self.diff(before, after, elapsed)
+
+        if self.current is None or after is None:
+            self.current = after
+        else:
+            mismatches = self.current.reconcile(data, started=started)
+            if mismatches:
+                events.append(PlaybackEvent(PlaybackEventType.Mismatch, before, self.current, mismatches))
+
+        for event in events:
+            self.dispatch(event)
+
+        return events
+
+    async def _run(self) -> None:
+        # The task inherits the context of whoever subscribed first, their deadline is not ours.
+        current_deadline.set(None)
+
+        while True:
+            try:
+                await self.poll()
+            except (HTTPException, aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                # A failed poll is reported but ends nobody's iteration, the next one is
+                # pushed back exponentially until a poll succeeds again.
+                self.failures += 1
+                self.dispatch(PlaybackEvent(PlaybackEventType.Error, self.current, self.current, error=exc))
+
+                delay = min(self.max_backoff, self.next_interval() * 2 ** min(self.failures, 16))
+                await asyncio.sleep(delay)
+                continue
+            except Exception as exc:
+                self.dispatch(exc)
+                return
+
+            self.failures = 0
+            await asyncio.sleep(self.next_interval())
@@ -0,0 +1 @@
+# Benchmarks run against a local stub of the Spotify API, see `python -m benchmarks --help`.
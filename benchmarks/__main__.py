@@ -0,0 +1,34 @@
+import argparse
+import asyncio
+import json
+import sys
+
+from .suite import run_suite
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Benchmark aiospotify against a local stub API.')
+    parser.add_argument('--concurrency', default='1,4,16,64', help='comma separated concurrency levels')
+    parser.add_argument('--requests', type=int, default=1000, help='requests per load benchmark')
+    parser.add_argument('--rounds', type=int, default=50, help='rounds per model benchmark')
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds the stub server waits before answering')
+    parser.add_argument('--only', action='append', choices=['load', 'paginator', 'model'], help='benchmark groups to run')
+    parser.add_argument('--output', '-o', help='write the JSON results to this file instead of stdout')
+    args = parser.parse_args()
+
+    results = asyncio.run(run_suite(
+        concurrency=[int(level) for level in args.concurrency.split(',')],
+        requests=args.requests,
+        rounds=args.rounds,
+        latency=args.latency,
+        only=args.only,
+    ))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+import argparse
+import json
+import sys
+from typing import Any, Dict, Tuple
+
+Key = Tuple[str, Any]
+
+def index(results: Dict[str, Any]) -> Dict[Key, Dict[str, Any]]:
+    return {(result['name'], result.get('concurrency')): result for result in results['results']}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.compare', description='Compare two benchmark runs.')
+    parser.add_argument('base')
+    parser.add_argument('head')
+    parser.add_argument('--threshold', type=float, default=0.1, help='relative throughput drop reported as a regression')
+    args = parser.parse_args()
+
+    with open(args.base, encoding='utf-8') as f:
+        base = index(json.load(f))
+    with open(args.head, encoding='utf-8') as f:
+        head = index(json.load(f))
+
+    regressions = 0
+    print(f'{"benchmark":<32} {"conc":>5} {"base":>12} {"head":>12} {"change":>8}')
+
+    for key in sorted(base.keys() & head.keys(), key=str):
+        name, concurrency = key
+        before = base[key]['throughput']
+        after = head[key]['throughput']
+        change = after / before - 1
+
+        flag = ''
+        if change < -args.threshold:
+            regressions += 1
+            flag = '  REGRESSION'
+
+        print(f'{name:<32} {concurrency or "":>5} {before:>12.1f} {after:>12.1f} {change:>+8.1%}{flag}')
+
+    sys.exit(1 if regressions else 0)
+
+if __name__ == '__main__':
+    main()
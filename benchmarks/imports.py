@@ -0,0 +1,105 @@
+import argparse
+import json
+import subprocess
+import sys
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from .suite import metadata, summarize
+
+# Statement, budget in milliseconds for the median run, modules it must not pull in.
+SCENARIOS: List[Tuple[str, float, Sequence[str]]] = [
+    ('import aiospotify', 50.0, ('aiohttp', 'aiospotify.client', 'aiospotify.http')),
+    ('from aiospotify import ObjectType', 50.0, ('aiohttp', 'asyncio')),
+    ('from aiospotify import Track', 150.0, ('aiohttp',)),
+    ('from aiospotify import SpotifyClient', 750.0, ()),
+]
+
+def parse(stderr: str, baseline: Set[str]) -> Tuple[float, int]:
+    # Only top level entries count, nested ones are already part of their parent's
+    # cumulative time. Modules loaded by interpreter startup are left out.
+    total = 0
+    count = 0
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+
+        _, cumulative, name = line[len('import time:'):].split('|')
+        count += 1
+        if not name.startswith('  ') and name.strip() not in baseline:
+            total += int(cumulative)
+
+    return total / 1_000_000, count
+
+def run(code: str) -> Tuple[str, str]:
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code], capture_output=True, text=True, check=True
+    )
+    return process.stdout, process.stderr
+
+def measure(statement: str, budget: float, forbidden: Sequence[str], runs: int, baseline: Set[str]) -> Dict[str, Any]:
+    timings = []
+    modules: List[str] = []
+    count = 0
+
+    for _ in range(runs):
+        stdout, stderr = run(f'{statement}\nimport sys\nprint("\\n".join(sys.modules))')
+        seconds, count = parse(stderr, baseline)
+
+        timings.append(seconds)
+        modules = stdout.split()
+
+    loaded = [name for name in forbidden if name in modules]
+    latency = summarize(timings)
+
+    return {
+        'name': statement,
+        'kind': 'import',
+        'runs': runs,
+        'modules': count,
+        'budget': budget / 1000,
+        'forbidden': loaded,
+        'ok': latency['p50'] <= budget / 1000 and not loaded,
+        'latency': latency,
+    }
+
+def run_imports(*, runs: int = 5, scale: float = 1.0, only: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    _, stderr = run('pass')
+    baseline = {line.split('|')[-1].strip() for line in stderr.splitlines() if line.startswith('import time:')}
+
+    # The first import compiles bytecode, don't let that count against the budgets.
+    run('import aiospotify.client')
+
+    results = [
+        measure(statement, budget * scale, forbidden, runs, baseline)
+        for statement, budget, forbidden in SCENARIOS
+        if not only or statement in only
+    ]
+
+    return {'meta': metadata(), 'config': {'runs': runs, 'scale': scale}, 'results': results}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.imports', description='Check aiospotify import times against budgets.')
+    parser.add_argument('--runs', type=int, default=5, help='interpreter launches per statement')
+    parser.add_argument('--scale', type=float, default=1.0, help='multiply every budget, for slower machines')
+    parser.add_argument('--output', '-o', help='write the JSON results to this file')
+    args = parser.parse_args()
+
+    results = run_imports(runs=args.runs, scale=args.scale)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    failures = 0
+    print(f'{"statement":<56} {"median":>9} {"budget":>9}')
+    for result in results['results']:
+        flag = ''
+        if not result['ok']:
+            failures += 1
+            flag = '  OVER BUDGET' if not result['forbidden'] else f'  LOADED {", ".join(result["forbidden"])}'
+
+        print(f'{result["name"]:<56} {result["latency"]["p50"] * 1000:>7.1f}ms {result["budget"] * 1000:>7.1f}ms{flag}')
+
+    sys.exit(1 if failures else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional
+
+from aiospotify.interning import Interner
+from aiospotify.playlist import PlaylistTrack
+from aiospotify.testing import Catalog
+
+from .suite import metadata
+
+PAGE_SIZE = 100
+
+def bodies(catalog: Catalog, tracks: int) -> List[bytes]:
+    # The working set is one big playlist read page by page, kept as raw bodies so that every
+    # run decodes fresh strings exactly like a response off the wire.
+    index = 0
+    size = catalog.playlist_sizes.setdefault(index, tracks)
+
+    return [
+        json.dumps(catalog.playlist_page(index, offset, PAGE_SIZE)).encode('utf-8')
+        for offset in range(0, size, PAGE_SIZE)
+    ]
+
+def load(pages: List[bytes], interner: Optional[Interner]) -> List[PlaylistTrack]:
+    tracks: List[PlaylistTrack] = []
+    for body in pages:
+        data = json.loads(body.decode('utf-8'))
+        if interner is not None:
+            interner.intern(data)
+
+        tracks.extend(PlaylistTrack(item, None) for item in data['items']) # type: ignore
+
+    return tracks
+
+def build(pages: List[bytes], interned: bool) -> Dict[str, Any]:
+    # Timed and traced separately, tracemalloc slows every allocation down several times.
+    gc.collect()
+    started = time.perf_counter()
+    tracks = load(pages, Interner() if interned else None)
+    elapsed = time.perf_counter() - started
+
+    del tracks
+    gc.collect()
+
+    interner = Interner() if interned else None
+    tracemalloc.start()
+    tracks = load(pages, interner)
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    result = {
+        'tracks': len(tracks),
+        'bytes': current,
+        'bytes_per_track': current / len(tracks),
+        'peak': peak,
+        'seconds': elapsed,
+        'us_per_track': elapsed / len(tracks) * 1_000_000,
+    }
+
+    if interner is not None:
+        result['interner'] = interner.stats()
+
+    return result
+
+def run_memory(tracks: int = 100_000) -> Dict[str, Any]:
+    catalog = Catalog()
+    pages = bodies(catalog, tracks)
+
+    baseline = build(pages, False)
+    interned = build(pages, True)
+
+    return {
+        'metadata': metadata(),
+        'results': [
+            dict(name='baseline', **baseline),
+            dict(name='interned', **interned),
+        ],
+        'saved': baseline['bytes'] - interned['bytes'],
+        'saved_ratio': 1 - interned['bytes'] / baseline['bytes'],
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.memory', description='Measure the memory held by a working set of tracks.')
+    parser.add_argument('--tracks', type=int, default=100_000, help='size of the working set')
+    parser.add_argument('--output', '-o', help='write the JSON results to this file')
+    args = parser.parse_args()
+
+    results = run_memory(tracks=args.tracks)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    print(f'{"run":<12} {"tracks":>8} {"MiB":>9} {"B/track":>9} {"us/track":>9}')
+    for result in results['results']:
+        print(
+            f'{result["name"]:<12} {result["tracks"]:>8} {result["bytes"] / 2 ** 20:>9.1f} '
+            f'{result["bytes_per_track"]:>9.0f} {result["us_per_track"]:>9.1f}'
+        )
+
+    print(f'saved {results["saved"] / 2 ** 20:.1f} MiB ({results["saved_ratio"]:.1%})')
+
+if __name__ == '__main__':
+    main()
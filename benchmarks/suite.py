@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+import asyncio
+import datetime
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+import aiohttp
+
+import aiospotify
+from aiospotify.playlist import Playlist, PlaylistTrack
+from aiospotify.search import SearchResult
+from aiospotify.track import Track, TrackAudioAnalysis
+
+from aiospotify.testing import Catalog, FakeSpotifyServer, Faults, Latency
+
+__all__ = (
+    'summarize',
+    'run_suite',
+)
+
+def summarize(latencies: List[float]) -> Dict[str, float]:
+    if not latencies:
+        return {}
+
+    ordered = sorted(latencies)
+
+    def percentile(value: float) -> float:
+        return ordered[min(len(ordered) - 1, int(len(ordered) * value / 100))]
+
+    return {
+        'mean': statistics.fmean(ordered),
+        'p50': percentile(50),
+        'p95': percentile(95),
+        'p99': percentile(99),
+        'max': ordered[-1],
+    }
+
+def metadata() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        'commit': commit,
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'python': sys.version.split()[0],
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'aiohttp': aiohttp.__version__,
+    }
+
+def client_for(server: FakeSpotifyServer, concurrency: int) -> aiospotify.SpotifyClient:
+    client = aiospotify.SpotifyClient.from_token(server.issue_token(), limiter=aiospotify.ConcurrencyLimiter(concurrency))
+    return server.configure(client)
+
+async def load(
+    name: str, concurrency: int, requests: int, call: Callable[[int], Awaitable[Any]]
+) -> Dict[str, Any]:
+    # Untimed warm up so connection setup and the fake server's payload cache aren't measured.
+    await asyncio.gather(*(call(index) for index in range(min(requests, concurrency * 2))))
+
+    latencies: List[float] = []
+    counter = iter(range(requests))
+
+    async def worker() -> None:
+        for index in counter:
+            started = time.perf_counter()
+            await call(index)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        'name': name,
+        'kind': 'load',
+        'concurrency': concurrency,
+        'requests': requests,
+        'seconds': elapsed,
+        'throughput': requests / elapsed,
+        'latency': summarize(latencies),
+    }
+
+def construct(name: str, factory: Callable[[], Any], data_size: int, rounds: int) -> Dict[str, Any]:
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        factory()
+        timings.append(time.perf_counter() - started)
+
+    total = sum(timings)
+    return {
+        'name': name,
+        'kind': 'model',
+        'rounds': rounds,
+        'objects': data_size * rounds,
+        'seconds': total,
+        'throughput': data_size * rounds / total,
+        'latency': summarize(timings),
+    }
+
+async def load_benchmarks(
+    server: FakeSpotifyServer, concurrency_levels: Sequence[int], requests: int
+) -> List[Dict[str, Any]]:
+    results = []
+    track_ids = [server.catalog.id('track', index) for index in range(256)]
+
+    for concurrency in concurrency_levels:
+        async with client_for(server, concurrency) as client:
+            http = client.http
+
+            results.append(await load(
+                'http.get_track', concurrency, requests,
+                lambda index: http.request(f'/tracks/{track_ids[index % len(track_ids)]}', 'GET'),
+            ))
+            results.append(await load(
+                'client.fetch_track', concurrency, requests,
+                lambda index: client.fetch_track(track_ids[index % len(track_ids)]),
+            ))
+            results.append(await load(
+                'client.search', concurrency, requests,
+                lambda index: client.search(f'query {index % 32}', limit=20),
+            ))
+            results.append(await load(
+                'http.get_audio_analysis', concurrency, max(1, requests // 20),
+                lambda index: http.request(f'/audio-analysis/{track_ids[index % 8]}', 'GET'),
+            ))
+
+        # The same calls without a socket, the difference is what the aiohttp stack costs.
+        transport = aiospotify.MemoryTransport()
+        for index, id in enumerate(track_ids):
+            transport.add('GET', f'/v1/tracks/{id}', server.catalog.track(index))
+
+        async with aiospotify.SpotifyClient.from_token(
+            'benchmark', transport=transport, limiter=aiospotify.ConcurrencyLimiter(concurrency)
+        ) as client:
+            results.append(await load(
+                'memory.fetch_track', concurrency, requests,
+                lambda index: client.fetch_track(track_ids[index % len(track_ids)]),
+            ))
+
+    return results
+
+async def paginator_benchmarks(server: FakeSpotifyServer, rounds: int) -> List[Dict[str, Any]]:
+    timings = []
+    items = 0
+
+    async with client_for(server, 1) as client:
+        for index in range(rounds):
+            started = time.perf_counter()
+
+            playlist = await client.fetch_playlist(server.catalog.id('playlist', index))
+            tracks = await playlist.tracks.fetch(increment=100)
+            items += len(tracks)
+
+            timings.append(time.perf_counter() - started)
+
+    total = sum(timings)
+    return [{
+        'name': 'paginator.playlist_tracks',
+        'kind': 'paginator',
+        'rounds': rounds,
+        'items': items,
+        'seconds': total,
+        'throughput': items / total,
+        'latency': summarize(timings),
+    }]
+
+def model_benchmarks(catalog: Catalog, rounds: int) -> List[Dict[str, Any]]:
+    # Decoding is part of the measurement, that's what every call pays for.
+    http: Any = None
+
+    track = json.dumps(catalog.track(1))
+    page = json.dumps(catalog.playlist_page(1, 0, 100))
+    search = json.dumps(catalog.search('benchmark', ['track', 'artist'], 50, 0))
+    playlist = json.dumps(catalog.playlist(1))
+    analysis = json.dumps(catalog.audio_analysis(1))
+
+    return [
+        construct('model.track', lambda: Track(json.loads(track), http), 1, rounds * 10),
+        construct(
+            'model.playlist_page',
+            lambda: [PlaylistTrack(item, http) for item in json.loads(page)['items']],
+            100, rounds,
+        ),
+        construct('model.playlist', lambda: Playlist(json.loads(playlist), http), 1, rounds),
+        construct(
+            'model.search',
+            lambda: SearchResult(json.loads(search), http).tracks,
+            50, rounds,
+        ),
+        construct('model.audio_analysis', lambda: TrackAudioAnalysis(json.loads(analysis)), 1, max(1, rounds // 10)),
+    ]
+
+async def run_suite(
+    *,
+    concurrency: Sequence[int] = (1, 4, 16, 64),
+    requests: int = 1000,
+    rounds: int = 50,
+    latency: float = 0.0,
+    only: Optional[Sequence[str]] = None,
+) -> Dict[str, Any]:
+    groups = set(only or ('load', 'paginator', 'model'))
+    results: List[Dict[str, Any]] = []
+
+    catalog = Catalog(playlist_size=1000)
+    faults = Faults(latency=Latency.fixed(latency)) if latency else None
+
+    async with FakeSpotifyServer(catalog, faults=faults) as server:
+        if 'load' in groups:
+            results.extend(await load_benchmarks(server, concurrency, requests))
+        if 'paginator' in groups:
+            results.extend(await paginator_benchmarks(server, max(1, rounds // 5)))
+
+    if 'model' in groups:
+        results.extend(model_benchmarks(catalog, rounds))
+
+    return {
+        'meta': metadata(),
+        'config': {
+            'concurrency': list(concurrency),
+            'requests': requests,
+            'rounds': rounds,
+            'latency': latency,
+        },
+        'results': results,
+    }
@@ -4,7 +4,7 @@ setup(
     name='aiospotify',
     version='0.1.0',
     description='An asynchronous wrapper for the spotify web API.',
-    packages=['aiospotify'],
+    packages=['aiospotify', 'aiospotify.testing'],
     python_requires='>=3.8',
     install_requires=['aiohttp']
 )
\ No newline at end of file